@@ -0,0 +1,104 @@
+"""
+Compare encode time and payload size of the API renderers on a realistic
+progress listing (rows shaped like WeeklyProgressSerializer output).
+
+    python benchmarks/renderers.py --rows 5000
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weekly_tracker.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from weekly_tracker.renderers import (  # noqa: E402
+    ColumnarJSONRenderer,
+    FastJSONRenderer,
+    MessagePackRenderer,
+    msgpack,
+    orjson,
+)
+
+LEVELS = ['beginner', 'intermediate', 'advanced']
+
+
+def progress_listing(rows, students=200, skills=40):
+    skill_rows = [
+        {
+            'id': skill_id,
+            'skill_name': f'Skill {skill_id}',
+            'category': random.choice(['Programming', 'Frontend', 'Backend', 'Database', 'Design']),
+            'description': 'Modern tooling, patterns and best practices',
+            'created_at': '2025-01-06 09:00:00',
+        }
+        for skill_id in range(1, skills + 1)
+    ]
+    student_rows = [
+        {
+            'id': student_id,
+            'email': f'student{student_id}@example.com',
+            'name': f'Student {student_id}',
+            'role': 'student',
+            'created_at': '2025-01-06 09:00:00',
+            'updated_at': '2025-01-06 09:00:00',
+        }
+        for student_id in range(1, students + 1)
+    ]
+
+    listing = []
+    for entry_id in range(1, rows + 1):
+        skill = random.choice(skill_rows)
+        student = random.choice(student_rows)
+        listing.append({
+            'id': entry_id,
+            'student': student['id'],
+            'skill': skill['id'],
+            'week_number': random.randint(1, 52),
+            'year': 2025,
+            'proficiency_level': random.choice(LEVELS),
+            'hours_spent': round(random.uniform(0, 20), 1),
+            'notes': 'Worked through exercises and a small project',
+            'created_at': '2025-03-10 18:22:41',
+            'updated_at': '2025-03-10 18:22:41',
+            'skill_details': skill,
+            'student_details': student,
+        })
+    return listing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    data = {'count': options.rows, 'next': None, 'previous': None, 'results': progress_listing(options.rows)}
+
+    renderers = [('stdlib json', JSONRenderer())]
+    if orjson is not None:
+        renderers.append(('orjson', FastJSONRenderer()))
+    renderers.append(('columnar', ColumnarJSONRenderer()))
+    if msgpack is not None:
+        renderers.append(('msgpack', MessagePackRenderer()))
+
+    print(f'{options.rows} rows, best of {options.repeat} runs')
+    baseline = None
+    for name, renderer in renderers:
+        payload = renderer.render(data)
+        seconds = min(timeit.repeat(lambda: renderer.render(data), number=1, repeat=options.repeat))
+        baseline = baseline or seconds
+        print(
+            f'{name:<12} encode: {seconds * 1000:>8.2f} ms ({baseline / seconds:>5.1f}x)   '
+            f'size: {len(payload) / 1024:>8.1f} KiB'
+        )
+
+
+if __name__ == '__main__':
+    main()
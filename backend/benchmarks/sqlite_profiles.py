@@ -0,0 +1,142 @@
+"""
+Compare SQLite throughput under concurrent reads and writes with and without
+the SQLITE_PRAGMAS profile from settings.
+
+    python benchmarks/sqlite_profiles.py --readers 4 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weekly_tracker.settings')
+
+from django.conf import settings  # noqa: E402
+from weekly_tracker.db_tuning import apply_sqlite_pragmas  # noqa: E402
+
+# Stock SQLite behaviour, i.e. what the project ran with before tuning
+BASELINE_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+}
+
+SCHEMA = """
+CREATE TABLE weekly_progress (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id INTEGER NOT NULL,
+    skill_id INTEGER NOT NULL,
+    week_number INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    proficiency_level VARCHAR(20) NOT NULL,
+    hours_spent REAL NOT NULL,
+    notes TEXT
+);
+CREATE INDEX weekly_progress_student ON weekly_progress (student_id);
+"""
+
+LEVELS = ['beginner', 'intermediate', 'advanced']
+
+
+def connect(path, pragmas):
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    apply_sqlite_pragmas(conn.cursor(), pragmas)
+    return conn
+
+
+def seed(path, pragmas, rows):
+    conn = connect(path, pragmas)
+    conn.executescript(SCHEMA)
+    conn.execute('BEGIN')
+    conn.executemany(
+        'INSERT INTO weekly_progress (student_id, skill_id, week_number, year, proficiency_level, hours_spent) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        [
+            (random.randint(1, 2000), random.randint(1, 50), random.randint(1, 52), 2025, random.choice(LEVELS), random.uniform(0, 20))
+            for _ in range(rows)
+        ]
+    )
+    conn.execute('COMMIT')
+    conn.close()
+
+
+def reader(path, pragmas, deadline, counts, errors):
+    conn = connect(path, pragmas)
+    while time.monotonic() < deadline:
+        try:
+            conn.execute(
+                'SELECT skill_id, SUM(hours_spent), COUNT(*) FROM weekly_progress '
+                'WHERE student_id = ? GROUP BY skill_id',
+                (random.randint(1, 2000),)
+            ).fetchall()
+            counts['reads'] += 1
+        except sqlite3.OperationalError:
+            errors['reads'] += 1
+    conn.close()
+
+
+def writer(path, pragmas, deadline, counts, errors):
+    conn = connect(path, pragmas)
+    while time.monotonic() < deadline:
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'INSERT INTO weekly_progress (student_id, skill_id, week_number, year, proficiency_level, hours_spent) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (random.randint(1, 2000), random.randint(1, 50), random.randint(1, 52), 2026, random.choice(LEVELS), 3.5)
+            )
+            conn.execute('COMMIT')
+            counts['writes'] += 1
+        except sqlite3.OperationalError:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            errors['writes'] += 1
+    conn.close()
+
+
+def run_profile(name, pragmas, options):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite3')
+        seed(path, pragmas, options.rows)
+
+        counts = {'reads': 0, 'writes': 0}
+        errors = {'reads': 0, 'writes': 0}
+        deadline = time.monotonic() + options.seconds
+        threads = [
+            threading.Thread(target=reader, args=(path, pragmas, deadline, counts, errors))
+            for _ in range(options.readers)
+        ] + [
+            threading.Thread(target=writer, args=(path, pragmas, deadline, counts, errors))
+            for _ in range(options.writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    print(
+        f"{name:<10} reads/s: {counts['reads'] / options.seconds:>9.0f}   "
+        f"writes/s: {counts['writes'] / options.seconds:>8.0f}   "
+        f"lock errors: {errors['reads'] + errors['writes']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--rows', type=int, default=50000)
+    options = parser.parse_args()
+
+    print(f'{options.readers} readers, {options.writers} writers, {options.seconds}s per profile, {options.rows} seeded rows')
+    run_profile('baseline', BASELINE_PRAGMAS, options)
+    run_profile('tuned', settings.SQLITE_PRAGMAS, options)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure cold-start cost: module import time (python -X importtime) and the
+wall time from interpreter launch to the first served API response.
+
+    python benchmarks/startup.py --runs 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Boot Django, load every URLconf (and so every view module), serve one request
+FIRST_REQUEST = """
+import django
+django.setup()
+from django.test import Client
+response = Client().get('/api/skills/', HTTP_HOST='localhost')
+assert response.status_code in (200, 401), response.status_code
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'weekly_tracker.settings')
+    env.setdefault('SECRET_KEY', 'startup-benchmark')
+    env['ALLOWED_HOSTS'] = 'localhost'
+    return env
+
+
+def import_profile():
+    """(total microseconds, {top-level package: summed self microseconds of its modules})"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', FIRST_REQUEST],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    packages = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_time)
+        total += int(self_time)
+    return total, packages
+
+
+def first_request_seconds():
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST],
+        cwd=BACKEND_DIR, env=_env(), check=True, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    total, packages = import_profile()
+    print(f'Imports: {total / 1000:.1f} ms total')
+    for package, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {package}')
+
+    timings = [first_request_seconds() for _ in range(args.runs)]
+    print(
+        f'Launch to first response: median {statistics.median(timings) * 1000:.0f} ms, '
+        f'min {min(timings) * 1000:.0f} ms over {args.runs} runs'
+    )
+
+
+if __name__ == '__main__':
+    main()
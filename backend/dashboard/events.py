@@ -0,0 +1,84 @@
+import json
+import secrets
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from users.models import User
+from weekly_tracker.caches import require_shared_cache
+from weekly_tracker.events import get_event_bus
+
+# Browsers wait this long before reconnecting a dropped stream
+RECONNECT_MILLISECONDS = 3000
+
+STREAM_TICKET_SALT = 'dashboard.events.ticket'
+
+
+def issue_stream_ticket(user):
+    """
+    A signed, single-use ticket that opens one event stream for `user`.
+
+    EventSource can't send an Authorization header, so the stream URL
+    carries this instead of the access token; access logs record the URL,
+    and a ticket is spent or expired long before anyone reads them.
+    """
+    require_shared_cache('Stream tickets')
+    return signing.dumps({'user': user.pk, 'nonce': secrets.token_urlsafe(12)}, salt=STREAM_TICKET_SALT)
+
+
+def redeem_stream_ticket(ticket):
+    """The ticket's active user, or None if it is forged, expired or already used"""
+    try:
+        payload = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=settings.SSE_TICKET_SECONDS)
+    except signing.BadSignature:
+        return None
+    # Single use across every worker; a per-process cache would accept it once in each
+    require_shared_cache('Stream tickets')
+    if not cache.add(f"stream-ticket:{payload['nonce']}", True, settings.SSE_TICKET_SECONDS):
+        return None
+    return User.objects.filter(pk=payload['user'], is_active=True).first()
+
+
+def _in_scope(event, field, value):
+    """Whether an entry event, or a refresh event's scope, covers `value` of `field`"""
+    if 'entry' in event:
+        return event['entry'][field] == value
+    scope = event['scope'][f'{field}s']
+    return scope is None or value in scope
+
+
+def event_filter(user):
+    """Which progress events `user` may see, mirroring the dashboard's scoping"""
+    if user.role == 'admin':
+        if user.cohort_id is None:
+            return lambda event: True
+        return lambda event: _in_scope(event, 'cohort_id', user.cohort_id)
+    return lambda event: _in_scope(event, 'student_id', user.id)
+
+
+def _message(event_type, data):
+    return f'event: {event_type}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+async def stream_progress_events(user):
+    """
+    Server-Sent Events for `user` until SSE_STREAM_MAX_SECONDS have passed.
+
+    Waiting on the subscription queue costs nothing while idle; a comment is
+    sent every SSE_KEEPALIVE_SECONDS. A `resync` event means events were
+    dropped for a slow client, which should refetch the dashboard.
+    """
+    bus = get_event_bus()
+    subscription = bus.subscribe(event_filter(user))
+    deadline = time.monotonic() + settings.SSE_STREAM_MAX_SECONDS
+    try:
+        yield f'retry: {RECONNECT_MILLISECONDS}\n\n'
+        while (remaining := deadline - time.monotonic()) > 0:
+            event = await subscription.get(min(settings.SSE_KEEPALIVE_SECONDS, remaining))
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield _message('resync', {})
+            yield _message(event['type'], event) if event is not None else ': keepalive\n\n'
+    finally:
+        bus.unsubscribe(subscription)
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from dashboard.reports import stream_student_reports_zip, student_ids_for_reports
+
+
+class Command(BaseCommand):
+    help = 'Render one PDF report card per student into a ZIP archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=f'student-reports-{datetime.now().strftime("%Y-%m-%d")}.zip',
+            help='Path of the ZIP archive to write'
+        )
+        parser.add_argument('--workers', type=int, default=None, help='Renderer processes (default: CPU count)')
+        parser.add_argument('--student', type=int, action='append', dest='student_ids', help='Limit to a student id (repeatable)')
+
+    def handle(self, *args, **options):
+        student_ids = student_ids_for_reports(options['student_ids'])
+        self.stdout.write(f'Rendering {len(student_ids)} report cards...')
+
+        with open(options['output'], 'wb') as archive:
+            for chunk in stream_student_reports_zip(student_ids, workers=options['workers']):
+                archive.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
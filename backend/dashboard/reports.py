@@ -0,0 +1,367 @@
+import io
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from django.db import connections
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.utils.text import slugify
+from progress.models import WeeklyProgress
+from skills.models import Skill
+from users.cohorts import scope_to_cohort
+from users.models import User
+
+
+def collect_global_report_data(user=None):
+    """
+    Summary, top skills and proficiency mix across every student.
+
+    A cohort admin's report covers their cohort alone; the skill counters
+    are global, so it is aggregated from the cohort's progress instead.
+    """
+    if user is not None and user.cohort_id is not None:
+        return _collect_report_data(scope_to_cohort(WeeklyProgress.objects.all(), user))
+
+    top_skills = Skill.objects.order_by('-total_hours')[:10]
+
+    rows = []
+    for skill in top_skills:
+        rows.append({
+            'skill_name': skill.skill_name,
+            'category': skill.category,
+            'total_hours': float(skill.total_hours),
+            'practice_count': skill.practice_count,
+            'latest_proficiency': skill.latest_proficiency or 'beginner',
+        })
+
+    total_entries = WeeklyProgress.objects.count()
+    total_hours = WeeklyProgress.objects.aggregate(Sum('hours_spent'))['hours_spent__sum'] or 0
+
+    return {
+        'total_entries': total_entries,
+        'total_hours': total_hours,
+        'skills_practiced': Skill.objects.count(),
+        'top_skills': rows,
+        'proficiency_counts': list(
+            WeeklyProgress.objects.values('proficiency_level').annotate(count=Count('id'))
+        ),
+    }
+
+
+def collect_student_report_data(student):
+    """Same report sections as the global export, scoped to one student"""
+    return _collect_report_data(WeeklyProgress.objects.filter(student=student))
+
+
+def _collect_report_data(queryset):
+    """Report sections aggregated from a subset of progress"""
+    latest_level = queryset.filter(skill_id=OuterRef('skill_id')).order_by('-created_at').values(
+        'proficiency_level'
+    )[:1]
+    top_skills = queryset.values('skill_id', 'skill__skill_name', 'skill__category').annotate(
+        total_hours=Sum('hours_spent'),
+        practice_count=Count('id'),
+        latest_proficiency=Subquery(latest_level)
+    ).order_by('-total_hours')[:10]
+
+    rows = []
+    for skill in top_skills:
+        rows.append({
+            'skill_name': skill['skill__skill_name'],
+            'category': skill['skill__category'],
+            'total_hours': float(skill['total_hours'] or 0),
+            'practice_count': skill['practice_count'],
+            'latest_proficiency': skill['latest_proficiency'] or 'beginner',
+        })
+
+    totals = queryset.aggregate(
+        total_entries=Count('id'),
+        total_hours=Sum('hours_spent'),
+        skills_practiced=Count('skill', distinct=True)
+    )
+
+    return {
+        'total_entries': totals['total_entries'],
+        'total_hours': totals['total_hours'] or 0,
+        'skills_practiced': totals['skills_practiced'],
+        'top_skills': rows,
+        'proficiency_counts': list(queryset.values('proficiency_level').annotate(count=Count('id'))),
+    }
+
+
+def build_report(output, title, subtitle, total_entries, total_hours, skills_practiced,
+                 top_skills, proficiency_counts):
+    """Render the clean table-format progress report into a file-like object"""
+    # ReportLab adds ~100 ms to startup; only pay for it when a report is rendered
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+
+    doc = SimpleDocTemplate(output, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    elements = []
+
+    # Styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=20,
+        textColor=colors.HexColor('#1f2937'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#374151'),
+        spaceAfter=12,
+        fontName='Helvetica-Bold'
+    )
+
+    # Title
+    elements.append(Paragraph(title, title_style))
+    elements.append(Spacer(1, 0.2*inch))
+
+    # Header Info
+    elements.append(Paragraph(subtitle, styles['Normal']))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # ========== SUMMARY STATISTICS TABLE ==========
+    elements.append(Paragraph('Summary Statistics', heading_style))
+
+    avg_hours = round(total_hours / max(total_entries, 1), 1)
+
+    summary_data = [
+        ['Total Entries', f'{total_entries}'],
+        ['Total Hours', f'{total_hours:.1f} h'],
+        ['Average Hours/Week', f'{avg_hours} h'],
+        ['Skills Practiced', f'{skills_practiced}']
+    ]
+
+    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1e293b')),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
+        ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#f1f5f9')),
+        ('TEXTCOLOR', (1, 0), (1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
+    ]))
+
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # ========== TOP SKILLS BY HOURS - CLEAN TABLE FORMAT ==========
+    elements.append(Paragraph('Top Skills by Hours', heading_style))
+
+    # Build table data with proper headers
+    table_data = [
+        ['Rank', 'Skill Name', 'Category', 'Total Hours', 'Sessions', 'Avg Hours/Session', 'Latest Level']
+    ]
+
+    # Add rows for each skill
+    for idx, skill in enumerate(top_skills, 1):
+        sessions = skill['practice_count'] or 0
+        total_h = skill['total_hours']
+        avg_h = (total_h / sessions) if sessions > 0 else 0.0
+
+        table_data.append([
+            str(idx),                                     # Rank
+            str(skill['skill_name']),                     # Skill Name
+            str(skill['category']),                       # Category
+            f'{total_h:.1f} h',                           # Total Hours with 1 decimal
+            str(sessions),                                # Sessions/Practice Count
+            f'{avg_h:.1f} h',                             # Average Hours per Session
+            skill['latest_proficiency'].capitalize()      # Latest Proficiency Level
+        ])
+
+    # Create the table with proper column widths
+    top_skills_table = Table(
+        table_data,
+        colWidths=[0.55*inch, 1.95*inch, 1.3*inch, 1.1*inch, 0.9*inch, 1.3*inch, 1.15*inch],
+        repeatRows=1
+    )
+
+    # Apply professional table styling
+    top_skills_table.setStyle(TableStyle([
+        # ===== HEADER ROW (Row 0) =====
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+
+        # ===== DATA ROWS (Row 1 onwards) =====
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
+
+        # ===== COLUMN ALIGNMENT =====
+        ('ALIGN', (0, 1), (0, -1), 'CENTER'),      # Rank - center
+        ('ALIGN', (1, 1), (2, -1), 'LEFT'),        # Skill & Category - left
+        ('ALIGN', (3, 1), (-1, -1), 'CENTER'),     # All metrics - center
+
+        # ===== GRID & BORDERS =====
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+
+        # ===== PADDING =====
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+    ]))
+
+    elements.append(top_skills_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # ========== PROFICIENCY DISTRIBUTION TABLE ==========
+    elements.append(Paragraph('Proficiency Distribution', heading_style))
+
+    total_records = sum(item['count'] for item in proficiency_counts)
+
+    prof_data = [['Proficiency Level', 'Count', 'Percentage']]
+    for prof in proficiency_counts:
+        percentage = round((prof['count'] / total_records * 100), 1) if total_records > 0 else 0
+        prof_data.append([
+            prof['proficiency_level'].capitalize(),
+            str(prof['count']),
+            f'{percentage}%'
+        ])
+
+    prof_table = Table(prof_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
+    prof_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f9fafb')),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 1), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
+    ]))
+
+    elements.append(prof_table)
+    elements.append(Spacer(1, 0.2*inch))
+
+    # ========== FOOTER ==========
+    footer_text = f"Page 1 of 1 | Report generated on {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
+    elements.append(Paragraph(footer_text, ParagraphStyle('footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=TA_CENTER)))
+
+    # Build PDF
+    doc.build(elements)
+
+
+# ========== PER-STUDENT REPORT CARDS ==========
+
+def render_student_report(student_id):
+    """Render one student's report card, returning (filename, pdf bytes)"""
+    student = User.objects.get(pk=student_id)
+    buffer = io.BytesIO()
+    build_report(
+        buffer,
+        title='Weekly Skill Tracker - Report Card',
+        subtitle=f"Student: {student.name} | Email: {student.email} | Date: {datetime.now().strftime('%d/%m/%Y')}",
+        **collect_student_report_data(student)
+    )
+    filename = f"{student.id}-{slugify(student.name) or 'student'}.pdf"
+    return filename, buffer.getvalue()
+
+
+def _init_report_worker():
+    """Give each pool process its own Django setup and DB connections"""
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def iter_student_reports(student_ids, workers=None):
+    """
+    Yield (filename, pdf bytes) per student, rendered across a process pool.
+
+    Only ``workers * 2`` reports are in flight at once, so a large cohort
+    never sits fully rendered in memory while the consumer catches up.
+    With one worker (or none) reports are rendered in the calling thread.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for student_id in student_ids:
+            yield render_student_report(student_id)
+        return
+
+    student_ids = iter(student_ids)
+
+    # Forked workers must not share the parent's open DB sockets
+    connections.close_all()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_report_worker) as executor:
+        pending = deque()
+        for student_id in student_ids:
+            pending.append(executor.submit(render_student_report, student_id))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _ZipChunkBuffer:
+    """Write-only sink that hands zip output back in chunks"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_student_reports_zip(student_ids, workers=None):
+    """Yield a ZIP archive of student report cards chunk by chunk"""
+    buffer = _ZipChunkBuffer()
+    # The buffer has no tell()/seek(), so zipfile writes streaming data descriptors
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, pdf in iter_student_reports(student_ids, workers=workers):
+            archive.writestr(filename, pdf)
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def student_ids_for_reports(student_ids=None, user=None):
+    """Resolve the students to export, defaulting to every student `user` administers"""
+    queryset = scope_to_cohort(User.objects.filter(role='student'), user).order_by('id')
+    if student_ids:
+        queryset = queryset.filter(id__in=student_ids)
+    # Materialised up front: the pool closes DB connections before forking
+    return list(queryset.values_list('id', flat=True))
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+from users.models import User
+
+
+class StudentRosterSerializer(serializers.ModelSerializer):
+    """Student with progress aggregates annotated by StudentRosterView"""
+    total_hours = serializers.FloatField()
+    entry_count = serializers.IntegerField()
+    skills_practiced = serializers.IntegerField()
+    # Monday of the student's latest logged week
+    last_activity = serializers.DateField(allow_null=True)
+    proficiency_mix = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = [
+            'id', 'name', 'email', 'total_hours', 'entry_count',
+            'skills_practiced', 'last_activity', 'proficiency_mix'
+        ]
+
+    def get_proficiency_mix(self, obj):
+        # Skills per current level, from each skill's latest entry
+        return {
+            'beginner': obj.beginner_count,
+            'intermediate': obj.intermediate_count,
+            'advanced': obj.advanced_count,
+        }
@@ -0,0 +1,174 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+
+from progress.models import WeeklyProgress
+from skills.models import Skill
+from users.cohorts import scope_to_cohort
+from users.models import Cohort, User
+
+
+def _progress_for(user):
+    if user.role == 'admin':
+        return scope_to_cohort(WeeklyProgress.objects.all(), user)
+    return WeeklyProgress.objects.filter(student=user)
+
+
+def total_students(user):
+    if user.role != 'admin':
+        return 0
+    return scope_to_cohort(User.objects.filter(role='student'), user).count()
+
+
+def total_progress_entries(user):
+    return _progress_for(user).count()
+
+
+def total_hours(user):
+    hours = _progress_for(user).aggregate(Sum('hours_spent'))['hours_spent__sum'] or 0
+    return float(hours)
+
+
+def total_skills(user):
+    return Skill.objects.count()
+
+
+def _cohort_top_skills(user):
+    latest = WeeklyProgress.objects.filter(
+        cohort_id=user.cohort_id, skill_id=OuterRef('skill_id')
+    ).order_by('-created_at').values('proficiency_level')[:1]
+    rows = (
+        _progress_for(user).values('skill_id', 'skill__skill_name', 'skill__category')
+        .annotate(total_hours=Sum('hours_spent'), practice_count=Count('id'), latest_proficiency=Subquery(latest))
+        .order_by('-total_hours')[:5]
+    )
+    return [
+        {
+            'skill_id': row['skill_id'],
+            'skill_name': row['skill__skill_name'],
+            'category': row['skill__category'],
+            'total_hours': float(row['total_hours']),
+            'practice_count': row['practice_count'],
+            'latest_proficiency': row['latest_proficiency'] or 'beginner'
+        }
+        for row in rows
+    ]
+
+
+def top_skills(user):
+    if user.role == 'admin' and user.cohort_id is not None:
+        # The skill counters are global; a cohort admin gets their cohort's totals
+        return _cohort_top_skills(user)
+    # Maintained counters, indexed ORDER BY ... LIMIT
+    return [
+        {
+            'skill_id': skill.id,
+            'skill_name': skill.skill_name,
+            'category': skill.category,
+            'total_hours': float(skill.total_hours),
+            'practice_count': skill.practice_count,
+            'latest_proficiency': skill.latest_proficiency or 'beginner'
+        }
+        for skill in Skill.objects.order_by('-total_hours')[:5]
+    ]
+
+
+def recent_progress(user):
+    entries = _progress_for(user).select_related('skill').order_by('-created_at')[:5]
+    return [
+        {
+            'id': entry.id,
+            'skill_details': {
+                'skill_name': entry.skill.skill_name,
+                'category': entry.skill.category
+            },
+            'week_number': entry.week_number,
+            'year': entry.year,
+            'hours_spent': float(entry.hours_spent),
+            'proficiency_level': entry.proficiency_level
+        }
+        for entry in entries
+    ]
+
+
+# Each section is an independent query, keyed as it appears in the response
+SUMMARY_SECTIONS = {
+    'total_students': total_students,
+    'total_progress_entries': total_progress_entries,
+    'total_hours': total_hours,
+    'total_skills': total_skills,
+    'top_skills': top_skills,
+    'recent_progress': recent_progress,
+}
+
+
+def dashboard_summary(user):
+    """Build the dashboard payload one query after another"""
+    return {key: section(user) for key, section in SUMMARY_SECTIONS.items()}
+
+
+def _run_section(section, user):
+    # Worker threads hold their own connection; recycle it like a request would
+    close_old_connections()
+    try:
+        return section(user)
+    finally:
+        close_old_connections()
+
+
+async def adashboard_summary(user):
+    """
+    Build the dashboard payload with every section's query in flight at once.
+
+    Each section runs on its own executor thread, and so on its own database
+    connection, instead of queueing behind the others on the request thread.
+    """
+    results = await asyncio.gather(*(
+        sync_to_async(_run_section, thread_sensitive=False)(section, user)
+        for section in SUMMARY_SECTIONS.values()
+    ))
+    return dict(zip(SUMMARY_SECTIONS, results))
+
+
+def cohort_rollups(user):
+    """Per-cohort totals, one grouped query each over students and progress"""
+    students = dict(
+        scope_to_cohort(User.objects.filter(role='student'), user)
+        .values('cohort_id').annotate(count=Count('id')).values_list('cohort_id', 'count')
+    )
+    progress = {
+        row['cohort_id']: row
+        for row in scope_to_cohort(WeeklyProgress.objects.all(), user).values('cohort_id').annotate(
+            entries=Count('id'),
+            total_hours=Sum('hours_spent'),
+            active_students=Count('student_id', distinct=True),
+            skills_practiced=Count('skill_id', distinct=True),
+            **{
+                level: Count('id', filter=Q(proficiency_level=level))
+                for level, _ in WeeklyProgress.PROFICIENCY_CHOICES
+            }
+        )
+    }
+    names = dict(Cohort.objects.filter(id__in=[key for key in {*students, *progress} if key]).values_list('id', 'name'))
+
+    rollups = []
+    for cohort_id in sorted({*students, *progress}, key=lambda key: (key is None, names.get(key, ''))):
+        row = progress.get(cohort_id, {})
+        student_count = students.get(cohort_id, 0)
+        total = float(row.get('total_hours') or 0)
+        rollups.append({
+            'cohort_id': cohort_id,
+            'cohort_name': names.get(cohort_id, 'Unassigned'),
+            'students': student_count,
+            'active_students': row.get('active_students', 0),
+            'progress_entries': row.get('entries', 0),
+            'total_hours': round(total, 2),
+            'average_hours_per_student': round(total / student_count, 2) if student_count else 0,
+            'skills_practiced': row.get('skills_practiced', 0),
+            'proficiency_distribution': {
+                level: row.get(level, 0) for level, _ in WeeklyProgress.PROFICIENCY_CHOICES
+            },
+        })
+    return rollups
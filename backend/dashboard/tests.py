@@ -1,3 +1,222 @@
-from django.test import TestCase
+import io
+import os
+import subprocess
+import sys
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from progress.events import progress_refresh_event
+from progress.models import WeeklyProgress
+from skills.models import Skill
+from users.models import Cohort, User
+from .events import event_filter, issue_stream_ticket, redeem_stream_ticket
+from .reports import collect_global_report_data, collect_student_report_data
+
+
+class CohortScopingTests(TestCase):
+    """Cohort admins only see their own cohort's students and progress"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.red = Cohort.objects.create(name='Red')
+        cls.blue = Cohort.objects.create(name='Blue')
+        cls.red_admin = User.objects.create_user('red-admin@example.com', 'Red Admin', 'pw', role='admin', cohort=cls.red)
+        cls.global_admin = User.objects.create_user('admin@example.com', 'Admin', 'pw', role='admin')
+        cls.red_student = User.objects.create_user('red@example.com', 'Red Student', 'pw', cohort=cls.red)
+        cls.blue_student = User.objects.create_user('blue@example.com', 'Blue Student', 'pw', cohort=cls.blue)
+        cls.python = Skill.objects.create(skill_name='Python', category='Programming')
+        cls.git = Skill.objects.create(skill_name='Git', category='Tools')
+
+        WeeklyProgress.objects.create(
+            student=cls.red_student, skill=cls.python, week_number=10, year=2026,
+            hours_spent=4, proficiency_level='beginner'
+        )
+        WeeklyProgress.objects.create(
+            student=cls.red_student, skill=cls.python, week_number=11, year=2026,
+            hours_spent=6, proficiency_level='intermediate'
+        )
+        WeeklyProgress.objects.create(
+            student=cls.blue_student, skill=cls.git, week_number=10, year=2026,
+            hours_spent=20, proficiency_level='advanced'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_report_data_is_scoped_to_cohort(self):
+        data = collect_global_report_data(self.red_admin)
+
+        self.assertEqual(data['total_entries'], 2)
+        self.assertEqual(data['total_hours'], 10)
+        self.assertEqual(data['skills_practiced'], 1)
+        self.assertEqual([skill['skill_name'] for skill in data['top_skills']], ['Python'])
+        self.assertEqual(data['top_skills'][0]['latest_proficiency'], 'intermediate')
+        self.assertNotIn('advanced', [row['proficiency_level'] for row in data['proficiency_counts']])
+
+    def test_report_latest_levels_come_from_the_aggregate(self):
+        WeeklyProgress.objects.create(
+            student=self.red_student, skill=self.git, week_number=12, year=2026,
+            hours_spent=1, proficiency_level='advanced'
+        )
+        # Top skills, totals and the proficiency mix; no query per skill
+        with self.assertNumQueries(3):
+            data = collect_student_report_data(self.red_student)
+
+        self.assertEqual(
+            [(skill['skill_name'], skill['latest_proficiency']) for skill in data['top_skills']],
+            [('Python', 'intermediate'), ('Git', 'advanced')]
+        )
+
+    def test_global_admin_report_covers_every_cohort(self):
+        data = collect_global_report_data(self.global_admin)
+
+        self.assertEqual(data['total_entries'], 3)
+        self.assertEqual(data['top_skills'][0]['skill_name'], 'Git')
+
+    def test_export_report_renders_cohort_pdf(self):
+        self.client.force_authenticate(self.red_admin)
+        response = self.client.get('/api/dashboard/export/export_report/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_student_reports_zip_covers_cohort_students(self):
+        self.client.force_authenticate(self.red_admin)
+        response = self.client.get('/api/dashboard/export/student_reports/')
+
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), [f'{self.red_student.id}-red-student.pdf'])
+
+    def test_roster_lists_only_cohort_students(self):
+        self.client.force_authenticate(self.red_admin)
+        response = self.client.get('/api/dashboard/roster/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([student['email'] for student in response.data['results']], ['red@example.com'])
+
+    def test_roster_proficiency_mix_counts_current_levels(self):
+        WeeklyProgress.objects.create(
+            student=self.red_student, skill=self.git, week_number=11, year=2026,
+            hours_spent=1, proficiency_level='beginner'
+        )
+        self.client.force_authenticate(self.red_admin)
+        response = self.client.get('/api/dashboard/roster/')
+
+        student = response.data['results'][0]
+        # Python moved from beginner to intermediate; the earlier week no longer counts
+        self.assertEqual(student['proficiency_mix'], {'beginner': 1, 'intermediate': 1, 'advanced': 0})
+        self.assertEqual(student['entry_count'], 3)
+
+    def test_roster_last_activity_is_latest_week_start(self):
+        quiet = User.objects.create_user('quiet@example.com', 'Quiet Student', 'pw', cohort=self.red)
+        self.client.force_authenticate(self.red_admin)
+        response = self.client.get('/api/dashboard/roster/', {'ordering': '-last_activity'})
+
+        self.assertEqual(
+            [(student['email'], student['last_activity']) for student in response.data['results']],
+            [('red@example.com', '2026-03-09'), (quiet.email, None)]
+        )
+
+    def test_dashboard_top_skills_use_latest_cohort_entry(self):
+        self.client.force_authenticate(self.red_admin)
+        response = self.client.get('/api/dashboard/index/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_students'], 1)
+        self.assertEqual(
+            [(skill['skill_name'], skill['latest_proficiency']) for skill in response.data['top_skills']],
+            [('Python', 'intermediate')]
+        )
+
+
+class ReportImportTests(SimpleTestCase):
+    def test_reportlab_is_loaded_only_when_a_report_renders(self):
+        # A fresh interpreter: this test process has usually rendered a PDF already
+        script = (
+            'import sys, django; django.setup(); '
+            'import weekly_tracker.urls, dashboard.reports; '
+            'sys.exit("reportlab" in sys.modules)'
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'weekly_tracker.settings'}
+        result = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True)
+
+        self.assertEqual(result.returncode, 0, result.stderr or 'reportlab was imported at startup')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_cache'}})
+class StreamTicketTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('createcachetable', verbosity=0)
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+
+    def test_ticket_is_single_use(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        ticket = client.post('/api/dashboard/events/ticket/').data['ticket']
+
+        self.assertEqual(redeem_stream_ticket(ticket), self.student)
+        self.assertIsNone(redeem_stream_ticket(ticket))
+
+    def test_forged_and_expired_tickets_are_refused(self):
+        ticket = issue_stream_ticket(self.student)
+
+        self.assertIsNone(redeem_stream_ticket(ticket[:-2] + 'xx'))
+        with override_settings(SSE_TICKET_SECONDS=-1):
+            self.assertIsNone(redeem_stream_ticket(ticket))
+
+    def test_process_local_cache_is_refused(self):
+        ticket = issue_stream_ticket(self.student)
+
+        # Each worker would accept the ticket once from its own cache
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertRaises(ImproperlyConfigured):
+                redeem_stream_ticket(ticket)
+            with self.assertRaises(ImproperlyConfigured):
+                issue_stream_ticket(self.student)
+
+    def test_wsgi_requests_are_told_to_use_asgi(self):
+        response = self.client.get('/api/dashboard/events/')
+
+        self.assertEqual(response.status_code, 501)
+
+    @override_settings(SSE_STREAM_MAX_SECONDS=0)
+    async def test_ticket_opens_one_stream(self):
+        ticket = await sync_to_async(issue_stream_ticket)(self.student)
+        response = await AsyncClient().get('/api/dashboard/events/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual([chunk async for chunk in response.streaming_content], [b'retry: 3000\n\n'])
+
+        response = await AsyncClient().get('/api/dashboard/events/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_access_token_in_url_is_not_accepted(self):
+        token = str(AccessToken.for_user(self.student))
+        response = await AsyncClient().get('/api/dashboard/events/', {'token': token})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_events_reach_only_their_scope(self):
+        red, blue = Cohort.objects.create(name='Red'), Cohort.objects.create(name='Blue')
+        red_admin = User.objects.create_user('red-admin@example.com', 'Red Admin', 'pw', role='admin', cohort=red)
+        blue_admin = User.objects.create_user('blue-admin@example.com', 'Blue Admin', 'pw', role='admin', cohort=blue)
+        other = User.objects.create_user('other@example.com', 'Other', 'pw')
+        event = progress_refresh_event([self.student.id], [red.id])
+
+        self.assertTrue(event_filter(self.student)(event))
+        self.assertTrue(event_filter(red_admin)(event))
+        self.assertFalse(event_filter(blue_admin)(event))
+        self.assertFalse(event_filter(other)(event))
+
+        with mock.patch('progress.events.MAX_REFRESH_SCOPE', 0):
+            self.assertTrue(event_filter(other)(progress_refresh_event([self.student.id], [red.id])))
@@ -1,9 +1,13 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import DashboardView, GeneratePDFView
+from .views import DashboardView, GeneratePDFView, StudentRosterView, dashboard_events, dashboard_summary_async
 
 router = DefaultRouter()
 router.register(r'', DashboardView, basename='dashboard')
 router.register(r'export', GeneratePDFView, basename='export-pdf')
 
-urlpatterns = router.urls
+urlpatterns = [
+    path('summary/', dashboard_summary_async, name='dashboard-summary'),
+    path('events/', dashboard_events, name='dashboard-events'),
+    path('roster/', StudentRosterView.as_view(), name='student-roster'),
+] + router.urls
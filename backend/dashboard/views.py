@@ -1,283 +1,218 @@
-from django.http import HttpResponse
-from rest_framework import viewsets
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from rest_framework import viewsets, status, generics, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
-from django.db.models import Sum, Count, F, Q
+from rest_framework.settings import api_settings
+from django.db.models import Sum, Count, Q, Max, OuterRef, Subquery
 from django.db.models.functions import Coalesce
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from datetime import datetime
 from progress.models import WeeklyProgress
-from skills.models import Skill
+from users.cohorts import scope_to_cohort
 from users.models import User
+from weekly_tracker.db_router import choose_replica, replica_reads, use_replica
+from weekly_tracker.renderers import FastJSONRenderer
+from .serializers import StudentRosterSerializer
+from .events import issue_stream_ticket, redeem_stream_ticket, stream_progress_events
+from .summary import adashboard_summary, cohort_rollups, dashboard_summary
+from .reports import (
+    build_report,
+    collect_global_report_data,
+    stream_student_reports_zip,
+    student_ids_for_reports,
+)
 
 
 class DashboardView(viewsets.ViewSet):
     """Dashboard API endpoints"""
 
     @action(detail=False, methods=['get'])
+    @replica_reads
     def index(self, request):
         """Get dashboard summary data"""
-        user = request.user
-
-        # Basic statistics
-        if user.role == 'admin':
-            total_students = User.objects.filter(role='student').count()
-            total_progress_entries = WeeklyProgress.objects.count()
-            total_hours = WeeklyProgress.objects.aggregate(Sum('hours_spent'))['hours_spent__sum'] or 0
-        else:
-            total_students = 0
-            total_progress_entries = WeeklyProgress.objects.filter(student=user).count()
-            total_hours = WeeklyProgress.objects.filter(student=user).aggregate(Sum('hours_spent'))['hours_spent__sum'] or 0
-
-        total_skills = Skill.objects.count()
-
-        # Top skills by hours
-        top_skills = []
-        skills = Skill.objects.annotate(
-            total_hours=Coalesce(Sum('weeklyprogress__hours_spent'), 0),
-            practice_count=Count('weeklyprogress')
-        ).order_by('-total_hours')[:5]
-
-        for skill in skills:
-            latest_progress = skill.weeklyprogress_set.order_by('-created_at').first()
-            top_skills.append({
-                'skill_id': skill.id,
-                'skill_name': skill.skill_name,
-                'category': skill.category,
-                'total_hours': float(skill.total_hours),
-                'practice_count': skill.practice_count,
-                'latest_proficiency': latest_progress.proficiency_level if latest_progress else 'beginner'
-            })
-
-        # Recent progress
-        if user.role == 'admin':
-            recent_progress = WeeklyProgress.objects.select_related('skill', 'student').order_by('-created_at')[:5]
-        else:
-            recent_progress = WeeklyProgress.objects.filter(student=user).select_related('skill').order_by('-created_at')[:5]
-
-        recent_data = []
-        for entry in recent_progress:
-            recent_data.append({
-                'id': entry.id,
-                'skill_details': {
-                    'skill_name': entry.skill.skill_name,
-                    'category': entry.skill.category
-                },
-                'week_number': entry.week_number,
-                'year': entry.year,
-                'hours_spent': float(entry.hours_spent),
-                'proficiency_level': entry.proficiency_level
-            })
+        return Response(dashboard_summary(request.user))
 
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def cohorts(self, request):
+        """Per-cohort student, hours and proficiency totals (admins only)"""
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Only admins can view cohort rollups'
+            }, status=status.HTTP_403_FORBIDDEN)
+        return Response(cohort_rollups(request.user))
+
+    @action(detail=False, methods=['post'], url_path='events/ticket')
+    def events_ticket(self, request):
+        """Single-use ticket for opening the event stream (?ticket=) without a token in the URL"""
         return Response({
-            'total_students': total_students,
-            'total_progress_entries': total_progress_entries,
-            'total_hours': float(total_hours),
-            'total_skills': total_skills,
-            'top_skills': top_skills,
-            'recent_progress': recent_data
+            'ticket': issue_stream_ticket(request.user),
+            'expires_in': settings.SSE_TICKET_SECONDS
         })
 
 
+def _authenticate(request):
+    drf_request = Request(request, authenticators=[
+        authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ])
+    return drf_request.user
+
+
+def _json_response(data, status_code=200):
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        content_type='application/json',
+        status=status_code
+    )
+
+
+def _authenticate_stream(request):
+    # EventSource can't send an Authorization header; it passes a ticket from events/ticket/
+    ticket = request.GET.get('ticket')
+    if ticket and 'HTTP_AUTHORIZATION' not in request.META:
+        user = redeem_stream_ticket(ticket)
+        if user is None:
+            raise AuthenticationFailed('Stream ticket is invalid, expired or already used')
+        return user
+    return _authenticate(request)
+
+
+async def _aauthenticate(request, authenticate=_authenticate):
+    """(user, None), or (None, a 401 response) for async views outside DRF"""
+    try:
+        user = await sync_to_async(authenticate)(request)
+    except AuthenticationFailed as exc:
+        detail = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+        return None, _json_response(detail, status.HTTP_401_UNAUTHORIZED)
+
+    if not user.is_authenticated:
+        return None, _json_response(
+            {'detail': NotAuthenticated.default_detail}, status.HTTP_401_UNAUTHORIZED
+        )
+    return user, None
+
+
+async def dashboard_summary_async(request):
+    """Same payload as the dashboard index, with its queries run concurrently"""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    user, error = await _aauthenticate(request)
+    if error:
+        return error
+
+    # The pin check reads the cache, which may be a database table or a network round trip
+    replica = await sync_to_async(choose_replica)(user)
+    with use_replica(replica):
+        data = await adashboard_summary(user)
+    return _json_response(data)
+
+
+async def dashboard_events(request):
+    """Server-Sent Events stream of progress changes, replacing dashboard polling"""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the stream would hold a worker thread for its whole life
+        return _json_response({
+            'error': 'The event stream is only served by the ASGI app (SERVER_INTERFACE=asgi)'
+        }, status.HTTP_501_NOT_IMPLEMENTED)
+
+    user, error = await _aauthenticate(request, _authenticate_stream)
+    if error:
+        return error
+
+    response = StreamingHttpResponse(stream_progress_events(user), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx and similar proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class StudentRosterView(generics.ListAPIView):
+    """Paginated admin roster of students with their progress totals"""
+    serializer_class = StudentRosterSerializer
+    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    ordering_fields = [
+        'name', 'email', 'total_hours', 'entry_count', 'skills_practiced',
+        'last_activity', 'beginner_count', 'intermediate_count', 'advanced_count'
+    ]
+    ordering = ['name']
+    search_fields = ['name', 'email']
+
+    def get_queryset(self):
+        # One grouped query over users LEFT JOIN weekly_progress
+        students = scope_to_cohort(User.objects.filter(role='student'), self.request.user)
+        # The proficiency mix counts skills at their current level: only each skill's latest entry
+        latest_entry = WeeklyProgress.objects.filter(
+            student_id=OuterRef('progress_entries__student_id'), skill_id=OuterRef('progress_entries__skill_id')
+        ).order_by('-year', '-week_number').values('id')[:1]
+        is_latest = Q(progress_entries__id=Subquery(latest_entry))
+        return students.annotate(
+            total_hours=Coalesce(Sum('progress_entries__hours_spent'), 0.0),
+            entry_count=Count('progress_entries'),
+            skills_practiced=Count('progress_entries__skill', distinct=True),
+            last_activity=Max('progress_entries__week_start'),
+            **{
+                f'{level}_count': Count('progress_entries', filter=is_latest & Q(progress_entries__proficiency_level=level))
+                for level, _ in WeeklyProgress.PROFICIENCY_CHOICES
+            },
+        )
+
+    @replica_reads
+    def list(self, request, *args, **kwargs):
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Only admins can view the student roster'
+            }, status=status.HTTP_403_FORBIDDEN)
+        return super().list(request, *args, **kwargs)
+
+
 class GeneratePDFView(viewsets.ViewSet):
     """Generate PDF reports for skill tracking"""
 
     @action(detail=False, methods=['get'])
+    @replica_reads
     def export_report(self, request):
         """Export comprehensive skill report with clean table format"""
-        
-        # Get all skills with aggregated data
-        top_skills = Skill.objects.annotate(
-            total_hours=Coalesce(Sum('weeklyprogress__hours_spent'), 0),
-            practice_count=Count('weeklyprogress')
-        ).order_by('-total_hours')[:10]
-
-        # Create PDF
         response = HttpResponse(content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="skill-tracker-report-{datetime.now().strftime("%Y-%m-%d")}.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        elements = []
-
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#1f2937'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#374151'),
-            spaceAfter=12,
-            fontName='Helvetica-Bold'
+
+        build_report(
+            response,
+            title='Weekly Skill Tracker - Progress Report',
+            subtitle=f"Generated for {request.user.name} | Role: {request.user.role} | Date: {datetime.now().strftime('%d/%m/%Y')}",
+            **collect_global_report_data(request.user)
         )
+        return response
 
-        # Title
-        elements.append(Paragraph('Weekly Skill Tracker - Progress Report', title_style))
-        elements.append(Spacer(1, 0.2*inch))
-
-        # Header Info
-        user_info = f"Generated for {request.user.name} | Role: {request.user.role} | Date: {datetime.now().strftime('%d/%m/%Y')}"
-        elements.append(Paragraph(user_info, styles['Normal']))
-        elements.append(Spacer(1, 0.3*inch))
-
-        # ========== SUMMARY STATISTICS TABLE ==========
-        elements.append(Paragraph('Summary Statistics', heading_style))
-        
-        total_entries = WeeklyProgress.objects.count()
-        total_hours_sum = WeeklyProgress.objects.aggregate(Sum('hours_spent'))['hours_spent__sum'] or 0
-        avg_hours = round(total_hours_sum / max(total_entries, 1), 1)
-        total_skills_count = Skill.objects.count()
-
-        summary_data = [
-            ['Total Entries', f'{total_entries}'],
-            ['Total Hours', f'{total_hours_sum:.1f} h'],
-            ['Average Hours/Week', f'{avg_hours} h'],
-            ['Skills Practiced', f'{total_skills_count}']
-        ]
-        
-        summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#1e293b')),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-            ('BACKGROUND', (1, 0), (1, -1), colors.HexColor('#f1f5f9')),
-            ('TEXTCOLOR', (1, 0), (1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
-        ]))
-        
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.3*inch))
-
-        # ========== TOP SKILLS BY HOURS - CLEAN TABLE FORMAT ==========
-        elements.append(Paragraph('Top Skills by Hours', heading_style))
-        
-        # Build table data with proper headers
-        table_data = [
-            ['Rank', 'Skill Name', 'Category', 'Total Hours', 'Sessions', 'Avg Hours/Session', 'Latest Level']
+    @action(detail=False, methods=['get'])
+    def student_reports(self, request):
+        """Export one PDF report card per student, streamed as a ZIP archive"""
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Only admins can export student reports'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        student_ids = [
+            value for value in request.query_params.get('student_ids', '').split(',') if value.strip()
         ]
-        
-        # Add rows for each skill
-        for idx, skill in enumerate(top_skills, 1):
-            latest_progress = skill.weeklyprogress_set.order_by('-created_at').first()
-            proficiency = latest_progress.proficiency_level.capitalize() if latest_progress else 'Beginner'
-            
-            sessions = skill.practice_count if skill.practice_count else 0
-            total_h = float(skill.total_hours)
-            avg_h = (total_h / sessions) if sessions > 0 else 0.0
-            
-            table_data.append([
-                str(idx),                      # Rank
-                str(skill.skill_name),         # Skill Name
-                str(skill.category),           # Category
-                f'{total_h:.1f} h',            # Total Hours with 1 decimal
-                str(sessions),                 # Sessions/Practice Count
-                f'{avg_h:.1f} h',              # Average Hours per Session
-                str(proficiency)               # Latest Proficiency Level
-            ])
-        
-        # Create the table with proper column widths
-        top_skills_table = Table(
-            table_data,
-            colWidths=[0.55*inch, 1.95*inch, 1.3*inch, 1.1*inch, 0.9*inch, 1.3*inch, 1.15*inch],
-            repeatRows=1
+        if not all(value.strip().isdigit() for value in student_ids):
+            return Response({
+                'error': 'student_ids must be a comma-separated list of ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            stream_student_reports_zip(
+                student_ids_for_reports([int(value) for value in student_ids], request.user),
+                # Forking a pool from a threaded web worker is unsafe; the command uses every core
+                workers=0
+            ),
+            content_type='application/zip'
         )
-        
-        # Apply professional table styling
-        top_skills_table.setStyle(TableStyle([
-            # ===== HEADER ROW (Row 0) =====
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            
-            # ===== DATA ROWS (Row 1 onwards) =====
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            
-            # ===== COLUMN ALIGNMENT =====
-            ('ALIGN', (0, 1), (0, -1), 'CENTER'),      # Rank - center
-            ('ALIGN', (1, 1), (2, -1), 'LEFT'),        # Skill & Category - left
-            ('ALIGN', (3, 1), (-1, -1), 'CENTER'),     # All metrics - center
-            
-            # ===== GRID & BORDERS =====
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            
-            # ===== PADDING =====
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-        ]))
-        
-        elements.append(top_skills_table)
-        elements.append(Spacer(1, 0.3*inch))
-
-        # ========== PROFICIENCY DISTRIBUTION TABLE ==========
-        elements.append(Paragraph('Proficiency Distribution', heading_style))
-        
-        proficiency_counts = WeeklyProgress.objects.values('proficiency_level').annotate(count=Count('id'))
-        total_records = sum(item['count'] for item in proficiency_counts)
-        
-        prof_data = [['Proficiency Level', 'Count', 'Percentage']]
-        for prof in proficiency_counts:
-            percentage = round((prof['count'] / total_records * 100), 1) if total_records > 0 else 0
-            prof_data.append([
-                prof['proficiency_level'].capitalize(),
-                str(prof['count']),
-                f'{percentage}%'
-            ])
-        
-        prof_table = Table(prof_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
-        prof_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e293b')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f9fafb')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 1), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
-        ]))
-        
-        elements.append(prof_table)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # ========== FOOTER ==========
-        footer_text = f"Page 1 of 1 | Report generated on {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-        elements.append(Paragraph(footer_text, ParagraphStyle('footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=TA_CENTER)))
-
-        # Build PDF
-        doc.build(elements)
+        response['Content-Disposition'] = f'attachment; filename="student-reports-{datetime.now().strftime("%Y-%m-%d")}.zip"'
         return response
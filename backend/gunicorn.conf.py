@@ -0,0 +1,51 @@
+"""
+Production server settings: `gunicorn -c gunicorn.conf.py`
+
+Every value can be overridden from the environment (see .env.example).
+"""
+import multiprocessing
+import os
+
+# Gunicorn reads every module-level name as a setting, and `config` is one of them
+import decouple
+
+# 'wsgi' serves weekly_tracker.wsgi with threaded workers; 'asgi' serves
+# weekly_tracker.asgi with uvicorn workers (async dashboard summary)
+SERVER_INTERFACE = decouple.config('SERVER_INTERFACE', default='wsgi')
+
+if SERVER_INTERFACE == 'asgi':
+    wsgi_app = 'weekly_tracker.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'weekly_tracker.wsgi:application'
+    worker_class = 'gthread'
+
+bind = decouple.config('BIND', default=f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = decouple.config('WEB_CONCURRENCY', default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)
+
+# Import Django and the URLconf once in the master; workers fork with it loaded
+preload_app = decouple.config('GUNICORN_PRELOAD', default=True, cast=bool)
+
+# Recycle workers periodically (jittered so they don't all restart at once)
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+# Under ASGI a stopping worker lets its event streams run out (they end after
+# SSE_STREAM_MAX_SECONDS) instead of cutting every stream on each redeploy
+graceful_timeout = decouple.config(
+    'GUNICORN_GRACEFUL_TIMEOUT',
+    default=decouple.config('SSE_STREAM_MAX_SECONDS', default=300, cast=int) + 5 if SERVER_INTERFACE == 'asgi' else 30,
+    cast=int
+)
+keepalive = decouple.config('GUNICORN_KEEPALIVE', default=5, cast=int)
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Database connections must never be shared across forked workers
+    from django.db import connections
+    connections.close_all()
@@ -1,12 +1,76 @@
+from django.conf import settings
 from django.contrib import admin
-from .models import WeeklyProgress
+from django.utils import timezone
+from weekly_tracker.paginators import ScalableAdminMixin
+from .bulk_delete import count_dependents, start_deletion_job
+from .models import WeeklyProgress, ArchivedWeeklyProgress, BulkDeletionJob
+
+
+class BulkDeleteAdminMixin:
+    """
+    Delete skills/users through background batched jobs instead of the ORM
+    collector, and summarise dependents on the confirmation page rather
+    than listing every progress row.
+    """
+    bulk_delete_field = None
+    
+    def get_deleted_objects(self, objs, request):
+        deleted_objects = [str(obj) for obj in objs]
+        entries = sum(count_dependents(self.bulk_delete_field, obj.pk) for obj in objs)
+        model_count = {
+            self.model._meta.verbose_name_plural: len(deleted_objects),
+            'progress entries': entries,
+        }
+        perms_needed = set() if self.has_delete_permission(request) else {self.model._meta.verbose_name}
+        return deleted_objects, model_count, perms_needed, []
+    
+    def delete_model(self, request, obj):
+        job = start_deletion_job(obj, requested_by=request.user)
+        self.message_user(request, f'Deletion of {obj} is running in the background as job #{job.pk}.')
+    
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.delete_model(request, obj)
+
+
+class YearListFilter(admin.SimpleListFilter):
+    """Year options derived from the hot window instead of a DISTINCT scan"""
+    title = 'year'
+    parameter_name = 'year'
+    
+    def lookups(self, request, model_admin):
+        current_year = timezone.now().year
+        years = range(current_year, current_year - settings.PROGRESS_HOT_YEARS, -1)
+        return [(str(year), str(year)) for year in years]
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(year=self.value())
+        return queryset
+
+
+class WeekNumberListFilter(admin.SimpleListFilter):
+    """ISO weeks are always 1-53, so no query is needed to list them"""
+    title = 'week number'
+    parameter_name = 'week_number'
+    
+    def lookups(self, request, model_admin):
+        return [(str(week), str(week)) for week in range(1, 54)]
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(week_number=self.value())
+        return queryset
+
 
 @admin.register(WeeklyProgress)
-class WeeklyProgressAdmin(admin.ModelAdmin):
+class WeeklyProgressAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ['student', 'skill', 'week_number', 'year', 'proficiency_level', 'hours_spent', 'created_at']
-    list_filter = ['proficiency_level', 'year', 'week_number', 'created_at']
-    search_fields = ['student__name', 'student__email', 'skill__skill_name', 'notes']
+    list_filter = ['proficiency_level', YearListFilter, WeekNumberListFilter]
+    # Prefix matches (LIKE 'x%') on short indexed columns instead of %LIKE% over notes
+    search_fields = ['^student__email', '^student__name', '^skill__skill_name']
     ordering = ['-year', '-week_number', 'student']
+    autocomplete_fields = ['student', 'skill']
     
     fieldsets = (
         ('Student & Skill', {
@@ -28,3 +92,31 @@ class WeeklyProgressAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
         return queryset.select_related('student', 'skill')
+
+
+@admin.register(ArchivedWeeklyProgress)
+class ArchivedWeeklyProgressAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ['student', 'skill', 'week_number', 'year', 'proficiency_level', 'hours_spent', 'archived_at']
+    list_filter = ['proficiency_level', WeekNumberListFilter]
+    search_fields = ['^student__email', '^skill__skill_name']
+    ordering = ['-year', '-week_number']
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.select_related('student', 'skill')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BulkDeletionJob)
+class BulkDeletionJobAdmin(admin.ModelAdmin):
+    list_display = ['target_type', 'target_label', 'status', 'deleted_entries', 'total_entries', 'created_at', 'finished_at']
+    list_filter = ['status', 'target_type']
+    readonly_fields = [field.name for field in BulkDeletionJob._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
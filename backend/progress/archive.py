@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from skills.models import Skill
+from .bulk_delete import delete_rows
+from .counters import refresh_latest_proficiency
+from .models import WeeklyProgress, ArchivedWeeklyProgress
+from .progression import invalidate_progression
+from .recommendations import mark_similarity_stale
+from .sketches import delete_sketches_before
+
+ARCHIVED_FIELDS = [
+    'id', 'student_id', 'skill_id', 'week_number', 'year',
+    'proficiency_level', 'hours_spent', 'notes', 'created_at', 'updated_at',
+]
+
+
+def archive_cutoff_year(hot_years=None):
+    """First year that stays hot; everything before it is archived"""
+    hot_years = settings.PROGRESS_HOT_YEARS if hot_years is None else hot_years
+    return timezone.now().year - max(hot_years, 1) + 1
+
+
+def archive_progress(before_year, batch_size=1000):
+    """
+    Move progress from years before ``before_year`` into the archive table.
+
+    Each batch is copied and deleted in its own transaction, so the hot
+    table is never locked for the whole run. Yields the size of every
+    batch moved.
+
+    The delete is set-based and sends no per-row signals: archived entries
+    aren't deletions, so sync clients get no tombstones and the dashboard
+    no events. Skill counters move once per batch, and sketches and cached
+    analytics are refreshed once at the end.
+    """
+    touched_skills = set()
+    while True:
+        with transaction.atomic():
+            rows = list(
+                WeeklyProgress.objects.filter(year__lt=before_year)
+                .order_by('id')
+                .values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+
+            ArchivedWeeklyProgress.objects.bulk_create(
+                [ArchivedWeeklyProgress(**row) for row in rows]
+            )
+            ids = [row['id'] for row in rows]
+            batch = WeeklyProgress.objects.filter(id__in=ids).order_by()
+            for row in batch.values('skill_id').annotate(hours=Sum('hours_spent'), entries=Count('id')):
+                Skill.objects.filter(pk=row['skill_id']).update(
+                    total_hours=F('total_hours') - row['hours'],
+                    practice_count=F('practice_count') - row['entries']
+                )
+                touched_skills.add(row['skill_id'])
+            delete_rows(WeeklyProgress, ids)
+        yield len(rows)
+
+    if touched_skills:
+        for skill_id in touched_skills:
+            refresh_latest_proficiency(skill_id)
+        # Every entry of those weeks is archived, so their sketches go whole
+        delete_sketches_before(before_year)
+        invalidate_progression(*touched_skills)
+        mark_similarity_stale()
@@ -0,0 +1,201 @@
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, router, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from skills.models import Skill
+from users.models import User
+from .counters import refresh_latest_proficiency
+from .events import publish_progress_refresh
+from .models import WeeklyProgress, ArchivedWeeklyProgress, BulkDeletionJob, ProgressTombstone
+from .progression import invalidate_progression
+from .recommendations import mark_similarity_stale
+from .sketches import mark_sketch_stale
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def count_dependents(field, value):
+    return sum(model.objects.filter(**{field: value}).count() for model in (WeeklyProgress, ArchivedWeeklyProgress))
+
+
+def delete_rows(model, ids):
+    """
+    DELETE FROM the model's table WHERE id IN (ids), returning the row count.
+
+    Skips the ORM collector: no rows are loaded, no signals are sent and no
+    cascades are followed, so callers maintain any derived data themselves.
+    """
+    if not ids:
+        return 0
+    using = connections[router.db_for_write(model)]
+    table = using.ops.quote_name(model._meta.db_table)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with using.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE id IN ({placeholders})', list(ids))
+        return cursor.rowcount
+
+
+def purge_progress(field, value, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    """
+    Delete hot and archived progress where ``field == value`` using batched,
+    set-based DELETE statements.
+
+    Rows are never loaded into Python and no per-row signals are sent, so
+    what the signals would maintain happens here: skill counters, sync
+    tombstones and stale sketches per batch, then cached analytics and one
+    dashboard refresh event at the end.
+    """
+    touched_skills = set()
+    touched_students = {}
+
+    for model in (WeeklyProgress, ArchivedWeeklyProgress):
+        queryset = model.objects.filter(**{field: value}).order_by()
+        while True:
+            ids = list(queryset.values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+
+            with transaction.atomic():
+                batch = model.objects.filter(id__in=ids).order_by()
+                if model is WeeklyProgress:
+                    # Skill counters only track the hot table; a skill's own rows
+                    # disappear with the skill, so only user purges need adjusting.
+                    if field == 'student_id':
+                        for row in batch.values('skill_id').annotate(hours=Sum('hours_spent'), entries=Count('id')):
+                            Skill.objects.filter(pk=row['skill_id']).update(
+                                total_hours=F('total_hours') - row['hours'],
+                                practice_count=F('practice_count') - row['entries']
+                            )
+                    # Surviving students' sync clients need to hear about removed entries
+                    if field == 'skill_id':
+                        ProgressTombstone.objects.bulk_create([
+                            ProgressTombstone(progress_id=progress_id, student_id=student_id)
+                            for progress_id, student_id in batch.values_list('id', 'student_id')
+                        ])
+                    for bucket in batch.values_list('skill_id', 'year', 'week_number').distinct():
+                        mark_sketch_stale(*bucket)
+                        touched_skills.add(bucket[0])
+                    touched_students.update(batch.values_list('student_id', 'cohort_id').distinct())
+                deleted = delete_rows(model, ids)
+
+            if on_batch:
+                on_batch(deleted)
+
+    if field == 'student_id':
+        for skill_id in touched_skills:
+            refresh_latest_proficiency(skill_id)
+    if touched_skills:
+        invalidate_progression(*touched_skills)
+        mark_similarity_stale()
+        publish_progress_refresh(touched_students.keys(), touched_students.values())
+
+
+def bulk_delete_skill(skill, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    purge_progress('skill_id', skill.pk, batch_size=batch_size, on_batch=on_batch)
+    skill.delete()
+
+
+def bulk_delete_user(user, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    purge_progress('student_id', user.pk, batch_size=batch_size, on_batch=on_batch)
+    user.delete()
+
+
+def _load_target(job):
+    model = Skill if job.target_type == 'skill' else User
+    return model.objects.filter(pk=job.target_id).first()
+
+
+def run_deletion_job(job_id, batch_size=DEFAULT_BATCH_SIZE, resume=False):
+    """
+    Execute a BulkDeletionJob, recording progress after every batch.
+
+    The job is claimed with a conditional update, so a web worker's thread
+    and `run_deletion_jobs` never run it twice. `resume` also picks up a
+    failed job; batches already committed stay deleted and the rest follow.
+    Returns whether this call ran the job.
+    """
+    statuses = ['pending', 'failed'] if resume else ['pending']
+    claimed = BulkDeletionJob.objects.filter(pk=job_id, status__in=statuses).update(
+        status='running', error='', heartbeat_at=timezone.now(), finished_at=None
+    )
+    if not claimed:
+        return False
+
+    job = BulkDeletionJob.objects.get(pk=job_id)
+    target = _load_target(job)
+    field = 'skill_id' if job.target_type == 'skill' else 'student_id'
+
+    BulkDeletionJob.objects.filter(pk=job.pk).update(
+        total_entries=F('deleted_entries') + count_dependents(field, job.target_id)
+    )
+
+    def on_batch(deleted):
+        BulkDeletionJob.objects.filter(pk=job.pk).update(
+            deleted_entries=F('deleted_entries') + deleted, heartbeat_at=timezone.now()
+        )
+
+    try:
+        if target is not None:
+            delete = bulk_delete_skill if job.target_type == 'skill' else bulk_delete_user
+            delete(target, batch_size=batch_size, on_batch=on_batch)
+    except Exception as e:
+        BulkDeletionJob.objects.filter(pk=job.pk).update(
+            status='failed', error=str(e), finished_at=timezone.now()
+        )
+        raise
+
+    BulkDeletionJob.objects.filter(pk=job.pk).update(status='completed', finished_at=timezone.now())
+    return True
+
+
+def fail_stale_jobs(stale_seconds=None):
+    """
+    Mark running jobs whose worker stopped heartbeating as failed.
+
+    A recycled or redeployed web worker takes its job thread with it; the
+    job would otherwise show as running forever. Returns the number marked.
+    """
+    stale_seconds = settings.DELETION_JOB_STALE_SECONDS if stale_seconds is None else stale_seconds
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=stale_seconds)
+    return BulkDeletionJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, created_at__lt=cutoff),
+        status='running'
+    ).update(
+        status='failed', finished_at=now,
+        error='The worker running this job stopped; resume it with `manage.py run_deletion_jobs --resume`'
+    )
+
+
+def _run_in_thread(job_id):
+    close_old_connections()
+    try:
+        run_deletion_job(job_id)
+    except Exception:
+        # Failure details are stored on the job
+        pass
+    finally:
+        connection.close()
+
+
+def start_deletion_job(target, requested_by=None):
+    """
+    Queue a deletion of a Skill or User and return its job.
+
+    With DELETION_JOB_RUNNER='thread' it starts in a thread of this worker
+    once the transaction commits; with 'command' it waits for
+    `manage.py run_deletion_jobs`.
+    """
+    job = BulkDeletionJob.objects.create(
+        target_type='skill' if isinstance(target, Skill) else 'user',
+        target_id=target.pk,
+        target_label=str(target)[:255],
+        requested_by=requested_by if requested_by is not None and requested_by.is_authenticated else None,
+    )
+    if settings.DELETION_JOB_RUNNER == 'thread':
+        thread = threading.Thread(target=_run_in_thread, args=(job.pk,), daemon=True)
+        transaction.on_commit(thread.start)
+    return job
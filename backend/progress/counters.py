@@ -0,0 +1,105 @@
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from skills.models import Skill
+from .models import WeeklyProgress
+
+
+def refresh_latest_proficiency(skill_id):
+    """Recompute latest proficiency after the newest entry of a skill changed hands"""
+    latest = WeeklyProgress.objects.filter(skill_id=skill_id).order_by('-created_at').values(
+        'proficiency_level', 'created_at'
+    ).first()
+    Skill.objects.filter(pk=skill_id).update(
+        latest_proficiency=latest['proficiency_level'] if latest else '',
+        last_practiced_at=latest['created_at'] if latest else None
+    )
+
+
+def _bump_latest(entry):
+    # Conditional update: only wins if this entry is at least as recent as the current latest
+    Skill.objects.filter(
+        Q(last_practiced_at__isnull=True) | Q(last_practiced_at__lte=entry.created_at),
+        pk=entry.skill_id
+    ).update(latest_proficiency=entry.proficiency_level, last_practiced_at=entry.created_at)
+
+
+def record_saved(entry, created):
+    """Apply a created or updated progress entry to its skill's counters"""
+    previous_skill_id = getattr(entry, '_loaded_skill_id', None)
+    previous_hours = getattr(entry, '_loaded_hours_spent', None) or 0.0
+
+    if created:
+        Skill.objects.filter(pk=entry.skill_id).update(
+            total_hours=F('total_hours') + entry.hours_spent,
+            practice_count=F('practice_count') + 1
+        )
+    elif previous_skill_id != entry.skill_id:
+        Skill.objects.filter(pk=previous_skill_id).update(
+            total_hours=F('total_hours') - previous_hours,
+            practice_count=F('practice_count') - 1
+        )
+        Skill.objects.filter(pk=entry.skill_id).update(
+            total_hours=F('total_hours') + entry.hours_spent,
+            practice_count=F('practice_count') + 1
+        )
+        refresh_latest_proficiency(previous_skill_id)
+    elif entry.hours_spent != previous_hours:
+        Skill.objects.filter(pk=entry.skill_id).update(
+            total_hours=F('total_hours') + (entry.hours_spent - previous_hours)
+        )
+
+    _bump_latest(entry)
+    entry._loaded_skill_id = entry.skill_id
+    entry._loaded_hours_spent = entry.hours_spent
+
+
+def record_deleted(entry):
+    """Remove a deleted progress entry from its skill's counters"""
+    Skill.objects.filter(pk=entry.skill_id).update(
+        total_hours=F('total_hours') - entry.hours_spent,
+        practice_count=F('practice_count') - 1
+    )
+    if Skill.objects.filter(pk=entry.skill_id, last_practiced_at__lte=entry.created_at).exists():
+        refresh_latest_proficiency(entry.skill_id)
+
+
+def reconcile_skill_counters(apply=True):
+    """
+    Recompute every skill's counters from weekly_progress and repair drift.
+
+    Returns the list of skills whose stored counters were wrong.
+    """
+    totals = {
+        row['skill_id']: row
+        for row in WeeklyProgress.objects.order_by().values('skill_id').annotate(
+            total_hours=Sum('hours_spent'),
+            practice_count=Count('id'),
+            last_practiced_at=Max('created_at')
+        )
+    }
+    latest = WeeklyProgress.objects.filter(skill=OuterRef('pk')).order_by('-created_at')
+    skills = Skill.objects.annotate(
+        actual_latest_proficiency=Subquery(latest.values('proficiency_level')[:1])
+    )
+
+    drifted = []
+    for skill in skills:
+        row = totals.get(skill.id, {})
+        expected = {
+            'total_hours': float(row.get('total_hours') or 0.0),
+            'practice_count': row.get('practice_count', 0),
+            'latest_proficiency': skill.actual_latest_proficiency or '',
+            'last_practiced_at': row.get('last_practiced_at'),
+        }
+        if any(
+            abs(skill.total_hours - value) > 1e-6 if field == 'total_hours' else getattr(skill, field) != value
+            for field, value in expected.items()
+        ):
+            for field, value in expected.items():
+                setattr(skill, field, value)
+            drifted.append(skill)
+
+    if apply and drifted:
+        Skill.objects.bulk_update(
+            drifted, ['total_hours', 'practice_count', 'latest_proficiency', 'last_practiced_at'], batch_size=500
+        )
+    return drifted
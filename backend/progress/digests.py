@@ -0,0 +1,155 @@
+import logging
+from collections import defaultdict, namedtuple
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Exists, OuterRef, Subquery
+from django.template.loader import get_template
+from users.models import User
+from .models import WeeklyProgress, iso_week_start
+
+# Students whose summaries are computed per round of grouped queries
+DEFAULT_CHUNK_SIZE = 1000
+# Messages handed to the mail connection per send_messages() call
+DEFAULT_SEND_BATCH_SIZE = 200
+
+logger = logging.getLogger(__name__)
+
+# Outcome of a digest run; failed_batches holds (batch number, recipients, error) per failed batch
+DigestRun = namedtuple('DigestRun', ['built', 'sent', 'failed', 'failed_batches'])
+
+LEVEL_LABELS = dict(WeeklyProgress.PROFICIENCY_CHOICES)
+LEVEL_RANK = {level: rank for rank, (level, _) in enumerate(WeeklyProgress.PROFICIENCY_CHOICES)}
+
+
+def last_completed_week(today=None):
+    year, week_number, _ = ((today or date.today()) - timedelta(weeks=1)).isocalendar()
+    return year, week_number
+
+
+def _summary(student, year, week_number, week_start, rows):
+    skills, level_changes = [], []
+    for row in rows:
+        skills.append({
+            'name': row['skill__skill_name'],
+            'hours': row['hours_spent'],
+            'level': LEVEL_LABELS.get(row['proficiency_level'], row['proficiency_level']),
+        })
+        previous, current = row['previous_level'], row['proficiency_level']
+        if previous is not None and previous != current:
+            level_changes.append({
+                'skill': row['skill__skill_name'],
+                'from': LEVEL_LABELS.get(previous, previous),
+                'to': LEVEL_LABELS.get(current, current),
+                'improved': LEVEL_RANK.get(current, 0) > LEVEL_RANK.get(previous, 0),
+            })
+    student_id, name, email = student
+    return {
+        'student_id': student_id,
+        'name': name,
+        'email': email,
+        'year': year,
+        'week_number': week_number,
+        'week_start': week_start,
+        'total_hours': round(sum(row['hours_spent'] for row in rows), 2),
+        'skills': skills,
+        'level_changes': level_changes,
+    }
+
+
+def collect_digests(year, week_number, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield the week's summary for every active student who logged progress that week.
+
+    Students with nothing logged get no email. Students are read in id order,
+    a chunk at a time; each chunk's entries and the level each skill was at
+    before the week come from one grouped query.
+    """
+    week_start = iso_week_start(year, week_number)
+    students = User.objects.filter(
+        Exists(WeeklyProgress.objects.filter(student_id=OuterRef('pk'), week_start=week_start)),
+        role='student', is_active=True
+    ).order_by('id').values_list('id', 'name', 'email')
+    previous_level = WeeklyProgress.objects.filter(
+        student_id=OuterRef('student_id'), skill_id=OuterRef('skill_id'), week_start__lt=week_start
+    ).order_by('-week_start').values('proficiency_level')[:1]
+
+    last_id = 0
+    while True:
+        chunk = list(students.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            return
+        last_id = chunk[-1][0]
+
+        entries = defaultdict(list)
+        rows = (
+            WeeklyProgress.objects.filter(student_id__in=[student[0] for student in chunk], week_start=week_start)
+            .order_by('student_id', '-hours_spent')
+            .values('student_id', 'skill__skill_name', 'hours_spent', 'proficiency_level')
+            .annotate(previous_level=Subquery(previous_level))
+        )
+        for row in rows:
+            entries[row['student_id']].append(row)
+
+        for student in chunk:
+            yield _summary(student, year, week_number, week_start, entries.get(student[0], []))
+
+
+def build_digest_messages(digests, connection=None):
+    """One email per summary; the templates are loaded and compiled once for all of them"""
+    text_template = get_template('progress/emails/weekly_digest.txt')
+    html_template = get_template('progress/emails/weekly_digest.html')
+    for digest in digests:
+        message = EmailMultiAlternatives(
+            subject=f"Your week {digest['week_number']} of {digest['year']} - Weekly Skill Tracker",
+            body=text_template.render(digest),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[digest['email']],
+            connection=connection,
+        )
+        message.attach_alternative(html_template.render(digest), 'text/html')
+        yield message
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def send_weekly_digests(year, week_number, batch_size=DEFAULT_SEND_BATCH_SIZE,
+                        chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """
+    Email every active student with progress that week their summary of it.
+
+    Messages go out in batches over one shared mail connection. A failed
+    batch is logged and recorded, and the connection reopened for the next
+    one. `dry_run` builds every message without sending. Returns a DigestRun.
+    """
+    built = sent = failed = 0
+    failed_batches = []
+    connection = get_connection('django.core.mail.backends.dummy.EmailBackend' if dry_run else None)
+    messages = build_digest_messages(collect_digests(year, week_number, chunk_size), connection)
+    try:
+        for number, batch in enumerate(_batches(messages, batch_size), 1):
+            built += len(batch)
+            try:
+                # No-op while the session is up; reconnects after a failed batch
+                connection.open()
+                delivered = connection.send_messages(batch) or 0
+            except Exception as e:
+                logger.exception('Weekly digest batch %s (%s messages) failed', number, len(batch))
+                failed_batches.append((number, [message.to[0] for message in batch], str(e)))
+                connection.close()
+                delivered = 0
+            sent += delivered
+            failed += len(batch) - delivered
+    finally:
+        connection.close()
+    return DigestRun(built, sent, failed, failed_batches)
@@ -0,0 +1,52 @@
+from django.db import transaction
+from weekly_tracker.events import get_event_bus
+
+# Beyond this many ids a refresh goes to everyone, keeping the event inside
+# PostgreSQL's 8000 byte NOTIFY payload
+MAX_REFRESH_SCOPE = 500
+
+
+def progress_event(kind, entry, hours_delta):
+    """A small change event: the entry as written and how it moved the hour totals"""
+    return {
+        'type': f'progress.{kind}',
+        'entry': {
+            'id': entry.id,
+            'student_id': entry.student_id,
+            'cohort_id': entry.cohort_id,
+            'skill_id': entry.skill_id,
+            'year': entry.year,
+            'week_number': entry.week_number,
+            'hours_spent': float(entry.hours_spent),
+            'proficiency_level': entry.proficiency_level,
+        },
+        'hours_delta': round(float(hours_delta), 2),
+    }
+
+
+def publish_progress_event(kind, entry, hours_delta):
+    event = progress_event(kind, entry, hours_delta)
+    # After commit so listeners never see a rolled-back write; a broker outage is
+    # logged rather than failing a write that already committed
+    transaction.on_commit(lambda: get_event_bus().publish(event), robust=True)
+
+
+def _refresh_scope(ids):
+    ids = sorted(set(ids), key=lambda value: (value is None, value))
+    return ids if len(ids) <= MAX_REFRESH_SCOPE else None
+
+
+def progress_refresh_event(student_ids, cohort_ids):
+    """
+    One event for a bulk write instead of one per entry: dashboards of these
+    students and cohorts (None = everyone's) should refetch
+    """
+    return {
+        'type': 'progress.refresh',
+        'scope': {'student_ids': _refresh_scope(student_ids), 'cohort_ids': _refresh_scope(cohort_ids)},
+    }
+
+
+def publish_progress_refresh(student_ids, cohort_ids):
+    event = progress_refresh_event(student_ids, cohort_ids)
+    transaction.on_commit(lambda: get_event_bus().publish(event), robust=True)
@@ -0,0 +1,96 @@
+from django.core.exceptions import ImproperlyConfigured
+
+# (queryset lookup, output column, arrow type name)
+EXPORT_COLUMNS = [
+    ('id', 'id', 'int64'),
+    ('student_id', 'student_id', 'int64'),
+    ('student__name', 'student_name', 'string'),
+    ('student__email', 'student_email', 'string'),
+    ('student__role', 'student_role', 'category'),
+    ('skill_id', 'skill_id', 'int64'),
+    ('skill__skill_name', 'skill_name', 'string'),
+    ('skill__category', 'skill_category', 'category'),
+    ('week_number', 'week_number', 'int16'),
+    ('year', 'year', 'int16'),
+    ('proficiency_level', 'proficiency_level', 'category'),
+    ('hours_spent', 'hours_spent', 'float64'),
+    ('notes', 'notes', 'string'),
+    ('created_at', 'created_at', 'timestamp'),
+    ('updated_at', 'updated_at', 'timestamp'),
+]
+
+EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+}
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImproperlyConfigured('Columnar progress export requires the pyarrow package')
+    return pyarrow
+
+
+def _arrow_schema(pa):
+    types = {
+        'int16': pa.int16(),
+        'int32': pa.int32(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'string': pa.string(),
+        # Low-cardinality text is dictionary encoded so it loads as a pandas Categorical
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+    }
+    return pa.schema([pa.field(name, types[type_name]) for _, name, type_name in EXPORT_COLUMNS])
+
+
+def _record_batches(pa, schema, queryset, batch_size):
+    """Read the queryset with a chunked cursor and yield column-typed record batches"""
+    lookups = [lookup for lookup, _, _ in EXPORT_COLUMNS]
+    rows = queryset.order_by('id').values_list(*lookups).iterator(chunk_size=batch_size)
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield _to_record_batch(pa, schema, batch)
+            batch = []
+    if batch:
+        yield _to_record_batch(pa, schema, batch)
+
+
+def _to_record_batch(pa, schema, rows):
+    columns = zip(*rows)
+    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_progress_export(queryset, sink, file_format='parquet', batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write progress joined with skill and student attributes to ``sink``.
+
+    Returns the number of rows written.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{file_format}'")
+
+    pa = _load_pyarrow()
+    schema = _arrow_schema(pa)
+
+    if file_format == 'parquet':
+        writer = pa.parquet.ParquetWriter(sink, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    total = 0
+    with writer:
+        for batch in _record_batches(pa, schema, queryset, batch_size):
+            writer.write_batch(batch)
+            total += batch.num_rows
+    return total
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from users.cohorts import scope_to_cohort
+
+
+def _date_param(params, name):
+    value = params.get(name, None)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Use a YYYY-MM-DD date.'})
+    return parsed
+
+
+def _has_field(queryset, name):
+    return any(field.name == name for field in queryset.model._meta.get_fields())
+
+
+def filter_progress_queryset(queryset, user, params):
+    """
+    Apply the role scoping and query-param filters shared by progress listings.
+
+    ``user=None`` is used by trusted callers (management commands) and gets
+    the same unrestricted scope as an admin. Admins assigned to a cohort
+    only see that cohort's progress.
+    """
+    if user is None or user.role == 'admin':
+        # Archived rows carry no cohort copy, so scope them through the student
+        queryset = scope_to_cohort(queryset, user, 'cohort' if _has_field(queryset, 'cohort') else 'student__cohort')
+        student_id = params.get('student_id', None)
+        if student_id:
+            queryset = queryset.filter(student_id=student_id)
+    else:
+        queryset = queryset.filter(student=user)
+
+    skill_id = params.get('skill_id', None)
+    if skill_id:
+        queryset = queryset.filter(skill_id=skill_id)
+
+    week_number = params.get('week_number', None)
+    if week_number:
+        queryset = queryset.filter(week_number=week_number)
+
+    year = params.get('year', None)
+    if year:
+        queryset = queryset.filter(year=year)
+
+    # Weeks overlapping the from/to dates, via the indexed week_start column
+    if not _has_field(queryset, 'week_start') and (params.get('from') or params.get('to')):
+        raise ValidationError({'from': 'Date ranges are not supported for archived progress.'})
+    date_from = _date_param(params, 'from')
+    if date_from:
+        queryset = queryset.filter(week_start__gt=date_from - timedelta(days=7))
+
+    date_to = _date_param(params, 'to')
+    if date_to:
+        queryset = queryset.filter(week_start__lte=date_to)
+
+    return queryset
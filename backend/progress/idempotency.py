@@ -0,0 +1,87 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+
+
+def _request_hash(request):
+    """Fingerprint of the call, so a key reused for a different write is caught"""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps(
+        [request.method, request.path, data], sort_keys=True, default=str, separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _horizon():
+    return timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def _replay(record, request_hash):
+    if record.request_hash != request_hash:
+        return Response({
+            'error': 'Idempotency-Key was already used for a different request'
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    response = Response(record.response_data, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_method):
+    """
+    Honour an Idempotency-Key header on a write view method.
+
+    The first response (anything but a server error) is stored with the write
+    in one transaction; retries with the same key get it back without running
+    the view. Keys are scoped per user and expire after IDEMPOTENCY_KEY_TTL_HOURS.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({
+                'error': f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = _request_hash(request)
+        record = IdempotencyRecord.objects.filter(user=request.user, key=key).first()
+        if record is not None:
+            if record.created_at >= _horizon():
+                return _replay(record, request_hash)
+            record.delete()
+
+        try:
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code < 500:
+                    IdempotencyRecord.objects.create(
+                        user=request.user, key=key, request_hash=request_hash,
+                        status_code=response.status_code, response_data=response.data
+                    )
+        except IntegrityError:
+            # A concurrent request with the same key won; its write and response stand
+            record = IdempotencyRecord.objects.filter(user=request.user, key=key).first()
+            if record is None:
+                raise
+            return _replay(record, request_hash)
+        return response
+    return wrapper
+
+
+def prune_idempotency_keys():
+    deleted, _ = IdempotencyRecord.objects.filter(created_at__lt=_horizon()).delete()
+    return deleted
@@ -0,0 +1,248 @@
+import csv
+import math
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import F
+from skills.models import Skill
+from users.cohorts import scope_to_cohort
+from users.models import User
+from .counters import refresh_latest_proficiency
+from .events import publish_progress_refresh
+from .models import WeeklyProgress, iso_week_start
+from .progression import invalidate_progression
+from .recommendations import mark_similarity_stale
+from .serializers import (
+    HOURS_EXCEEDED_ERROR,
+    HOURS_NEGATIVE_ERROR,
+    MAX_HOURS_PER_WEEK,
+    MAX_YEAR,
+    MIN_YEAR,
+    WEEK_NUMBER_ERROR,
+    YEAR_ERROR,
+)
+from .sketches import rebuild_sketch
+
+IMPORT_COLUMNS = ['student_email', 'skill_name', 'year', 'week_number', 'proficiency_level', 'hours_spent', 'notes']
+REQUIRED_COLUMNS = ['student_email', 'skill_name', 'year', 'week_number', 'proficiency_level']
+
+DEFAULT_BATCH_SIZE = 2000
+# Errors echoed in the JSON summary; the CSV error report has all of them
+MAX_REPORTED_ERRORS = 100
+
+UNIQUE_FIELDS = ['student', 'skill', 'week_number', 'year']
+UPDATE_FIELDS = ['proficiency_level', 'hours_spent', 'notes', 'updated_at']
+
+
+class CSVImportError(Exception):
+    """The file can't be imported at all (e.g. missing columns)"""
+
+
+def _number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+def _batches(reader, size):
+    """(line number, row) lists of up to `size` rows; line numbers count the header as 1"""
+    batch = []
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        batch.append((reader.line_num, row))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ProgressImporter:
+    """
+    Upsert progress rows from a CSV stream, one batch at a time.
+
+    Students and skills are resolved through maps loaded once per import.
+    Each row is checked against the WeeklyProgressSerializer rules, and each
+    batch is written with one INSERT ... ON CONFLICT on the unique key. The
+    rows it replaces are read first so skill counters move by exact deltas;
+    sketches, cached analytics and live dashboards are refreshed once at the end.
+    """
+
+    def __init__(self, user=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        students = scope_to_cohort(User.objects.filter(role='student'), user)
+        self.students = {
+            email.lower(): (student_id, cohort_id)
+            for student_id, email, cohort_id in students.values_list('id', 'email', 'cohort_id')
+        }
+        self.skills = {name.casefold(): skill_id for skill_id, name in Skill.objects.values_list('id', 'skill_name')}
+        self.levels = {level for level, _ in WeeklyProgress.PROFICIENCY_CHOICES}
+        self.summary = {'rows': 0, 'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+        self._touched_buckets = set()
+        self._touched_students = {}
+
+    def run(self, reader, error_report=None):
+        """Import every row from a csv.reader; failing rows are written to `error_report`"""
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise CSVImportError(f"Missing required columns: {', '.join(missing)}")
+        self.positions = {name: header.index(name) for name in IMPORT_COLUMNS if name in header}
+
+        report = csv.writer(error_report) if error_report is not None else None
+        if report:
+            report.writerow(['row', 'errors'] + header)
+
+        for batch in _batches(reader, self.batch_size):
+            self.summary['rows'] += len(batch)
+            rows, errors = self._validate(batch)
+            for (line, raw), messages in zip(batch, errors):
+                if messages:
+                    self.summary['failed'] += 1
+                    if len(self.summary['errors']) < MAX_REPORTED_ERRORS:
+                        self.summary['errors'].append({'row': line, 'errors': messages})
+                    if report:
+                        report.writerow([line, '; '.join(messages)] + raw)
+            self._upsert(rows)
+
+        self._refresh_derived_data()
+        return self.summary
+
+    def _value(self, row, name):
+        position = self.positions.get(name)
+        if position is None or position >= len(row):
+            return ''
+        return row[position].strip()
+
+    def _validate(self, batch):
+        """Apply the serializer rules row by row; returns (valid rows, errors per row)"""
+        rows, errors = {}, []
+        for _, row in batch:
+            key, values, messages = self._validate_row(row)
+            errors.append(messages)
+            if not messages:
+                # Later rows for the same student, skill and week replace earlier ones, as across batches
+                rows[key] = values
+        return rows, errors
+
+    def _validate_row(self, row):
+        messages = []
+        email = self._value(row, 'student_email')
+        student = self.students.get(email.lower())
+        if not email:
+            messages.append('student_email: This field is required.')
+        elif student is None:
+            messages.append('student_email: No student with this email.')
+
+        skill_name = self._value(row, 'skill_name')
+        skill_id = self.skills.get(skill_name.casefold())
+        if not skill_name:
+            messages.append('skill_name: This field is required.')
+        elif skill_id is None:
+            messages.append('skill_name: No skill with this name.')
+
+        level = self._value(row, 'proficiency_level').lower()
+        if level not in self.levels:
+            messages.append('proficiency_level: Not a valid choice.')
+
+        year, week_number = _number(self._value(row, 'year')), _number(self._value(row, 'week_number'))
+        for name, value, (low, high), message in (
+            ('year', year, (MIN_YEAR, MAX_YEAR), YEAR_ERROR),
+            ('week_number', week_number, (1, 53), WEEK_NUMBER_ERROR),
+        ):
+            if math.isnan(value) or value != math.floor(value):
+                messages.append(f'{name}: A valid integer is required.')
+            elif not low <= value <= high:
+                messages.append(f'{name}: {message}')
+
+        # Blank hours take the model default, as with the API
+        hours = self._value(row, 'hours_spent')
+        hours = _number(hours) if hours else 0.0
+        if math.isnan(hours):
+            messages.append('hours_spent: A valid number is required.')
+        elif hours < 0:
+            messages.append(f'hours_spent: {HOURS_NEGATIVE_ERROR}')
+        elif hours > MAX_HOURS_PER_WEEK:
+            messages.append(f'hours_spent: {HOURS_EXCEEDED_ERROR}')
+
+        if messages:
+            return None, None, messages
+        student_id, cohort_id = student
+        key = (student_id, skill_id, int(week_number), int(year))
+        values = {
+            'cohort_id': cohort_id,
+            'proficiency_level': level,
+            'hours_spent': hours,
+            'notes': self._value(row, 'notes') or None,
+        }
+        return key, values, messages
+
+    def _upsert(self, rows):
+        if not rows:
+            return
+        week_starts = {}
+        entries = []
+        for (student_id, skill_id, week_number, year), values in rows.items():
+            if (year, week_number) not in week_starts:
+                week_starts[year, week_number] = iso_week_start(year, week_number)
+            entries.append(WeeklyProgress(
+                student_id=student_id, skill_id=skill_id, week_number=week_number, year=year,
+                week_start=week_starts[year, week_number], **values
+            ))
+
+        with transaction.atomic():
+            existing = self._existing_hours(rows)
+            # MySQL infers the conflict target from the table's unique keys
+            target = UNIQUE_FIELDS if connection.features.supports_update_conflicts_with_target else None
+            WeeklyProgress.objects.bulk_create(
+                entries, update_conflicts=True, unique_fields=target, update_fields=UPDATE_FIELDS
+            )
+
+            hours_delta, created = defaultdict(float), defaultdict(int)
+            for key, values in rows.items():
+                skill_id = key[1]
+                if key in existing:
+                    hours_delta[skill_id] += values['hours_spent'] - existing[key]
+                else:
+                    hours_delta[skill_id] += values['hours_spent']
+                    created[skill_id] += 1
+                self._touched_buckets.add((skill_id, key[3], key[2]))
+                self._touched_students[key[0]] = values['cohort_id']
+            for skill_id, delta in hours_delta.items():
+                Skill.objects.filter(pk=skill_id).update(
+                    total_hours=F('total_hours') + delta,
+                    practice_count=F('practice_count') + created[skill_id]
+                )
+        self.summary['created'] += sum(created.values())
+        self.summary['updated'] += len(rows) - sum(created.values())
+
+    def _existing_hours(self, rows):
+        """Hours currently stored for the batch's keys that already exist"""
+        student_ids, skill_ids, weeks, years = (set(part) for part in zip(*rows))
+        candidates = WeeklyProgress.objects.filter(
+            student_id__in=student_ids, skill_id__in=skill_ids, week_number__in=weeks, year__in=years
+        ).values_list('student_id', 'skill_id', 'week_number', 'year', 'hours_spent')
+        return {row[:4]: row[4] for row in candidates if row[:4] in rows}
+
+    def _refresh_derived_data(self):
+        skill_ids = {skill_id for skill_id, _, _ in self._touched_buckets}
+        for skill_id in skill_ids:
+            refresh_latest_proficiency(skill_id)
+        for bucket in self._touched_buckets:
+            rebuild_sketch(*bucket)
+        if skill_ids:
+            invalidate_progression(*skill_ids)
+            mark_similarity_stale()
+            publish_progress_refresh(self._touched_students.keys(), self._touched_students.values())
+
+
+def import_progress_csv(lines, user=None, error_report=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Import progress from an iterable of CSV text lines (an open file or a decoded upload).
+
+    `user` limits students to an admin's cohort. Returns a summary with row,
+    created, updated and failed counts plus the first MAX_REPORTED_ERRORS errors.
+    """
+    return ProgressImporter(user, batch_size).run(csv.reader(lines), error_report)
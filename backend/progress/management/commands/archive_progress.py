@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from progress.archive import archive_cutoff_year, archive_progress
+from progress.models import WeeklyProgress
+
+
+class Command(BaseCommand):
+    help = 'Move progress from past academic years into the weekly_progress_archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=None, help='Years to keep hot (default: PROGRESS_HOT_YEARS)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would move')
+
+    def handle(self, *args, **options):
+        before_year = archive_cutoff_year(options['years'])
+        pending = WeeklyProgress.objects.filter(year__lt=before_year).count()
+        self.stdout.write(f'{pending} entries from before {before_year} to archive')
+
+        if options['dry_run'] or not pending:
+            return
+
+        moved = 0
+        for batch in archive_progress(before_year, batch_size=options['batch_size']):
+            moved += batch
+            self.stdout.write(f'  archived {moved}/{pending}')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} entries'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from progress.bulk_delete import DEFAULT_BATCH_SIZE, bulk_delete_skill, bulk_delete_user, count_dependents
+from skills.models import Skill
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Delete a skill or user and all their progress with batched set-based deletes'
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--skill', type=int, help='Skill id to delete')
+        target.add_argument('--user', type=int, help='User id to delete')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['skill']:
+            model, field, delete = Skill, 'skill_id', bulk_delete_skill
+            target_id = options['skill']
+        else:
+            model, field, delete = User, 'student_id', bulk_delete_user
+            target_id = options['user']
+
+        target = model.objects.filter(pk=target_id).first()
+        if target is None:
+            raise CommandError(f'{model.__name__} {target_id} does not exist')
+
+        total = count_dependents(field, target_id)
+        self.stdout.write(f'Deleting {target} and {total} progress entries...')
+
+        deleted = 0
+
+        def on_batch(count):
+            nonlocal deleted
+            deleted += count
+            self.stdout.write(f'  {deleted}/{total}')
+
+        delete(target, batch_size=options['batch_size'], on_batch=on_batch)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {target}'))
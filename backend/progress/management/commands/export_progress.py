@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from progress.exports import DEFAULT_BATCH_SIZE, EXPORT_FORMATS, write_progress_export
+from progress.filters import filter_progress_queryset
+from progress.models import WeeklyProgress
+
+
+class Command(BaseCommand):
+    help = 'Export progress joined with skill and student attributes to Parquet or Arrow'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='file_format', choices=list(EXPORT_FORMATS), default='parquet')
+        parser.add_argument('--output', help='Output path (default: weekly-progress.<format>)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--student-id')
+        parser.add_argument('--skill-id')
+        parser.add_argument('--week-number')
+        parser.add_argument('--year')
+        parser.add_argument('--from', dest='from', help='Only weeks overlapping or after this YYYY-MM-DD date')
+        parser.add_argument('--to', dest='to', help='Only weeks starting on or before this YYYY-MM-DD date')
+
+    def handle(self, *args, **options):
+        file_format = options['file_format']
+        output = options['output'] or f'weekly-progress.{EXPORT_FORMATS[file_format][1]}'
+
+        try:
+            queryset = filter_progress_queryset(WeeklyProgress.objects.all(), None, options)
+        except ValidationError as e:
+            raise CommandError('; '.join(f'--{name}: {message}' for name, message in e.detail.items()))
+
+        # Write beside the target and rename on success, so a failed export
+        # never leaves an empty or truncated file where the old one was
+        directory, name = os.path.split(os.path.abspath(output))
+        descriptor, partial = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.part')
+        try:
+            with os.fdopen(descriptor, 'wb') as sink:
+                total = write_progress_export(queryset, sink, file_format=file_format, batch_size=options['batch_size'])
+            os.replace(partial, output)
+        except (ImproperlyConfigured, ValueError) as e:
+            raise CommandError(str(e))
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {total} rows to {output}'))
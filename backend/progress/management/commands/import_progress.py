@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from progress.imports import DEFAULT_BATCH_SIZE, CSVImportError, import_progress_csv
+
+
+class Command(BaseCommand):
+    help = 'Upsert progress from a CSV of student_email, skill_name, year, week_number, proficiency_level, hours_spent, notes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--error-report', help='Write failing rows and their errors to this CSV')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        report = open(options['error_report'], 'w', newline='', encoding='utf-8') if options['error_report'] else None
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as source:
+                summary = import_progress_csv(source, error_report=report, batch_size=options['batch_size'])
+        except (CSVImportError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+        finally:
+            if report:
+                report.close()
+
+        for error in summary['errors']:
+            self.stderr.write(f"Row {error['row']}: {'; '.join(error['errors'])}")
+        style = self.style.SUCCESS if not summary['failed'] else self.style.WARNING
+        self.stdout.write(style(
+            f"Imported {summary['rows'] - summary['failed']} of {summary['rows']} rows: "
+            f"{summary['created']} created, {summary['updated']} updated, {summary['failed']} failed"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from progress.idempotency import prune_idempotency_keys
+
+
+class Command(BaseCommand):
+    help = 'Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL_HOURS'
+
+    def handle(self, *args, **options):
+        deleted = prune_idempotency_keys()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} idempotency keys'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from progress.sketches import rebuild_all_sketches
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per skill-week percentile sketches from weekly_progress'
+
+    def handle(self, *args, **options):
+        count = rebuild_all_sketches()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} skill-week sketches'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from progress.recommendations import rebuild_similarity_model
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the stored skill similarity matrix behind skill recommendations (run from cron)'
+
+    def handle(self, *args, **options):
+        model = rebuild_similarity_model()
+        similarity = model['similarity']
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt similarity for {len(model['skill_ids'])} skills from {model['students']} students "
+            f'({similarity.nnz} non-zero pairs)'
+        ))
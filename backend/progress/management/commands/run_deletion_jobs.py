@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from progress.bulk_delete import DEFAULT_BATCH_SIZE, fail_stale_jobs, run_deletion_job
+from progress.models import BulkDeletionJob
+
+
+class Command(BaseCommand):
+    help = 'Run queued skill/user deletion jobs and fail the ones whose worker died (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resume', action='store_true', help='Also rerun failed jobs from where they stopped')
+        parser.add_argument('--stale-seconds', type=int, default=None,
+                            help='Fail running jobs silent this long (default: DELETION_JOB_STALE_SECONDS)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        stale = fail_stale_jobs(options['stale_seconds'])
+        if stale:
+            self.stdout.write(self.style.WARNING(f'Marked {stale} stalled jobs failed'))
+
+        statuses = ['pending', 'failed'] if options['resume'] else ['pending']
+        job_ids = list(
+            BulkDeletionJob.objects.filter(status__in=statuses).order_by('created_at').values_list('id', flat=True)
+        )
+        for job_id in job_ids:
+            try:
+                ran = run_deletion_job(job_id, batch_size=options['batch_size'], resume=options['resume'])
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Job #{job_id} failed: {e}'))
+                continue
+            if ran:
+                self.stdout.write(f'Job #{job_id} completed')
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {len(job_ids)} jobs'))
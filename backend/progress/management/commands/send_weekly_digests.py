@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from progress.digests import DEFAULT_CHUNK_SIZE, DEFAULT_SEND_BATCH_SIZE, last_completed_week, send_weekly_digests
+
+
+class Command(BaseCommand):
+    help = "Email every active student who logged progress a summary of their week (defaults to last week)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int)
+        parser.add_argument('--week-number', type=int)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_SEND_BATCH_SIZE)
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Build the emails without sending them')
+
+    def handle(self, *args, **options):
+        default_year, default_week = last_completed_week()
+        year = options['year'] or default_year
+        week_number = options['week_number'] or default_week
+
+        run = send_weekly_digests(
+            year, week_number,
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Built {run.built} digests for week {week_number} of {year} (dry run)'
+            ))
+            return
+        style = self.style.SUCCESS if not run.failed else self.style.WARNING
+        self.stdout.write(style(
+            f'Sent {run.sent} of {run.built} digests for week {week_number} of {year} ({run.failed} failed)'
+        ))
+        for number, recipients, error in run.failed_batches:
+            self.stdout.write(self.style.ERROR(
+                f'  batch {number}: {len(recipients)} messages ({recipients[0]} .. {recipients[-1]}): {error}'
+            ))
+        if run.failed_batches:
+            # Non-zero exit so cron and schedulers flag the run
+            raise CommandError(f'{len(run.failed_batches)} digest batches failed')
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("skills", "0001_initial"),
+        ("progress", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedWeeklyProgress",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("week_number", models.IntegerField()),
+                ("year", models.IntegerField()),
+                (
+                    "proficiency_level",
+                    models.CharField(
+                        choices=[
+                            ("beginner", "Beginner"),
+                            ("intermediate", "Intermediate"),
+                            ("advanced", "Advanced"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("hours_spent", models.FloatField(default=0.0)),
+                ("notes", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_progress_entries",
+                        to="skills.skill",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_progress_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "weekly_progress_archive",
+                "ordering": ["-year", "-week_number"],
+                "unique_together": {("student", "skill", "week_number", "year")},
+            },
+        ),
+    ]
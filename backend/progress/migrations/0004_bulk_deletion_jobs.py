@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("progress", "0003_weekly_progress_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BulkDeletionJob",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "target_type",
+                    models.CharField(
+                        choices=[("skill", "Skill"), ("user", "User")], max_length=10
+                    ),
+                ),
+                ("target_id", models.BigIntegerField()),
+                ("target_label", models.CharField(max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("total_entries", models.IntegerField(default=0)),
+                ("deleted_entries", models.IntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "bulk_deletion_jobs",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
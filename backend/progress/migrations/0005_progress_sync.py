@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("progress", "0004_bulk_deletion_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProgressTombstone",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("progress_id", models.BigIntegerField()),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "progress_tombstones",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="weeklyprogress",
+            index=models.Index(
+                fields=["student", "updated_at", "id"],
+                name="progress_student_updated_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="progresstombstone",
+            name="student",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="progresstombstone",
+            index=models.Index(fields=["student", "id"], name="tombstone_student_idx"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("progress", "0005_progress_sync"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="weeklyprogress",
+            index=models.Index(
+                fields=["skill", "student", "year", "week_number"],
+                name="progress_skill_timeline_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("skills", "0003_admin_search_indexes"),
+        ("progress", "0006_skill_timeline_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProgressSketch",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("year", models.IntegerField()),
+                ("week_number", models.IntegerField()),
+                ("count", models.IntegerField(default=0)),
+                ("digest", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="skills.skill",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "progress_sketches",
+                "indexes": [
+                    models.Index(fields=["year", "week_number"], name="sketch_week_idx")
+                ],
+                "unique_together": {("skill", "year", "week_number")},
+            },
+        ),
+    ]
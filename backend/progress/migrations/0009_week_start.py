@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:05
+
+import datetime
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 5000
+
+
+def iso_week_start(year, week_number):
+    jan4 = datetime.date(year, 1, 4)
+    return (
+        jan4
+        - datetime.timedelta(days=jan4.weekday())
+        + datetime.timedelta(weeks=week_number - 1)
+    )
+
+
+def backfill_week_start(apps, schema_editor):
+    """Fill week_start in primary-key batches, committing each batch separately"""
+    WeeklyProgress = apps.get_model("progress", "WeeklyProgress")
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                WeeklyProgress.objects.filter(id__gt=last_id, week_start__isnull=True)
+                .order_by("id")
+                .only("id", "year", "week_number")[:BATCH_SIZE]
+            )
+            if not rows:
+                return
+            for row in rows:
+                row.week_start = iso_week_start(row.year, row.week_number)
+            WeeklyProgress.objects.bulk_update(rows, ["week_start"], batch_size=1000)
+        last_id = rows[-1].id
+
+
+class Migration(migrations.Migration):
+    # Batches commit on their own so a large table isn't locked for the whole backfill
+    atomic = False
+
+    dependencies = [
+        ("progress", "0008_idempotency_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="weeklyprogress",
+            name="week_start",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_week_start, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="weeklyprogress",
+            name="week_start",
+            field=models.DateField(db_index=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="weeklyprogress",
+            index=models.Index(
+                fields=["student", "week_start"], name="progress_student_week_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_cohorts"),
+        ("progress", "0009_week_start"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="weeklyprogress",
+            name="cohort",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="users.cohort",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weeklyprogress",
+            index=models.Index(
+                fields=["cohort", "week_start"], name="progress_cohort_week_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weeklyprogress",
+            index=models.Index(
+                fields=["cohort", "skill", "year", "week_number"],
+                name="progress_cohort_skill_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weeklyprogress",
+            index=models.Index(
+                fields=["cohort", "created_at"], name="progress_cohort_created_idx"
+            ),
+        ),
+    ]
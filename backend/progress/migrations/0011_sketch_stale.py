@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("progress", "0010_cohort_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="progresssketch",
+            name="stale",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("progress", "0011_sketch_stale"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SkillSimilarity",
+            fields=[
+                (
+                    "id",
+                    models.PositiveSmallIntegerField(
+                        default=1, primary_key=True, serialize=False
+                    ),
+                ),
+                ("matrix", models.BinaryField()),
+                ("students", models.IntegerField(default=0)),
+                ("built_at", models.DateTimeField()),
+                ("stale", models.BooleanField(default=False)),
+                ("rebuilding_since", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "skill_similarity",
+            },
+        ),
+    ]
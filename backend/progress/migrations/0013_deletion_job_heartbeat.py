@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("progress", "0012_skill_similarity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulkdeletionjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
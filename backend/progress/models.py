@@ -1,8 +1,16 @@
+from datetime import date, timedelta
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
-from users.models import User
+from users.models import Cohort, User
 from skills.models import Skill
 
+def iso_week_start(year, week_number):
+    """Monday of ISO week `week_number` (week 53 of a 52-week year rolls into the next)"""
+    jan4 = date(year, 1, 4)
+    return jan4 - timedelta(days=jan4.weekday()) + timedelta(weeks=week_number - 1)
+
+
 class WeeklyProgress(models.Model):
     PROFICIENCY_CHOICES = [
         ('beginner', 'Beginner'),
@@ -12,9 +20,16 @@ class WeeklyProgress(models.Model):
     
     id = models.BigAutoField(primary_key=True)
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_entries')
+    # Copy of student.cohort (kept in sync by a signal) leading the cohort indexes below,
+    # which also serve plain cohort lookups, so the FK gets no index of its own
+    cohort = models.ForeignKey(
+        Cohort, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+', db_index=False
+    )
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='progress_entries')
     week_number = models.IntegerField()
     year = models.IntegerField()
+    # Monday of the ISO week, derived from year/week_number on save for date-range queries
+    week_start = models.DateField(db_index=True, editable=False)
     proficiency_level = models.CharField(max_length=20, choices=PROFICIENCY_CHOICES)
     hours_spent = models.FloatField(default=0.0)
     notes = models.TextField(blank=True, null=True)
@@ -25,6 +40,162 @@ class WeeklyProgress(models.Model):
         db_table = 'weekly_progress'
         ordering = ['-year', '-week_number']
         unique_together = ['student', 'skill', 'week_number', 'year']
+        indexes = [
+            # Delta sync scans one student's rows by modification time
+            models.Index(fields=['student', 'updated_at', 'id'], name='progress_student_updated_idx'),
+            # Progression analytics read one skill's history in student/week order
+            models.Index(fields=['skill', 'student', 'year', 'week_number'], name='progress_skill_timeline_idx'),
+            models.Index(fields=['student', 'week_start'], name='progress_student_week_idx'),
+            # Cohort admins' listings, rollups and dashboards
+            models.Index(fields=['cohort', 'week_start'], name='progress_cohort_week_idx'),
+            models.Index(fields=['cohort', 'skill', 'year', 'week_number'], name='progress_cohort_skill_idx'),
+            models.Index(fields=['cohort', 'created_at'], name='progress_cohort_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.name} - {self.skill.skill_name} - Week {self.week_number}/{self.year}"
+    
+    def save(self, *args, **kwargs):
+        self.week_start = iso_week_start(self.year, self.week_number)
+        if self._state.adding and self.cohort_id is None:
+            self.cohort_id = self.student.cohort_id
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'year', 'week_number'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'week_start'}
+        super().save(*args, **kwargs)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember stored values so skill counters can be updated by delta on save
+        instance._loaded_skill_id = instance.__dict__.get('skill_id')
+        instance._loaded_hours_spent = instance.__dict__.get('hours_spent')
+        instance._loaded_week = (instance.__dict__.get('year'), instance.__dict__.get('week_number'))
+        return instance
+
+
+class ArchivedWeeklyProgress(models.Model):
+    """
+    Cold storage for progress from past academic years.
+
+    Rows are moved here by the `archive_progress` command so that
+    `weekly_progress` (and its indexes) only hold the active cohort.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_progress_entries')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='archived_progress_entries')
+    week_number = models.IntegerField()
+    year = models.IntegerField()
+    proficiency_level = models.CharField(max_length=20, choices=WeeklyProgress.PROFICIENCY_CHOICES)
+    hours_spent = models.FloatField(default=0.0)
+    notes = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'weekly_progress_archive'
+        ordering = ['-year', '-week_number']
+        unique_together = ['student', 'skill', 'week_number', 'year']
+    
+    def __str__(self):
+        return f"{self.student.name} - {self.skill.skill_name} - Week {self.week_number}/{self.year} (archived)"
+
+
+class BulkDeletionJob(models.Model):
+    """Progress record for a batched skill/user deletion running in the background"""
+    TARGET_CHOICES = [
+        ('skill', 'Skill'),
+        ('user', 'User'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    target_type = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    target_id = models.BigIntegerField()
+    target_label = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    total_entries = models.IntegerField(default=0)
+    deleted_entries = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+    # Touched after every batch; a running job that stops touching it lost its worker
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'bulk_deletion_jobs'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Delete {self.target_type} {self.target_label} ({self.status})"
+
+
+class ProgressTombstone(models.Model):
+    """Deletion log so sync clients can drop entries removed since their cursor"""
+    id = models.BigAutoField(primary_key=True)
+    progress_id = models.BigIntegerField()
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        db_table = 'progress_tombstones'
+        indexes = [
+            models.Index(fields=['student', 'id'], name='tombstone_student_idx'),
+        ]
+
+
+class ProgressSketch(models.Model):
+    """Packed t-digest of hours_spent for one skill and ISO week (see progress/sketches.py)"""
+    id = models.BigAutoField(primary_key=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='+')
+    year = models.IntegerField()
+    week_number = models.IntegerField()
+    count = models.IntegerField(default=0)
+    digest = models.BinaryField()
+    # Set by edits and deletes; the sketch is rebuilt from its entries on the next read
+    stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'progress_sketches'
+        unique_together = ['skill', 'year', 'week_number']
+        indexes = [
+            models.Index(fields=['year', 'week_number'], name='sketch_week_idx'),
+        ]
+
+
+class SkillSimilarity(models.Model):
+    """The latest skill x skill similarity matrix, shared by every worker (see progress/recommendations.py)"""
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    matrix = models.BinaryField()
+    students = models.IntegerField(default=0)
+    built_at = models.DateTimeField()
+    # Progress changed since the matrix was built
+    stale = models.BooleanField(default=False)
+    # Set while a request rebuilds the matrix, so the others keep serving this one
+    rebuilding_since = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'skill_similarity'
+
+
+class IdempotencyRecord(models.Model):
+    """First response to a write sent with an Idempotency-Key, replayed to retries"""
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response_data = models.JSONField(encoder=DjangoJSONEncoder, null=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        db_table = 'idempotency_keys'
+        unique_together = ['user', 'key']
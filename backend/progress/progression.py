@@ -0,0 +1,172 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from users.cohorts import scope_to_cohort
+from users.models import User
+from .models import WeeklyProgress
+
+LEVELS = [level for level, _ in WeeklyProgress.PROFICIENCY_CHOICES]
+
+DEFAULT_STALL_WEEKS = 4
+
+
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImproperlyConfigured('Progression analytics require the numpy package')
+    return numpy
+
+
+def _cache_key(skill_id):
+    return f'progression:{skill_id}'
+
+
+def invalidate_progression(*skill_ids):
+    keys = [_cache_key(skill_id) for skill_id in skill_ids if skill_id is not None]
+    # After commit, so a concurrent read can't re-cache the pre-write analysis
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _week_ordinals(np, years, weeks):
+    """Weeks since the epoch of each ISO (year, week), so gaps across New Year are exact"""
+    jan4 = (years - 1970).astype('datetime64[Y]').astype('datetime64[D]').astype(np.int64) + 3
+    # Day 0 (1970-01-01) was a Thursday; shift so Monday is weekday 0
+    week1_monday = jan4 - (jan4 + 3) % 7
+    return (week1_monday + (weeks - 1) * 7) // 7
+
+
+def _median(np, values):
+    return round(float(np.median(values)), 1) if len(values) else None
+
+
+def compute_progression(skill_id, cohort_id=None):
+    """
+    Analyze how students moved through proficiency levels in one skill.
+
+    A single ordered scan of the skill's progress feeds vectorized NumPy
+    passes; there is no per-student Python loop apart from building output.
+    `cohort_id` limits the analysis to one cohort's progress.
+    """
+    np = _load_numpy()
+
+    queryset = WeeklyProgress.objects.filter(skill_id=skill_id)
+    if cohort_id is not None:
+        queryset = queryset.filter(cohort_id=cohort_id)
+    rows = list(
+        queryset.order_by('student_id', 'year', 'week_number')
+        .values_list('student_id', 'year', 'week_number', 'hours_spent', 'proficiency_level')
+        .iterator(chunk_size=10000)
+    )
+    level_count = len(LEVELS)
+    result = {
+        'skill_id': skill_id,
+        'levels': LEVELS,
+        'students': 0,
+        'entries': len(rows),
+        'transitions': {'counts': [[0] * level_count for _ in LEVELS],
+                        'probabilities': [[0.0] * level_count for _ in LEVELS]},
+        'time_to_level': {},
+        'learners': [],
+    }
+    if not rows:
+        return result
+
+    student_ids, years, weeks, hours, level_names = zip(*rows)
+    students = np.array(student_ids, dtype=np.int64)
+    week = _week_ordinals(np, np.array(years, dtype=np.int64), np.array(weeks, dtype=np.int64))
+    hours = np.array(hours, dtype=np.float64)
+    level_index = {level: index for index, level in enumerate(LEVELS)}
+    levels = np.array([level_index.get(name, 0) for name in level_names], dtype=np.int64)
+
+    # Group boundaries: rows are sorted by student, so each student is one contiguous run
+    unique_students, starts, counts = np.unique(students, return_index=True, return_counts=True)
+    group = np.repeat(np.arange(len(unique_students)), counts)
+    ends = starts + counts - 1
+    result['students'] = len(unique_students)
+
+    # Transitions between consecutive weeks of the same student
+    same_student = group[1:] == group[:-1]
+    transition_counts = np.zeros((level_count, level_count), dtype=np.int64)
+    np.add.at(transition_counts, (levels[:-1][same_student], levels[1:][same_student]), 1)
+    totals = transition_counts.sum(axis=1, keepdims=True)
+    probabilities = np.divide(transition_counts, totals, out=np.zeros(transition_counts.shape), where=totals > 0)
+    result['transitions'] = {
+        'counts': transition_counts.tolist(),
+        'probabilities': np.round(probabilities, 4).tolist(),
+    }
+
+    # Cumulative hours per student, reset at each group start
+    running_hours = np.cumsum(hours)
+    hours_before_group = np.repeat(running_hours[starts] - hours[starts], counts)
+    cumulative_hours = running_hours - hours_before_group
+    weeks_since_start = week - np.repeat(week[starts], counts)
+
+    for target in range(1, level_count):
+        reached = np.flatnonzero(levels >= target)
+        # First row per student at or above the target level
+        _, first = np.unique(group[reached], return_index=True)
+        first_rows = reached[first]
+        result['time_to_level'][LEVELS[target]] = {
+            'students_reached': len(first_rows),
+            'median_weeks': _median(np, weeks_since_start[first_rows]),
+            'median_hours': _median(np, cumulative_hours[first_rows]),
+        }
+
+    # Best level so far per student: offset each group so one running max covers all groups
+    offset = group * level_count
+    best_so_far = np.maximum.accumulate(levels + offset) - offset
+    final_best = best_so_far[ends]
+    improved = np.ones(len(levels), dtype=bool)
+    improved[1:] = (best_so_far[1:] > best_so_far[:-1]) | ~same_student
+    # Week each student last raised their best level
+    last_improvement = np.maximum.accumulate(np.where(improved, np.arange(len(levels)), 0))[ends]
+
+    result['learners'] = [
+        {
+            'student_id': int(unique_students[i]),
+            'level': LEVELS[int(final_best[i])],
+            'weeks_at_level': int(week[ends[i]] - week[last_improvement[i]]),
+            'last_week': {'year': int(years[ends[i]]), 'week_number': int(weeks[ends[i]])},
+            'total_hours': round(float(cumulative_hours[ends[i]]), 2),
+        }
+        for i in range(len(unique_students))
+    ]
+    return result
+
+
+def skill_progression(skill_id, user=None):
+    """
+    Cached per skill; progress writes to the skill drop its entry.
+
+    A cohort admin gets the analysis of their cohort alone. Each skill's
+    entry holds one analysis per cohort, so invalidation stays one key.
+    """
+    cohort_id = user.cohort_id if user is not None else None
+    key = _cache_key(skill_id)
+    results = cache.get(key) or {}
+    if cohort_id not in results:
+        results[cohort_id] = compute_progression(skill_id, cohort_id)
+        cache.set(key, results, settings.PROGRESSION_CACHE_SECONDS)
+    return results[cohort_id]
+
+
+def stalled_learners(progression, stall_weeks=DEFAULT_STALL_WEEKS, user=None):
+    """
+    Students below the top level whose best level hasn't risen for `stall_weeks` weeks.
+
+    `user` limits the list to the students that admin can see; the analysis
+    from skill_progression(skill_id, user) is already scoped the same way.
+    """
+    stalled = [
+        learner for learner in progression['learners']
+        if learner['level'] != LEVELS[-1] and learner['weeks_at_level'] >= stall_weeks
+    ]
+    stalled.sort(key=lambda learner: -learner['weeks_at_level'])
+    users = scope_to_cohort(User.objects.all(), user).in_bulk([learner['student_id'] for learner in stalled])
+    return [
+        dict(learner, name=users[learner['student_id']].name, email=users[learner['student_id']].email)
+        for learner in stalled
+        if learner['student_id'] in users
+    ]
@@ -0,0 +1,236 @@
+import io
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Case, IntegerField, Max, Q, Value, When
+from django.utils import timezone
+from skills.models import Skill
+from .models import SkillSimilarity, WeeklyProgress
+
+# A rebuild claimed longer ago than this is assumed to have died with its worker
+REBUILD_LEASE_SECONDS = 60
+
+DEFAULT_RECOMMENDATIONS = 5
+MAX_RECOMMENDATIONS = 20
+
+# How far a student got with a skill; weights their row of the student x skill matrix
+PROFICIENCY_WEIGHT = Case(
+    When(proficiency_level='advanced', then=Value(3)),
+    When(proficiency_level='intermediate', then=Value(2)),
+    default=Value(1),
+    output_field=IntegerField(),
+)
+
+
+def _load_scipy():
+    try:
+        import numpy
+        import scipy.sparse
+    except ImportError:
+        raise ImproperlyConfigured('Skill recommendations require the numpy and scipy packages')
+    return numpy, scipy.sparse
+
+
+def _skill_levels(queryset):
+    """(student_id, skill_id, best level) for every student/skill pair in the queryset"""
+    return (
+        queryset.values('student_id', 'skill_id')
+        .annotate(level=Max(PROFICIENCY_WEIGHT))
+        .values_list('student_id', 'skill_id', 'level')
+        .order_by()
+    )
+
+
+def build_similarity_model():
+    """
+    Build the skill x skill cosine similarity matrix from weekly_progress.
+
+    Each student is a sparse row of their best proficiency per skill, so two
+    skills are similar when the same students practiced both and got far.
+    """
+    np, sparse = _load_scipy()
+
+    rows = list(_skill_levels(WeeklyProgress.objects.all()).iterator(chunk_size=10000))
+    if rows:
+        student_ids, skill_ids, levels = (np.array(column) for column in zip(*rows))
+    else:
+        student_ids = skill_ids = levels = np.array([], dtype=np.int64)
+
+    students, student_index = np.unique(student_ids, return_inverse=True)
+    skills, skill_index = np.unique(skill_ids, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (levels.astype(np.float32), (student_index, skill_index)),
+        shape=(len(students), len(skills)),
+    )
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    norms[norms == 0] = 1
+    normalized = matrix @ sparse.diags(1 / norms)
+    similarity = (normalized.T @ normalized).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    return {
+        'built_at': timezone.now(),
+        'skill_ids': skills,
+        'similarity': similarity.astype(np.float32),
+        'students': len(students),
+    }
+
+
+def _pack(model):
+    np, _ = _load_scipy()
+    similarity = model['similarity']
+    buffer = io.BytesIO()
+    np.savez(
+        buffer, skill_ids=model['skill_ids'], data=similarity.data, indices=similarity.indices,
+        indptr=similarity.indptr, shape=np.array(similarity.shape)
+    )
+    return buffer.getvalue()
+
+
+def _unpack(row):
+    np, sparse = _load_scipy()
+    arrays = np.load(io.BytesIO(bytes(row.matrix)), allow_pickle=False)
+    return {
+        'built_at': row.built_at,
+        'skill_ids': arrays['skill_ids'],
+        'similarity': sparse.csr_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']), shape=tuple(arrays['shape'])
+        ),
+        'students': row.students,
+    }
+
+
+# This process's unpacked copy of the stored matrix
+_loaded_model = None
+
+
+def rebuild_similarity_model():
+    """Build the matrix and store it for every worker"""
+    global _loaded_model
+    # Cleared before the build, so progress written meanwhile flags the new matrix stale again
+    SkillSimilarity.objects.filter(pk=1).update(stale=False)
+    try:
+        model = build_similarity_model()
+    except Exception:
+        mark_similarity_stale()
+        raise
+    SkillSimilarity.objects.update_or_create(pk=1, defaults={
+        'matrix': _pack(model),
+        'students': model['students'],
+        'built_at': model['built_at'],
+        'rebuilding_since': None,
+    })
+    _loaded_model = model
+    return model
+
+
+def mark_similarity_stale():
+    """Flag the stored model for rebuild after progress changes"""
+    SkillSimilarity.objects.filter(stale=False).update(stale=True)
+
+
+def _claim_rebuild():
+    now = timezone.now()
+    return SkillSimilarity.objects.filter(
+        Q(rebuilding_since__isnull=True) | Q(rebuilding_since__lt=now - timedelta(seconds=REBUILD_LEASE_SECONDS)),
+        pk=1
+    ).update(rebuilding_since=now)
+
+
+def get_similarity_model():
+    """
+    Return the stored model, rebuilding it when missing or when progress changed
+    and the model is older than RECOMMENDATION_REFRESH_SECONDS.
+
+    The matrix is unpacked once per process and again only after another
+    worker (or the rebuild_skill_similarity command) stores a newer one.
+    """
+    global _loaded_model
+    state = SkillSimilarity.objects.filter(pk=1).values('built_at', 'stale').first()
+    if state is None:
+        return rebuild_similarity_model()
+
+    model = _loaded_model
+    if model is None or model['built_at'] != state['built_at']:
+        model = _loaded_model = _unpack(SkillSimilarity.objects.get(pk=1))
+
+    age = (timezone.now() - model['built_at']).total_seconds()
+    if age > settings.RECOMMENDATION_REFRESH_SECONDS and state['stale']:
+        # One request rebuilds; the rest keep serving the previous model
+        if _claim_rebuild():
+            try:
+                model = rebuild_similarity_model()
+            finally:
+                SkillSimilarity.objects.filter(pk=1).update(rebuilding_since=None)
+    return model
+
+
+def _popular_skills(exclude, limit):
+    skills = Skill.objects.exclude(id__in=exclude).order_by('-practice_count', 'skill_name')[:limit]
+    return [
+        {
+            'skill_id': skill.id,
+            'skill_name': skill.skill_name,
+            'category': skill.category,
+            'score': 0.0,
+            'because': None,
+        }
+        for skill in skills
+    ]
+
+
+def recommend_skills(student, limit=DEFAULT_RECOMMENDATIONS):
+    """Skills the student hasn't practiced, ranked by similarity to the ones they have"""
+    np, _ = _load_scipy()
+    model = get_similarity_model()
+    skill_ids = model['skill_ids']
+    similarity = model['similarity']
+
+    practiced = list(_skill_levels(WeeklyProgress.objects.filter(student=student)))
+    practiced_ids = [skill_id for _, skill_id, _ in practiced]
+
+    # Skills practiced since the last rebuild aren't in the matrix yet
+    known = np.isin(np.array(practiced_ids, dtype=np.int64), skill_ids)
+    positions = np.searchsorted(skill_ids, np.array(practiced_ids, dtype=np.int64)[known])
+    weights = np.array([level for _, _, level in practiced], dtype=np.float32)[known]
+
+    recommendations = []
+    if len(positions):
+        # Contribution of each practiced skill (rows) to each candidate (columns)
+        contributions = similarity[positions].multiply(weights[:, None]).tocsc()
+        scores = np.asarray(contributions.sum(axis=0)).ravel() / weights.sum()
+        scores[positions] = 0
+
+        top = np.argsort(-scores, kind='stable')[:limit]
+        top = top[scores[top] > 0]
+        reasons = [
+            positions[contributions[:, column].toarray().ravel().argmax()] for column in top
+        ]
+
+        skills = Skill.objects.in_bulk([int(skill_ids[i]) for i in [*top, *reasons]])
+        for column, reason in zip(top, reasons):
+            skill = skills.get(int(skill_ids[column]))
+            if skill is None:
+                continue
+            because = skills.get(int(skill_ids[reason]))
+            recommendations.append({
+                'skill_id': skill.id,
+                'skill_name': skill.skill_name,
+                'category': skill.category,
+                'score': round(float(scores[column]), 4),
+                'because': because.skill_name if because else None,
+            })
+
+    if len(recommendations) < limit:
+        # Cold start: pad with the most practiced skills
+        seen = practiced_ids + [item['skill_id'] for item in recommendations]
+        recommendations += _popular_skills(seen, limit - len(recommendations))
+
+    return {
+        'student_id': student.id,
+        'generated_at': model['built_at'],
+        'recommendations': recommendations,
+    }
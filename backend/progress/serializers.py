@@ -1,8 +1,16 @@
 from rest_framework import serializers
-from .models import WeeklyProgress
+from .models import WeeklyProgress, ArchivedWeeklyProgress, BulkDeletionJob
 from skills.serializers import SkillSerializer
 from users.serializers import UserSerializer
 
+# Shared with the CSV import, which checks each row against the same limits and messages
+MAX_HOURS_PER_WEEK = 168
+MIN_YEAR, MAX_YEAR = 2020, 2100
+HOURS_NEGATIVE_ERROR = "Hours spent cannot be negative."
+HOURS_EXCEEDED_ERROR = f"Hours spent cannot exceed {MAX_HOURS_PER_WEEK} hours per week."
+WEEK_NUMBER_ERROR = "Week number must be between 1 and 53."
+YEAR_ERROR = "Invalid year."
+
 class WeeklyProgressSerializer(serializers.ModelSerializer):
     skill_details = SkillSerializer(source='skill', read_only=True)
     student_details = UserSerializer(source='student', read_only=True)
@@ -10,27 +18,27 @@ class WeeklyProgressSerializer(serializers.ModelSerializer):
     class Meta:
         model = WeeklyProgress
         fields = [
-            'id', 'student', 'skill', 'week_number', 'year', 
+            'id', 'student', 'skill', 'week_number', 'year', 'week_start',
             'proficiency_level', 'hours_spent', 'notes', 
             'created_at', 'updated_at', 'skill_details', 'student_details'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'week_start', 'created_at', 'updated_at']
     
     def validate_hours_spent(self, value):
         if value < 0:
-            raise serializers.ValidationError("Hours spent cannot be negative.")
-        if value > 168:
-            raise serializers.ValidationError("Hours spent cannot exceed 168 hours per week.")
+            raise serializers.ValidationError(HOURS_NEGATIVE_ERROR)
+        if value > MAX_HOURS_PER_WEEK:
+            raise serializers.ValidationError(HOURS_EXCEEDED_ERROR)
         return value
     
     def validate_week_number(self, value):
         if value < 1 or value > 53:
-            raise serializers.ValidationError("Week number must be between 1 and 53.")
+            raise serializers.ValidationError(WEEK_NUMBER_ERROR)
         return value
     
     def validate_year(self, value):
-        if value < 2020 or value > 2100:
-            raise serializers.ValidationError("Invalid year.")
+        if value < MIN_YEAR or value > MAX_YEAR:
+            raise serializers.ValidationError(YEAR_ERROR)
         return value
 
 class WeeklyProgressCreateSerializer(serializers.ModelSerializer):
@@ -43,17 +51,39 @@ class WeeklyProgressCreateSerializer(serializers.ModelSerializer):
     
     def validate_hours_spent(self, value):
         if value < 0:
-            raise serializers.ValidationError("Hours spent cannot be negative.")
-        if value > 168:
-            raise serializers.ValidationError("Hours spent cannot exceed 168 hours per week.")
+            raise serializers.ValidationError(HOURS_NEGATIVE_ERROR)
+        if value > MAX_HOURS_PER_WEEK:
+            raise serializers.ValidationError(HOURS_EXCEEDED_ERROR)
         return value
     
     def validate_week_number(self, value):
         if value < 1 or value > 53:
-            raise serializers.ValidationError("Week number must be between 1 and 53.")
+            raise serializers.ValidationError(WEEK_NUMBER_ERROR)
         return value
     
     def validate_year(self, value):
-        if value < 2020 or value > 2100:
-            raise serializers.ValidationError("Invalid year.")
+        if value < MIN_YEAR or value > MAX_YEAR:
+            raise serializers.ValidationError(YEAR_ERROR)
         return value
+
+class ArchivedWeeklyProgressSerializer(serializers.ModelSerializer):
+    skill_details = SkillSerializer(source='skill', read_only=True)
+    student_details = UserSerializer(source='student', read_only=True)
+    
+    class Meta:
+        model = ArchivedWeeklyProgress
+        fields = [
+            'id', 'student', 'skill', 'week_number', 'year', 
+            'proficiency_level', 'hours_spent', 'notes', 
+            'created_at', 'updated_at', 'archived_at', 'skill_details', 'student_details'
+        ]
+        read_only_fields = fields
+
+class BulkDeletionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BulkDeletionJob
+        fields = [
+            'id', 'target_type', 'target_id', 'target_label', 'status',
+            'total_entries', 'deleted_entries', 'error', 'created_at', 'heartbeat_at', 'finished_at'
+        ]
+        read_only_fields = fields
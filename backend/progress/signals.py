@@ -0,0 +1,135 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from users.models import User
+from .models import WeeklyProgress, ProgressTombstone
+from .counters import record_saved, record_deleted
+from .events import publish_progress_event
+from .progression import invalidate_progression
+from .recommendations import mark_similarity_stale
+from .sketches import add_to_sketch, mark_sketch_stale
+
+
+@receiver(pre_save, sender=WeeklyProgress)
+def capture_previous_values(sender, instance, **kwargs):
+    """Load stored skill/hours for instances not fetched through the ORM (e.g. deferred fields)"""
+    if instance._state.adding or getattr(instance, '_loaded_skill_id', None) is not None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values(
+        'skill_id', 'hours_spent', 'year', 'week_number'
+    ).first()
+    if previous:
+        instance._loaded_skill_id = previous['skill_id']
+        instance._loaded_hours_spent = previous['hours_spent']
+        instance._loaded_week = (previous['year'], previous['week_number'])
+
+
+@receiver(post_save, sender=WeeklyProgress)
+def update_skill_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        record_saved(instance, created)
+
+
+@receiver(post_delete, sender=WeeklyProgress)
+def update_skill_counters_on_delete(sender, instance, **kwargs):
+    record_deleted(instance)
+
+
+@receiver(post_delete, sender=WeeklyProgress)
+def record_tombstone(sender, instance, **kwargs):
+    ProgressTombstone.objects.create(progress_id=instance.pk, student_id=instance.student_id)
+
+
+@receiver(post_save, sender=WeeklyProgress)
+@receiver(post_delete, sender=WeeklyProgress)
+def invalidate_skill_similarity(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_similarity_stale()
+
+
+@receiver(pre_save, sender=WeeklyProgress)
+def invalidate_previous_skill_progression(sender, instance, raw=False, **kwargs):
+    # The entry may be moving to another skill; the old one's analysis changes too
+    previous_skill_id = getattr(instance, '_loaded_skill_id', None)
+    if not raw and previous_skill_id != instance.skill_id:
+        invalidate_progression(previous_skill_id)
+
+
+@receiver(post_save, sender=WeeklyProgress)
+@receiver(post_delete, sender=WeeklyProgress)
+def invalidate_skill_progression(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_progression(instance.skill_id)
+
+
+@receiver(pre_save, sender=WeeklyProgress)
+def capture_previous_sketch_bucket(sender, instance, raw=False, **kwargs):
+    """Remember which skill-week sketch an edited entry's old hours live in"""
+    instance._previous_sketch_bucket = None
+    if raw or instance._state.adding:
+        return
+    year, week_number = getattr(instance, '_loaded_week', (None, None))
+    previous = (
+        getattr(instance, '_loaded_skill_id', None), year, week_number,
+        getattr(instance, '_loaded_hours_spent', None)
+    )
+    if previous != (instance.skill_id, instance.year, instance.week_number, instance.hours_spent):
+        instance._previous_sketch_bucket = previous[:3]
+
+
+@receiver(post_save, sender=WeeklyProgress)
+def update_percentile_sketch(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current_bucket = (instance.skill_id, instance.year, instance.week_number)
+    previous_bucket = getattr(instance, '_previous_sketch_bucket', None)
+    if created:
+        add_to_sketch(*current_bucket, instance.hours_spent)
+    elif previous_bucket:
+        if previous_bucket != current_bucket and None not in previous_bucket:
+            mark_sketch_stale(*previous_bucket)
+        mark_sketch_stale(*current_bucket)
+    instance._loaded_week = current_bucket[1:]
+
+
+@receiver(post_delete, sender=WeeklyProgress)
+def remove_from_percentile_sketch(sender, instance, **kwargs):
+    mark_sketch_stale(instance.skill_id, instance.year, instance.week_number)
+
+
+@receiver(pre_save, sender=WeeklyProgress)
+def capture_previous_hours(sender, instance, raw=False, **kwargs):
+    # The counters reset the loaded values on save, before later post_save receivers run
+    instance._event_previous_hours = getattr(instance, '_loaded_hours_spent', None) or 0.0
+
+
+@receiver(post_save, sender=WeeklyProgress)
+def publish_progress_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        publish_progress_event('created', instance, instance.hours_spent)
+    else:
+        previous_hours = getattr(instance, '_event_previous_hours', instance.hours_spent)
+        publish_progress_event('updated', instance, instance.hours_spent - previous_hours)
+
+
+@receiver(post_delete, sender=WeeklyProgress)
+def publish_progress_deleted(sender, instance, **kwargs):
+    publish_progress_event('deleted', instance, -instance.hours_spent)
+
+
+@receiver(post_save, sender=User)
+def propagate_student_cohort(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Keep the denormalized cohort on a student's progress in step with the student"""
+    if created or raw or (update_fields is not None and 'cohort' not in update_fields):
+        return
+    # Most saves (logins, profile edits) leave the cohort alone; skip the UPDATE for them
+    if hasattr(instance, '_loaded_cohort_id') and instance._loaded_cohort_id == instance.cohort_id:
+        return
+    entries = WeeklyProgress.objects.filter(student=instance)
+    if instance.cohort_id is None:
+        entries = entries.filter(cohort__isnull=False)
+    else:
+        entries = entries.exclude(cohort_id=instance.cohort_id)
+    entries.update(cohort_id=instance.cohort_id)
+    instance._loaded_cohort_id = instance.cohort_id
@@ -0,0 +1,303 @@
+import math
+import struct
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from .models import ProgressSketch, WeeklyProgress
+
+DEFAULT_COMPRESSION = 100
+
+# Reported alongside every percentile lookup
+PERCENTILE_QUANTILES = [0.25, 0.5, 0.75, 0.9]
+
+_HEADER = struct.Struct('<ffI')
+
+
+class TDigest:
+    """
+    Merging t-digest over hours values.
+
+    Values are summarized by about `compression / 2` weighted centroids, tight
+    near the tails and coarse in the middle, so percentiles stay accurate in
+    bounded memory. Two digests merge by combining their centroids.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.minimum = None
+        self.maximum = None
+        self._buffer = []
+
+    @property
+    def count(self):
+        self._flush()
+        return int(sum(self.weights))
+
+    def add(self, value, weight=1):
+        value = float(value)
+        self._buffer.append((value, weight))
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        if len(self._buffer) > self.compression * 5:
+            self._flush()
+
+    def merge(self, other):
+        other._flush()
+        self._buffer.extend(zip(other.means, other.weights))
+        if other.minimum is not None:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self._flush()
+        return self
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        centroids = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in centroids)
+
+        means, weights = [], []
+        mean, weight = centroids[0]
+        before = 0
+        for next_mean, next_weight in centroids[1:]:
+            # A centroid may span at most one unit of the arcsine scale, so it is
+            # narrow near the tails and there are about compression / 2 of them
+            if self._scale((before + weight + next_weight) / total) - self._scale(before / total) <= 1:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def _scale(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * min(q, 1) - 1)
+
+    def _cumulative(self):
+        """Weight before and through each centroid, and the total weight"""
+        before, through, running = [], [], 0
+        for weight in self.weights:
+            before.append(running)
+            running += weight
+            through.append(running)
+        return before, through, running
+
+    def cdf(self, value):
+        """Fraction of values below `value`, counting ties as half"""
+        self._flush()
+        if not self.means:
+            return None
+        if value < self.minimum:
+            return 0.0
+        if value > self.maximum:
+            return 1.0
+
+        before, through, total = self._cumulative()
+        low, high = bisect_left(self.means, value), bisect_right(self.means, value)
+        if low < high:
+            return (before[low] + through[high - 1]) / 2 / total
+
+        # Interpolate between neighbouring centroid centres, anchored at min and max
+        xs = [self.minimum] + self.means + [self.maximum]
+        ys = [0] + [b + w / 2 for b, w in zip(before, self.weights)] + [total]
+        index = low + 1
+        x0, x1, y0, y1 = xs[index - 1], xs[index], ys[index - 1], ys[index]
+        rank = y0 if x1 == x0 else y0 + (y1 - y0) * (value - x0) / (x1 - x0)
+        return rank / total
+
+    def quantile(self, q):
+        self._flush()
+        if not self.means:
+            return None
+        _, _, total = self._cumulative()
+        target = q * total
+        xs = [self.minimum]
+        ys = [0]
+        running = 0
+        for mean, weight in zip(self.means, self.weights):
+            xs.append(mean)
+            ys.append(running + weight / 2)
+            running += weight
+        xs.append(self.maximum)
+        ys.append(total)
+
+        index = min(bisect_left(ys, target), len(ys) - 1)
+        if index == 0:
+            return self.minimum
+        x0, x1, y0, y1 = xs[index - 1], xs[index], ys[index - 1], ys[index]
+        if y1 == y0:
+            return x1
+        return x0 + (x1 - x0) * (target - y0) / (y1 - y0)
+
+    def to_bytes(self):
+        """Packed as min, max, n, then n float32 means and n uint32 weights"""
+        self._flush()
+        count = len(self.means)
+        return _HEADER.pack(self.minimum or 0, self.maximum or 0, count) + struct.pack(
+            f'<{count}f{count}I', *self.means, *(int(weight) for weight in self.weights)
+        )
+
+    @classmethod
+    def from_bytes(cls, data, compression=DEFAULT_COMPRESSION):
+        digest = cls(compression)
+        minimum, maximum, count = _HEADER.unpack_from(data)
+        if count:
+            values = struct.unpack_from(f'<{count}f{count}I', data, _HEADER.size)
+            digest.means = list(values[:count])
+            digest.weights = list(values[count:])
+            digest.minimum, digest.maximum = minimum, maximum
+        return digest
+
+
+def _week_cache_key(year, week_number):
+    return f'progress-sketch:{year}:{week_number}'
+
+
+def _invalidate_week(year, week_number):
+    transaction.on_commit(lambda: cache.delete(_week_cache_key(year, week_number)))
+
+
+def add_to_sketch(skill_id, year, week_number, hours):
+    """Fold one new entry into its skill-week sketch, inside the writer's transaction"""
+    with transaction.atomic():
+        sketch, _ = ProgressSketch.objects.select_for_update().get_or_create(
+            skill_id=skill_id, year=year, week_number=week_number,
+            defaults={'digest': TDigest().to_bytes()}
+        )
+        # A stale sketch is rebuilt from the table on its next read, new entry included
+        if not sketch.stale:
+            digest = TDigest.from_bytes(bytes(sketch.digest))
+            digest.add(hours)
+            sketch.digest = digest.to_bytes()
+            sketch.count = digest.count
+            sketch.save(update_fields=['digest', 'count', 'updated_at'])
+    _invalidate_week(year, week_number)
+
+
+def mark_sketch_stale(skill_id, year, week_number):
+    """
+    Flag a skill-week sketch for rebuilding after an edit or delete.
+
+    Digests can't forget values, so the sketch must be recomputed from its
+    entries; doing that on the next read means a burst of edits to one
+    skill-week costs one rebuild instead of a full scan per write.
+    """
+    sketches = ProgressSketch.objects.filter(skill_id=skill_id, year=year, week_number=week_number)
+    if not sketches.update(stale=True):
+        # The edit moved an entry into a skill-week without a sketch yet
+        ProgressSketch.objects.get_or_create(
+            skill_id=skill_id, year=year, week_number=week_number,
+            defaults={'digest': TDigest().to_bytes(), 'stale': True}
+        )
+    _invalidate_week(year, week_number)
+
+
+def rebuild_sketch(skill_id, year, week_number):
+    """Recompute a skill-week sketch from its entries on the primary"""
+    # Also called from replica-routed reads; the rebuild must see the latest writes
+    using = router.db_for_write(ProgressSketch)
+    sketches = ProgressSketch.objects.using(using).filter(skill_id=skill_id, year=year, week_number=week_number)
+    with transaction.atomic(using=using):
+        # Holding the row makes a concurrent mark_sketch_stale wait, then re-flag it
+        list(sketches.select_for_update())
+        digest = TDigest()
+        hours = WeeklyProgress.objects.using(using).filter(
+            skill_id=skill_id, year=year, week_number=week_number
+        ).values_list('hours_spent', flat=True)
+        for value in hours:
+            digest.add(value)
+
+        if digest.count:
+            ProgressSketch.objects.using(using).update_or_create(
+                skill_id=skill_id, year=year, week_number=week_number,
+                defaults={'digest': digest.to_bytes(), 'count': digest.count, 'stale': False}
+            )
+        else:
+            sketches.delete()
+    _invalidate_week(year, week_number)
+
+
+def _rebuild_stale(year, week_number, skill_id=None):
+    stale = ProgressSketch.objects.filter(year=year, week_number=week_number, stale=True)
+    if skill_id is not None:
+        stale = stale.filter(skill_id=skill_id)
+    for stale_skill_id in stale.values_list('skill_id', flat=True):
+        rebuild_sketch(stale_skill_id, year, week_number)
+
+
+def delete_sketches_before(year):
+    """Drop the sketches of every week before `year`, e.g. once those weeks are archived"""
+    sketches = ProgressSketch.objects.filter(year__lt=year)
+    weeks = set(sketches.values_list('year', 'week_number').distinct())
+    sketches.delete()
+    for week in weeks:
+        _invalidate_week(*week)
+
+
+def _sketch(bucket, digest):
+    skill_id, year, week_number = bucket
+    return ProgressSketch(
+        skill_id=skill_id, year=year, week_number=week_number,
+        digest=digest.to_bytes(), count=digest.count
+    )
+
+
+def rebuild_all_sketches():
+    """Rebuild every skill-week sketch from one ordered scan; returns the number written"""
+    rows = (
+        WeeklyProgress.objects.order_by('skill_id', 'year', 'week_number')
+        .values_list('skill_id', 'year', 'week_number', 'hours_spent')
+        .iterator(chunk_size=10000)
+    )
+    sketches, bucket, digest = [], None, None
+    for skill_id, year, week_number, hours in rows:
+        if (skill_id, year, week_number) != bucket:
+            if digest is not None:
+                sketches.append(_sketch(bucket, digest))
+            bucket, digest = (skill_id, year, week_number), TDigest()
+        digest.add(hours)
+    if digest is not None:
+        sketches.append(_sketch(bucket, digest))
+
+    with transaction.atomic():
+        weeks = set(ProgressSketch.objects.values_list('year', 'week_number').distinct())
+        ProgressSketch.objects.all().delete()
+        ProgressSketch.objects.bulk_create(sketches, batch_size=1000)
+    weeks |= {(sketch.year, sketch.week_number) for sketch in sketches}
+    cache.delete_many([_week_cache_key(year, week_number) for year, week_number in weeks])
+    return len(sketches)
+
+
+def skill_week_digest(skill_id, year, week_number):
+    _rebuild_stale(year, week_number, skill_id)
+    sketch = ProgressSketch.objects.filter(skill_id=skill_id, year=year, week_number=week_number).first()
+    return TDigest.from_bytes(bytes(sketch.digest)) if sketch else TDigest()
+
+
+def week_digest(year, week_number):
+    """
+    All skills for the week: the merge of their sketches.
+
+    Cached until the next write to the week, and for at most
+    SKETCH_CACHE_SECONDS where the cache isn't shared by every worker.
+    """
+    key = _week_cache_key(year, week_number)
+    data = cache.get(key)
+    if data is not None:
+        return TDigest.from_bytes(data)
+
+    _rebuild_stale(year, week_number)
+    digest = TDigest()
+    for data in ProgressSketch.objects.filter(year=year, week_number=week_number).values_list('digest', flat=True):
+        digest.merge(TDigest.from_bytes(bytes(data)))
+    cache.set(key, digest.to_bytes(), settings.SKETCH_CACHE_SECONDS)
+    return digest
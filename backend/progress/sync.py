@@ -0,0 +1,95 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import WeeklyProgress, ProgressTombstone
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+
+class CursorExpired(Exception):
+    """The cursor predates retained tombstones; the client must resync from scratch"""
+
+
+def encode_cursor(updated_at, last_id, tombstone_id):
+    payload = {
+        'u': updated_at.isoformat() if updated_at else None,
+        'i': last_id,
+        't': tombstone_id,
+        'at': timezone.now().isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(value):
+    """Return (updated_at, last_id, tombstone_id); raises ValueError for malformed cursors"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(value.encode()))
+        updated_at = parse_datetime(payload['u']) if payload['u'] else None
+        issued_at = parse_datetime(payload['at'])
+        last_id = int(payload['i'] or 0)
+        tombstone_id = int(payload['t'] or 0)
+    except (KeyError, TypeError, ValueError, json.JSONDecodeError):
+        raise ValueError('Invalid sync cursor')
+
+    if issued_at < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+        raise CursorExpired()
+    return updated_at, last_id, tombstone_id
+
+
+def progress_changes(student, cursor=None, limit=DEFAULT_SYNC_LIMIT):
+    """
+    Entries created/updated after ``cursor`` plus ids deleted since then.
+
+    Changes are read in (updated_at, id) keyset order over an index and
+    tombstones in id order, each up to ``limit`` per page and each with its
+    own position in the cursor, so a client catching up after a long time
+    pages through ``has_more`` batches. Without a cursor the full history
+    is returned and no tombstones are needed.
+    """
+    changes = WeeklyProgress.objects.filter(student=student).select_related('skill', 'student')
+    tombstones = ProgressTombstone.objects.filter(student=student)
+
+    updated_at, last_id, tombstone_id = (None, 0, 0)
+    if cursor:
+        updated_at, last_id, tombstone_id = decode_cursor(cursor)
+        if updated_at is not None:
+            changes = changes.filter(
+                Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id)
+            )
+        deleted_ids = list(
+            tombstones.filter(id__gt=tombstone_id).order_by('id').values_list('id', 'progress_id')[:limit + 1]
+        )
+    else:
+        deleted_ids = []
+
+    entries = list(changes.order_by('updated_at', 'id')[:limit + 1])
+    has_more = len(entries) > limit or len(deleted_ids) > limit
+    entries = entries[:limit]
+    deleted_ids = deleted_ids[:limit]
+
+    if entries:
+        updated_at, last_id = entries[-1].updated_at, entries[-1].id
+    if deleted_ids:
+        tombstone_id = deleted_ids[-1][0]
+    elif not cursor:
+        tombstone_id = tombstones.aggregate(latest=Max('id'))['latest'] or 0
+
+    return {
+        'entries': entries,
+        'deleted': [progress_id for _, progress_id in deleted_ids],
+        'next_cursor': encode_cursor(updated_at, last_id, tombstone_id),
+        'has_more': has_more,
+    }
+
+
+def prune_tombstones():
+    """Drop tombstones older than any cursor that is still accepted"""
+    horizon = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = ProgressTombstone.objects.filter(deleted_at__lt=horizon).delete()
+    return deleted
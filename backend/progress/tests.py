@@ -1,3 +1,740 @@
-from django.test import TestCase
+import csv
+import random
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from skills.models import Skill
+from users.models import Cohort, User
+from .archive import archive_progress
+from .counters import reconcile_skill_counters
+from . import recommendations
+from .bulk_delete import bulk_delete_user, fail_stale_jobs, run_deletion_job
+from .digests import send_weekly_digests
+from .models import (
+    ArchivedWeeklyProgress,
+    BulkDeletionJob,
+    ProgressSketch,
+    ProgressTombstone,
+    SkillSimilarity,
+    WeeklyProgress,
+    iso_week_start,
+)
+from .progression import skill_progression, stalled_learners
+from .serializers import HOURS_NEGATIVE_ERROR, WEEK_NUMBER_ERROR
+from .sketches import TDigest, skill_week_digest, week_digest
+
+
+class ProgressionCohortTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        red = Cohort.objects.create(name='Red')
+        blue = Cohort.objects.create(name='Blue')
+        cls.red_admin = User.objects.create_user('red-admin@example.com', 'Red Admin', 'pw', role='admin', cohort=red)
+        cls.global_admin = User.objects.create_user('admin@example.com', 'Admin', 'pw', role='admin')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+        for email, cohort, levels in (
+            ('red@example.com', red, ['beginner', 'intermediate']),
+            ('blue@example.com', blue, ['beginner', 'beginner', 'advanced']),
+        ):
+            student = User.objects.create_user(email, email, 'pw', cohort=cohort)
+            for week_number, level in enumerate(levels, start=1):
+                WeeklyProgress.objects.create(
+                    student=student, skill=cls.skill, week_number=week_number, year=2026,
+                    hours_spent=5, proficiency_level=level
+                )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cohort_admin_gets_cohort_transitions(self):
+        progression = skill_progression(self.skill.id, self.red_admin)
+
+        self.assertEqual(progression['students'], 1)
+        self.assertEqual(progression['entries'], 2)
+        # beginner -> intermediate only; the other cohort's beginner -> beginner -> advanced is excluded
+        self.assertEqual(progression['transitions']['counts'], [[0, 1, 0], [0, 0, 0], [0, 0, 0]])
+        self.assertIsNone(progression['time_to_level']['advanced']['median_weeks'])
+
+    def test_global_admin_gets_every_cohort(self):
+        skill_progression(self.skill.id, self.red_admin)
+        progression = skill_progression(self.skill.id, self.global_admin)
+
+        self.assertEqual(progression['students'], 2)
+        self.assertEqual(progression['time_to_level']['advanced']['students_reached'], 1)
+
+    def test_stalled_learners_are_scoped(self):
+        progression = skill_progression(self.skill.id, self.red_admin)
+
+        self.assertEqual(
+            [learner['email'] for learner in stalled_learners(progression, 0, self.red_admin)],
+            ['red@example.com']
+        )
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+        for year in (2020, 2026):
+            for week_number in range(1, 11):
+                WeeklyProgress.objects.create(
+                    student=cls.student, skill=cls.skill, week_number=week_number, year=year,
+                    hours_spent=week_number, proficiency_level='beginner'
+                )
+
+    def test_archive_moves_rows_without_tombstones(self):
+        batches = list(archive_progress(2021, batch_size=4))
+
+        self.assertEqual(batches, [4, 4, 2])
+        self.assertEqual(ArchivedWeeklyProgress.objects.count(), 10)
+        self.assertFalse(WeeklyProgress.objects.filter(year__lt=2021).exists())
+        self.assertFalse(ProgressTombstone.objects.exists())
+
+    def test_archive_keeps_counters_and_sketches_consistent(self):
+        list(archive_progress(2021, batch_size=4))
+
+        self.assertEqual(reconcile_skill_counters(apply=False), [])
+        self.skill.refresh_from_db()
+        self.assertEqual((self.skill.total_hours, self.skill.practice_count), (55, 10))
+        self.assertFalse(ProgressSketch.objects.filter(year=2020).exists())
+        self.assertEqual(ProgressSketch.objects.filter(year=2026).count(), 10)
+
+
+class SketchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Skill.objects.create(skill_name='Python', category='Programming')
+        cls.git = Skill.objects.create(skill_name='Git', category='Tools')
+        cls.students = [User.objects.create_user(f's{index}@example.com', f'S{index}', 'pw') for index in range(4)]
+
+    def setUp(self):
+        cache.clear()
+
+    def log(self, student, skill, hours, week_number=5):
+        with self.captureOnCommitCallbacks(execute=True):
+            return WeeklyProgress.objects.create(
+                student=student, skill=skill, week_number=week_number, year=2026,
+                hours_spent=hours, proficiency_level='beginner'
+            )
+
+    def test_digest_quantiles_are_accurate(self):
+        generator = random.Random(7)
+        values = [generator.lognormvariate(1.5, 0.6) for _ in range(5000)]
+        digest = TDigest()
+        for value in values:
+            digest.add(value)
+        digest = TDigest.from_bytes(digest.to_bytes())
+        ordered = sorted(values)
+
+        self.assertEqual(digest.count, 5000)
+        for q in (0.01, 0.25, 0.5, 0.75, 0.9, 0.99):
+            # Within half a percentile of the exact rank
+            self.assertAlmostEqual(digest.cdf(digest.quantile(q)), q, delta=0.005)
+            self.assertAlmostEqual(digest.cdf(ordered[int(q * len(ordered))]), q, delta=0.005)
+
+    def test_new_entries_refresh_the_cached_week(self):
+        self.log(self.students[0], self.python, 2)
+        self.assertEqual(week_digest(2026, 5).count, 1)
+
+        self.log(self.students[1], self.git, 8)
+
+        self.assertEqual(week_digest(2026, 5).count, 2)
+        self.assertEqual(week_digest(2026, 5).quantile(1), 8)
+
+    def test_edits_and_deletes_rebuild_once_on_read(self):
+        entries = [self.log(student, self.python, hours) for student, hours in zip(self.students, (1, 2, 3, 4))]
+        self.assertEqual(week_digest(2026, 5).count, 4)
+
+        entries[0].hours_spent = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            entries[0].save()
+            entries[1].delete()
+        self.assertTrue(ProgressSketch.objects.get(skill=self.python, year=2026, week_number=5).stale)
+
+        digest = skill_week_digest(self.python.id, 2026, 5)
+        self.assertEqual((digest.count, digest.minimum, digest.maximum), (3, 3, 10))
+        self.assertFalse(ProgressSketch.objects.get(skill=self.python, year=2026, week_number=5).stale)
+        self.assertEqual(week_digest(2026, 5).count, 3)
+
+    def test_moving_an_entry_updates_both_weeks(self):
+        entry = self.log(self.students[0], self.python, 2)
+        self.assertEqual(week_digest(2026, 5).count, 1)
+
+        entry.week_number = 6
+        with self.captureOnCommitCallbacks(execute=True):
+            entry.save()
+
+        self.assertEqual(week_digest(2026, 5).count, 0)
+        self.assertEqual(week_digest(2026, 6).count, 1)
+        self.assertFalse(ProgressSketch.objects.filter(year=2026, week_number=5).exists())
+
+
+class SimilarityModelTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python, cls.django, cls.git = (
+            Skill.objects.create(skill_name=name, category='Programming') for name in ('Python', 'Django', 'Git')
+        )
+        cls.learner = User.objects.create_user('learner@example.com', 'Learner', 'pw')
+        cls.newcomer = User.objects.create_user('new@example.com', 'Newcomer', 'pw')
+        for skill in (cls.python, cls.django):
+            WeeklyProgress.objects.create(
+                student=cls.learner, skill=skill, week_number=1, year=2026, hours_spent=5, proficiency_level='advanced'
+            )
+        WeeklyProgress.objects.create(
+            student=cls.newcomer, skill=cls.python, week_number=1, year=2026, hours_spent=1, proficiency_level='beginner'
+        )
+
+    def setUp(self):
+        recommendations._loaded_model = None
+
+    def test_stored_model_is_shared_between_workers(self):
+        built = recommendations.rebuild_similarity_model()
+        # A worker that didn't build it loads the stored matrix instead of rebuilding
+        recommendations._loaded_model = None
+        with self.assertNumQueries(2):
+            loaded = recommendations.get_similarity_model()
+
+        self.assertEqual(loaded['built_at'], built['built_at'])
+        self.assertEqual(list(loaded['skill_ids']), list(built['skill_ids']))
+        self.assertEqual((loaded['similarity'] != built['similarity']).nnz, 0)
+
+    def test_writes_flag_the_stored_model_stale(self):
+        recommendations.rebuild_similarity_model()
+        WeeklyProgress.objects.create(
+            student=self.newcomer, skill=self.git, week_number=2, year=2026, hours_spent=1, proficiency_level='beginner'
+        )
+
+        self.assertTrue(SkillSimilarity.objects.get().stale)
+
+    @override_settings(RECOMMENDATION_REFRESH_SECONDS=0)
+    def test_stale_model_is_rebuilt(self):
+        first = recommendations.rebuild_similarity_model()
+        recommendations.mark_similarity_stale()
+
+        rebuilt = recommendations.get_similarity_model()
+
+        self.assertGreater(rebuilt['built_at'], first['built_at'])
+        self.assertFalse(SkillSimilarity.objects.get().stale)
+        self.assertIsNone(SkillSimilarity.objects.get().rebuilding_since)
+
+    def test_recommendations_use_the_stored_model(self):
+        result = recommendations.recommend_skills(self.newcomer)
+
+        self.assertEqual(result['recommendations'][0]['skill_name'], 'Django')
+        self.assertEqual(result['recommendations'][0]['because'], 'Python')
+
+
+class DeletionJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+        student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        for week_number in range(1, 6):
+            WeeklyProgress.objects.create(
+                student=student, skill=cls.skill, week_number=week_number, year=2026,
+                hours_spent=1, proficiency_level='beginner'
+            )
+
+    def queue(self, **fields):
+        return BulkDeletionJob.objects.create(
+            target_type='skill', target_id=self.skill.id, target_label=str(self.skill), **fields
+        )
+
+    def test_job_left_running_by_a_dead_worker_is_failed(self):
+        silent = self.queue(status='running', heartbeat_at=timezone.now() - timedelta(minutes=30))
+        alive = self.queue(status='running', heartbeat_at=timezone.now())
+
+        self.assertEqual(fail_stale_jobs(600), 1)
+        silent.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual((silent.status, alive.status), ('failed', 'running'))
+        self.assertIn('run_deletion_jobs --resume', silent.error)
+
+    def test_failed_job_resumes_where_it_stopped(self):
+        job = self.queue(status='failed', deleted_entries=2)
+
+        self.assertFalse(run_deletion_job(job.id))
+        self.assertTrue(run_deletion_job(job.id, batch_size=2, resume=True))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.total_entries, job.deleted_entries), ('completed', 7, 7))
+        self.assertFalse(Skill.objects.filter(pk=self.skill.id).exists())
+
+    def test_command_runs_queued_jobs_once(self):
+        job = self.queue()
+
+        call_command('run_deletion_jobs', stdout=StringIO())
+        call_command('run_deletion_jobs', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.deleted_entries), ('completed', 5))
+        self.assertIsNotNone(job.heartbeat_at)
+
+
+class StudentCohortTests(TestCase):
+    """Progress rows carry a copy of their student's cohort"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.red, cls.blue = Cohort.objects.create(name='Red'), Cohort.objects.create(name='Blue')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw', cohort=cls.red)
+        for week_number in (1, 2):
+            WeeklyProgress.objects.create(
+                student=cls.student, skill=cls.skill, week_number=week_number, year=2026,
+                hours_spent=2, proficiency_level='beginner'
+            )
+
+    def cohorts(self):
+        return set(WeeklyProgress.objects.filter(student=self.student).values_list('cohort_id', flat=True))
+
+    def test_moving_a_student_moves_their_progress(self):
+        student = User.objects.get(pk=self.student.pk)
+        student.cohort = self.blue
+        student.save()
+        self.assertEqual(self.cohorts(), {self.blue.id})
+
+        student.cohort = None
+        student.save()
+        self.assertEqual(self.cohorts(), {None})
+
+    def test_saves_that_keep_the_cohort_skip_the_update(self):
+        student = User.objects.get(pk=self.student.pk)
+        student.name = 'Renamed'
+
+        with self.assertNumQueries(1):
+            student.save()
+        self.assertEqual(self.cohorts(), {self.red.id})
+
+
+class BulkDeleteRollupTests(TestCase):
+    """Set-based deletes keep what the per-row signals would have maintained"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.red = Cohort.objects.create(name='Red')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+        cls.keeper = User.objects.create_user('keeper@example.com', 'Keeper', 'pw')
+        cls.leaver = User.objects.create_user('leaver@example.com', 'Leaver', 'pw', cohort=cls.red)
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            for student, hours in ((self.keeper, 5), (self.leaver, 40)):
+                WeeklyProgress.objects.create(
+                    student=student, skill=self.skill, week_number=5, year=2026,
+                    hours_spent=hours, proficiency_level='beginner'
+                )
+        # Warm every rollup the delete has to correct
+        self.assertEqual(skill_week_digest(self.skill.id, 2026, 5).count, 2)
+        self.assertEqual(week_digest(2026, 5).count, 2)
+        skill_progression(self.skill.id)
+        SkillSimilarity.objects.create(id=1, matrix=b'', students=0, built_at=timezone.now(), stale=False)
+
+    def assert_rollups_forget_the_leaver(self, publish, leaver_id):
+        digest = skill_week_digest(self.skill.id, 2026, 5)
+        self.assertEqual((digest.count, digest.quantile(0.9)), (1, 5))
+        self.assertEqual(week_digest(2026, 5).count, 1)
+        self.assertIsNone(cache.get(f'progression:{self.skill.id}'))
+        self.assertTrue(SkillSimilarity.objects.get().stale)
+        self.skill.refresh_from_db()
+        self.assertEqual((self.skill.total_hours, self.skill.practice_count), (5, 1))
+        publish.assert_called_once_with({
+            'type': 'progress.refresh',
+            'scope': {'student_ids': [leaver_id], 'cohort_ids': [self.red.id]},
+        })
+
+    def test_bulk_delete_user_refreshes_rollups(self):
+        leaver_id = self.leaver.id
+        with mock.patch('progress.events.get_event_bus') as bus:
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk_delete_user(self.leaver)
+
+        self.assertFalse(ProgressTombstone.objects.exists())
+        self.assert_rollups_forget_the_leaver(bus.return_value.publish, leaver_id)
+
+    def test_deletion_job_refreshes_rollups(self):
+        job = BulkDeletionJob.objects.create(target_type='user', target_id=self.leaver.id, target_label='Leaver')
+        with mock.patch('progress.events.get_event_bus') as bus:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(run_deletion_job(job.id, batch_size=1))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.deleted_entries), ('completed', 1))
+        self.assert_rollups_forget_the_leaver(bus.return_value.publish, self.leaver.id)
+
+
+class IdempotencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.payload = {'skill': self.skill.id, 'week_number': 12, 'year': 2026,
+                        'hours_spent': 3, 'proficiency_level': 'beginner'}
+
+    def post(self, payload, key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.client.post('/api/progress/', payload, format='json', **headers)
+
+    def test_retry_replays_the_first_response(self):
+        first = self.post(self.payload, key='retry-1')
+        replay = self.post(self.payload, key='retry-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(WeeklyProgress.objects.count(), 1)
+
+    def test_key_reused_for_another_body_is_rejected(self):
+        self.post(self.payload, key='retry-1')
+        response = self.post(dict(self.payload, hours_spent=4), key='retry-1')
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(WeeklyProgress.objects.get().hours_spent, 3)
+
+    def test_duplicate_without_key_is_a_client_error(self):
+        self.post(self.payload)
+        response = self.post(self.payload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(WeeklyProgress.objects.count(), 1)
+
+
+class WeeklyDigestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        skill = Skill.objects.create(skill_name='Python', category='Programming')
+        cls.active = [User.objects.create_user(f's{index}@example.com', f'S{index}', 'pw') for index in range(3)]
+        User.objects.create_user('idle@example.com', 'Idle', 'pw')
+        for student in cls.active:
+            WeeklyProgress.objects.create(
+                student=student, skill=skill, week_number=20, year=2026, hours_spent=2, proficiency_level='beginner'
+            )
+
+    def test_students_without_entries_get_no_digest(self):
+        run = send_weekly_digests(2026, 20)
+
+        self.assertEqual((run.built, run.sent, run.failed, run.failed_batches), (3, 3, 0, []))
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [student.email for student in self.active])
+
+    def test_failed_batches_are_logged_and_reported(self):
+        send = mail.get_connection().__class__.send_messages
+
+        def flaky(connection, messages):
+            if 's0@example.com' in messages[0].to:
+                raise ConnectionError('SMTP session dropped')
+            return send(connection, messages)
+
+        with mock.patch.object(mail.get_connection().__class__, 'send_messages', flaky), \
+                self.assertLogs('progress.digests', 'ERROR'):
+            run = send_weekly_digests(2026, 20, batch_size=2)
+
+        self.assertEqual((run.built, run.sent, run.failed), (3, 1, 2))
+        self.assertEqual(run.failed_batches, [(1, ['s0@example.com', 's1@example.com'], 'SMTP session dropped')])
+
+    def test_command_exits_non_zero_on_failed_batches(self):
+        with mock.patch.object(mail.get_connection().__class__, 'send_messages', side_effect=ConnectionError('down')), \
+                self.assertLogs('progress.digests', 'ERROR'):
+            with self.assertRaisesMessage(CommandError, '1 digest batches failed'):
+                call_command('send_weekly_digests', year=2026, week_number=20, stdout=StringIO())
+
+
+class SyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        cls.other = User.objects.create_user('other@example.com', 'Other', 'pw')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def log(self, week_number, student=None):
+        return WeeklyProgress.objects.create(
+            student=student or self.student, skill=self.skill, week_number=week_number, year=2026,
+            hours_spent=1, proficiency_level='beginner'
+        )
+
+    def sync(self, cursor=None, limit=2):
+        params = {'limit': limit, **({'since': cursor} if cursor else {})}
+        response = self.client.get('/api/progress/sync/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def drain(self, cursor):
+        entries, deleted = [], []
+        while True:
+            page = self.sync(cursor)
+            entries += [entry['id'] for entry in page['entries']]
+            deleted += page['deleted']
+            self.assertLessEqual(len(page['deleted']), 2)
+            cursor = page['next_cursor']
+            if not page['has_more']:
+                return entries, deleted, cursor
+
+    def test_snapshot_then_changes_since_cursor(self):
+        first, second = self.log(1), self.log(2)
+        self.log(3, student=self.other)
+        snapshot = self.sync(limit=10)
+        self.assertEqual([entry['id'] for entry in snapshot['entries']], [first.id, second.id])
+        self.assertEqual(snapshot['deleted'], [])
+
+        second.hours_spent = 5
+        second.save()
+        third = self.log(4)
+        first_id = first.id
+        first.delete()
+
+        entries, deleted, _ = self.drain(snapshot['next_cursor'])
+        self.assertEqual(entries, [second.id, third.id])
+        self.assertEqual(deleted, [first_id])
+
+    def test_tombstones_are_paged_with_the_cursor(self):
+        entries = [self.log(week_number) for week_number in range(1, 6)]
+        entry_ids = [entry.id for entry in entries]
+        cursor = self.sync(limit=10)['next_cursor']
+        for entry in entries:
+            entry.delete()
+
+        page = self.sync(cursor)
+        self.assertEqual(page['deleted'], entry_ids[:2])
+        self.assertTrue(page['has_more'])
+
+        _, deleted, cursor = self.drain(cursor)
+        self.assertEqual(deleted, entry_ids)
+        self.assertEqual(self.sync(cursor)['deleted'], [])
+
+    def test_expired_cursor_is_gone(self):
+        cursor = self.sync()['next_cursor']
+        with override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=-1):
+            response = self.client.get('/api/progress/sync/', {'since': cursor})
+
+        self.assertEqual(response.status_code, 410)
+
+
+class ExportCommandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        skill = Skill.objects.create(skill_name='Python', category='Programming')
+        for week_number in (1, 10):
+            WeeklyProgress.objects.create(
+                student=student, skill=skill, week_number=week_number, year=2026,
+                hours_spent=2, proficiency_level='beginner'
+            )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = Path(directory.name) / 'progress.parquet'
+
+    def export(self, *args):
+        call_command('export_progress', '--output', str(self.output), *args, stdout=StringIO())
+
+    def test_date_range_and_wide_student_ids(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            self.skipTest('pyarrow is not installed')
+
+        self.export('--from', '2026-03-01', '--to', '2026-03-31')
+        table = pyarrow.parquet.read_table(self.output)
+
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(table.column('week_number').to_pylist(), [10])
+        self.assertEqual(str(table.schema.field('student_id').type), 'int64')
+
+    def test_bad_date_is_a_command_error(self):
+        with self.assertRaises(CommandError):
+            self.export('--from', 'March')
+
+    def test_missing_pyarrow_is_a_command_error(self):
+        with mock.patch.dict('sys.modules', {'pyarrow': None}):
+            with self.assertRaises(CommandError):
+                self.export()
+
+        self.assertEqual(list(self.output.parent.iterdir()), [])
+
+    def test_export_replaces_the_file_only_once_written(self):
+        def write_export(queryset, sink, **kwargs):
+            sink.write(b'new export')
+            if fail:
+                raise ValueError('disk full')
+            return 2
+
+        self.output.write_bytes(b'previous export')
+        with mock.patch('progress.management.commands.export_progress.write_progress_export', write_export):
+            fail = True
+            with self.assertRaises(CommandError):
+                self.export()
+            self.assertEqual(self.output.read_bytes(), b'previous export')
+
+            fail = False
+            self.export()
+            self.assertEqual(self.output.read_bytes(), b'new export')
+
+        self.assertEqual(list(self.output.parent.iterdir()), [self.output])
+
+
+class ImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.red = Cohort.objects.create(name='Red')
+        cls.admin = User.objects.create_user('admin@example.com', 'Admin', 'pw', role='admin')
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw', cohort=cls.red)
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+
+    def upload(self, text, query=''):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        upload = SimpleUploadedFile('progress.csv', text.encode(), content_type='text/csv')
+        with mock.patch('progress.events.get_event_bus') as bus:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(f'/api/progress/import/{query}', {'file': upload}, format='multipart')
+        return response, bus.return_value.publish
+
+    def test_error_report_lists_failing_rows(self):
+        response, publish = self.upload(
+            'student_email,skill_name,year,week_number,proficiency_level,hours_spent\n'
+            'STUDENT@example.com,python,2026,3,Beginner,2.5\n'
+            'nobody@example.com,Python,2026,4,beginner,1\n'
+            'student@example.com,Python,2026,54,expert,-1\n'
+            'student@example.com,Python,2026.5,5,beginner,x\n',
+            query='?error_report=csv'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response['X-Import-Rows'], response['X-Import-Created'], response['X-Import-Failed']),
+                         ('4', '1', '3'))
+        report = list(csv.reader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(report[0][:2], ['row', 'errors'])
+        self.assertEqual([row[0] for row in report[1:]], ['3', '4', '5'])
+        self.assertEqual(report[1][1], 'student_email: No student with this email.')
+        self.assertEqual(report[2][1].split('; '), [
+            'proficiency_level: Not a valid choice.',
+            f'week_number: {WEEK_NUMBER_ERROR}',
+            f'hours_spent: {HOURS_NEGATIVE_ERROR}',
+        ])
+        self.assertEqual(report[3][1].split('; '), [
+            'year: A valid integer is required.', 'hours_spent: A valid number is required.'
+        ])
+
+        entry = WeeklyProgress.objects.get()
+        self.assertEqual((entry.week_number, entry.hours_spent, entry.cohort_id), (3, 2.5, self.red.id))
+        self.skill.refresh_from_db()
+        self.assertEqual((self.skill.total_hours, self.skill.practice_count), (2.5, 1))
+
+    def test_one_refresh_event_per_import(self):
+        response, publish = self.upload(
+            'student_email,skill_name,year,week_number,proficiency_level\n'
+            + ''.join(f'student@example.com,Python,2026,{week},beginner\n' for week in range(1, 6))
+        )
+
+        self.assertEqual(response.data['created'], 5)
+        publish.assert_called_once_with({
+            'type': 'progress.refresh',
+            'scope': {'student_ids': [self.student.id], 'cohort_ids': [self.red.id]},
+        })
+
+    def test_nothing_imported_publishes_nothing(self):
+        response, publish = self.upload('student_email,skill_name,year,week_number,proficiency_level\n')
+
+        self.assertEqual(response.data['rows'], 0)
+        publish.assert_not_called()
+
+
+class WeekStartTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+        # Mondays 2026-02-23, 2026-03-02 and 2026-03-09
+        for week_number in (9, 10, 11):
+            WeeklyProgress.objects.create(
+                student=cls.student, skill=cls.skill, week_number=week_number, year=2026,
+                hours_spent=1, proficiency_level='beginner'
+            )
+
+    def test_iso_week_start_matches_the_calendar(self):
+        for year, week_number in ((2026, 1), (2025, 1), (2020, 53), (2027, 52)):
+            self.assertEqual(iso_week_start(year, week_number), date.fromisocalendar(year, week_number, 1))
+
+    def test_week_53_of_a_52_week_year_rolls_over(self):
+        self.assertEqual(iso_week_start(2021, 53), date(2022, 1, 3))
+        self.assertEqual(iso_week_start(2021, 53), iso_week_start(2022, 1))
+
+    def weeks(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        response = client.get('/api/progress/', params)
+        return sorted(entry['week_number'] for entry in response.data['results'])
+
+    def test_date_range_keeps_overlapping_weeks(self):
+        # A Wednesday start still includes the week it falls in; a Sunday end the week before it
+        self.assertEqual(self.weeks(**{'from': '2026-03-04'}), [10, 11])
+        self.assertEqual(self.weeks(to='2026-03-08'), [9, 10])
+        self.assertEqual(self.weeks(**{'from': '2026-03-02', 'to': '2026-03-02'}), [10])
+
+    def test_bad_date_is_a_400(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        response = client.get('/api/progress/', {'from': '03/04/2026'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('from', response.data)
+
+
+class WeekStartMigrationTests(TransactionTestCase):
+    def setUp(self):
+        # Every other app stays at its latest migration
+        others = [node for node in MigrationExecutor(connection).loader.graph.leaf_nodes() if node[0] != 'progress']
+        self.before = [('progress', '0008_idempotency_keys'), *others]
+        self.after = [('progress', '0009_week_start'), *others]
+
+    def tearDown(self):
+        # Leave the schema fully migrated for the tests that follow
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill_sets_week_start_on_existing_rows(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        old_apps = executor.loader.project_state(self.before).apps
+        student = old_apps.get_model('users', 'User').objects.create(
+            email='student@example.com', name='Student', password='!'
+        )
+        skill = old_apps.get_model('skills', 'Skill').objects.create(skill_name='Python', category='Programming')
+        OldProgress = old_apps.get_model('progress', 'WeeklyProgress')
+        for year, week_number in ((2020, 53), (2026, 10)):
+            OldProgress.objects.create(
+                student_id=student.id, skill_id=skill.id, year=year, week_number=week_number,
+                hours_spent=1, proficiency_level='beginner'
+            )
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.after)
+        new_apps = executor.loader.project_state(self.after).apps
+        rows = new_apps.get_model('progress', 'WeeklyProgress').objects.order_by('year')
+
+        self.assertEqual(list(rows.values_list('week_start', flat=True)), [date(2020, 12, 28), date(2026, 3, 2)])
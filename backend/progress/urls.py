@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import WeeklyProgressViewSet
+from .views import WeeklyProgressViewSet, BulkDeletionJobViewSet
 
 router = DefaultRouter()
+# Registered before the '' prefix so 'deletion-jobs/' isn't captured as a progress pk
+router.register(r'deletion-jobs', BulkDeletionJobViewSet, basename='deletion-job')
 router.register(r'', WeeklyProgressViewSet, basename='progress')
 
 urlpatterns = [
@@ -2,55 +2,66 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+import codecs
+import io
+import tempfile
+from datetime import date
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
 from django.db.models import Count, Sum, Avg
-from .models import WeeklyProgress
-from .serializers import WeeklyProgressSerializer, WeeklyProgressCreateSerializer
+from django.http import FileResponse
+from weekly_tracker.db_router import replica_reads, pin_to_primary
+from weekly_tracker.renderers import ColumnarJSONRenderer
+from .models import WeeklyProgress, ArchivedWeeklyProgress, BulkDeletionJob
+from .serializers import (
+    WeeklyProgressSerializer,
+    WeeklyProgressCreateSerializer,
+    ArchivedWeeklyProgressSerializer,
+    BulkDeletionJobSerializer,
+)
+from users.cohorts import scope_to_cohort
+from .filters import filter_progress_queryset
+from .exports import EXPORT_FORMATS, write_progress_export
+from .sync import CursorExpired, DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT, progress_changes
+from .idempotency import idempotent
+from .imports import CSVImportError, import_progress_csv
+from .sketches import PERCENTILE_QUANTILES, skill_week_digest, week_digest
 
 class WeeklyProgressViewSet(viewsets.ModelViewSet):
     serializer_class = WeeklyProgressSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [ColumnarJSONRenderer]
     
     def get_queryset(self):
-        user = self.request.user
         queryset = WeeklyProgress.objects.select_related('student', 'skill')
-        
-        if user.role == 'admin':
-            student_id = self.request.query_params.get('student_id', None)
-            if student_id:
-                queryset = queryset.filter(student_id=student_id)
-        else:
-            queryset = queryset.filter(student=user)
-        
-        skill_id = self.request.query_params.get('skill_id', None)
-        if skill_id:
-            queryset = queryset.filter(skill_id=skill_id)
-        
-        week_number = self.request.query_params.get('week_number', None)
-        if week_number:
-            queryset = queryset.filter(week_number=week_number)
-        
-        year = self.request.query_params.get('year', None)
-        if year:
-            queryset = queryset.filter(year=year)
-        
-        return queryset
+        return filter_progress_queryset(queryset, self.request.user, self.request.query_params)
     
     def get_serializer_class(self):
         if self.action == 'create':
             return WeeklyProgressCreateSerializer
         return WeeklyProgressSerializer
     
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        progress = serializer.save(student=request.user)
+        try:
+            with transaction.atomic():
+                progress = serializer.save(student=request.user)
+        except IntegrityError:
+            return Response({
+                'error': 'You already logged progress for this skill and week'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        pin_to_primary(request.user)
         
         return Response(
             WeeklyProgressSerializer(progress).data,
             status=status.HTTP_201_CREATED
         )
     
+    @idempotent
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         
@@ -71,24 +82,61 @@ class WeeklyProgressViewSet(viewsets.ModelViewSet):
         
         return super().destroy(request, *args, **kwargs)
     
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        pin_to_primary(self.request.user)
+    
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        pin_to_primary(self.request.user)
+    
     @action(detail=False, methods=['get'])
     def my_progress(self, request):
-        queryset = WeeklyProgress.objects.filter(student=request.user).select_related('skill')
+        queryset = WeeklyProgress.objects.filter(student=request.user).select_related('skill', 'student')
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """Entries changed since ?since=<cursor> plus ids deleted since then"""
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_SYNC_LIMIT)), MAX_SYNC_LIMIT)
+        except ValueError:
+            limit = DEFAULT_SYNC_LIMIT
+        
+        try:
+            result = progress_changes(request.user, request.query_params.get('since'), max(limit, 1))
+        except CursorExpired:
+            return Response({
+                'error': 'Sync cursor has expired, fetch without since to resync'
+            }, status=status.HTTP_410_GONE)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'entries': WeeklyProgressSerializer(result['entries'], many=True).data,
+            'deleted': result['deleted'],
+            'next_cursor': result['next_cursor'],
+            'has_more': result['has_more'],
+        })
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
     def statistics(self, request):
         user = request.user
         
+        # Archived years are only scanned when explicitly requested
+        model = ArchivedWeeklyProgress if request.query_params.get('source') == 'archive' else WeeklyProgress
+        
         if user.role == 'admin':
             student_id = request.query_params.get('student_id', None)
             if student_id:
-                queryset = WeeklyProgress.objects.filter(student_id=student_id)
+                queryset = model.objects.filter(student_id=student_id)
             else:
-                queryset = WeeklyProgress.objects.all()
+                queryset = model.objects.all()
+            queryset = scope_to_cohort(queryset, user, 'cohort' if model is WeeklyProgress else 'student__cohort')
         else:
-            queryset = WeeklyProgress.objects.filter(student=user)
+            queryset = model.objects.filter(student=user)
         
         total_entries = queryset.count()
         total_hours = queryset.aggregate(Sum('hours_spent'))['hours_spent__sum'] or 0
@@ -110,3 +158,152 @@ class WeeklyProgressViewSet(viewsets.ModelViewSet):
             'proficiency_distribution': list(proficiency_distribution),
             'top_skills': list(skills_practiced)
         })
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def percentile(self, request):
+        """Where `hours` (or your own entry) ranks among a week's entries, per skill or overall"""
+        current_year, current_week, _ = date.today().isocalendar()
+        try:
+            year = int(request.query_params.get('year', current_year))
+            week_number = int(request.query_params.get('week_number', current_week))
+            skill_id = request.query_params.get('skill_id')
+            skill_id = int(skill_id) if skill_id else None
+            hours = request.query_params.get('hours')
+            hours = float(hours) if hours is not None else None
+        except ValueError:
+            return Response({
+                'error': 'year, week_number, skill_id and hours must be numbers'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if hours is None and skill_id is not None:
+            # Default to the caller's own entry for that skill and week
+            hours = WeeklyProgress.objects.filter(
+                student=request.user, skill_id=skill_id, year=year, week_number=week_number
+            ).values_list('hours_spent', flat=True).first()
+        
+        digest = skill_week_digest(skill_id, year, week_number) if skill_id else week_digest(year, week_number)
+        cdf = digest.cdf(hours) if hours is not None else None
+        
+        return Response({
+            'year': year,
+            'week_number': week_number,
+            'skill_id': skill_id,
+            'count': digest.count,
+            'hours': hours,
+            'percentile': round(cdf * 100, 1) if cdf is not None else None,
+            'quantiles': {
+                f'p{int(q * 100)}': round(value, 2) if value is not None else None
+                for q in PERCENTILE_QUANTILES
+                for value in [digest.quantile(q)]
+            }
+        })
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def archive(self, request):
+        """List archived progress from past academic years (same filters as the list)"""
+        queryset = filter_progress_queryset(
+            ArchivedWeeklyProgress.objects.select_related('student', 'skill'),
+            request.user,
+            request.query_params
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = ArchivedWeeklyProgressSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = ArchivedWeeklyProgressSerializer(queryset, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def export(self, request):
+        """Download filtered progress as a Parquet or Arrow file for analytics"""
+        file_format = request.query_params.get('file_format', 'parquet')
+        if file_format not in EXPORT_FORMATS:
+            return Response({
+                'error': f"file_format must be one of: {', '.join(EXPORT_FORMATS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = filter_progress_queryset(WeeklyProgress.objects.all(), request.user, request.query_params)
+        
+        # Spooled to disk so large exports never sit fully in worker memory
+        output = tempfile.TemporaryFile()
+        try:
+            write_progress_export(queryset, output, file_format=file_format)
+        except ImproperlyConfigured as e:
+            output.close()
+            return Response({'error': str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        output.seek(0)
+        
+        content_type, extension = EXPORT_FORMATS[file_format]
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=f'weekly-progress.{extension}',
+            content_type=content_type
+        )
+    
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_csv(self, request):
+        """
+        Upsert progress from an uploaded CSV (Admin only).
+        
+        Returns a JSON summary, or with `?error_report=csv` the failing rows as a CSV download.
+        """
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Only admins can import progress'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Upload the CSV as the "file" field'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Failing rows are spooled to disk rather than held in memory
+        report = io.TextIOWrapper(tempfile.TemporaryFile(), encoding='utf-8', newline='')
+        try:
+            summary = import_progress_csv(codecs.iterdecode(upload, 'utf-8-sig'), request.user, report)
+        except (CSVImportError, UnicodeDecodeError) as e:
+            report.close()
+            return Response({'error': f'Could not import the file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        pin_to_primary(request.user)
+        
+        if request.query_params.get('error_report') != 'csv':
+            report.close()
+            return Response(summary)
+        
+        # FileResponse streams bytes, so hand it the underlying binary file
+        report.flush()
+        output = report.detach()
+        output.seek(0)
+        response = FileResponse(
+            output,
+            as_attachment=True,
+            filename='progress-import-errors.csv',
+            content_type='text/csv'
+        )
+        for field in ('rows', 'created', 'updated', 'failed'):
+            response[f'X-Import-{field.title()}'] = str(summary[field])
+        return response
+
+
+class BulkDeletionJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status of background skill/user deletions (admin only)"""
+    queryset = BulkDeletionJob.objects.all()
+    serializer_class = BulkDeletionJobSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def list(self, request, *args, **kwargs):
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Only admins can view deletion jobs'
+            }, status=status.HTTP_403_FORBIDDEN)
+        return super().list(request, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Only admins can view deletion jobs'
+            }, status=status.HTTP_403_FORBIDDEN)
+        return super().retrieve(request, *args, **kwargs)
@@ -1,11 +1,14 @@
 from django.contrib import admin
+from weekly_tracker.paginators import ScalableAdminMixin
+from progress.admin import BulkDeleteAdminMixin
 from .models import Skill
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(BulkDeleteAdminMixin, ScalableAdminMixin, admin.ModelAdmin):
+    bulk_delete_field = 'skill_id'
     list_display = ['skill_name', 'category', 'created_at']
     list_filter = ['category', 'created_at']
-    search_fields = ['skill_name', 'category', 'description']
+    search_fields = ['^skill_name', '^category']
     ordering = ['category', 'skill_name']
     
     fieldsets = (
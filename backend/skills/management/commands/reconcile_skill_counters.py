@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from progress.counters import reconcile_skill_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute skill hour/practice counters from weekly_progress and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        drifted = reconcile_skill_counters(apply=not options['check'])
+
+        for skill in drifted:
+            self.stdout.write(
+                f'  {skill.skill_name}: {skill.total_hours:.1f} h, {skill.practice_count} entries, '
+                f"latest '{skill.latest_proficiency}'"
+            )
+
+        if options['check']:
+            self.stdout.write(f'{len(drifted)} skills have drifted counters')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {len(drifted)} skills'))
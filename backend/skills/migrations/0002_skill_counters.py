@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:39
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def backfill_skill_counters(apps, schema_editor):
+    Skill = apps.get_model("skills", "Skill")
+    WeeklyProgress = apps.get_model("progress", "WeeklyProgress")
+
+    totals = (
+        WeeklyProgress.objects.order_by()
+        .values("skill_id")
+        .annotate(
+            total_hours=Sum("hours_spent"),
+            practice_count=Count("id"),
+            last_practiced_at=Max("created_at"),
+        )
+    )
+    for row in totals:
+        latest = (
+            WeeklyProgress.objects.filter(skill_id=row["skill_id"])
+            .order_by("-created_at")
+            .values_list("proficiency_level", flat=True)
+            .first()
+        )
+        Skill.objects.filter(pk=row["skill_id"]).update(
+            total_hours=row["total_hours"] or 0.0,
+            practice_count=row["practice_count"],
+            latest_proficiency=latest or "",
+            last_practiced_at=row["last_practiced_at"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("skills", "0001_initial"),
+        ("progress", "0003_weekly_progress_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="skill",
+            name="last_practiced_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="skill",
+            name="latest_proficiency",
+            field=models.CharField(blank=True, default="", max_length=20),
+        ),
+        migrations.AddField(
+            model_name="skill",
+            name="practice_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="skill",
+            name="total_hours",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(fields=["-total_hours"], name="skills_total_hours_idx"),
+        ),
+        migrations.RunPython(backfill_skill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:41
+
+from django.db import migrations, models
+
+
+# The admin's ^prefix search compiles to UPPER(col::text) LIKE UPPER('x%') on
+# Postgres, which only an expression index with text_pattern_ops can serve.
+def create_prefix_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS skills_skill_name_upper_prefix "
+        "ON skills (UPPER(skill_name::text) text_pattern_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS skills_category_upper_prefix "
+        "ON skills (UPPER(category::text) text_pattern_ops)"
+    )
+
+
+def drop_prefix_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS skills_skill_name_upper_prefix")
+    schema_editor.execute("DROP INDEX IF EXISTS skills_category_upper_prefix")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("skills", "0002_skill_counters"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="skill",
+            name="skill_name",
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.RunPython(create_prefix_search_indexes, drop_prefix_search_indexes),
+    ]
@@ -3,14 +3,23 @@ from django.utils import timezone
 
 class Skill(models.Model):
     id = models.BigAutoField(primary_key=True)
-    skill_name = models.CharField(max_length=255)
+    skill_name = models.CharField(max_length=255, db_index=True)
     category = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now)
     
+    # Rollups of weekly_progress, maintained by progress/counters.py
+    total_hours = models.FloatField(default=0.0)
+    practice_count = models.IntegerField(default=0)
+    latest_proficiency = models.CharField(max_length=20, blank=True, default='')
+    last_practiced_at = models.DateTimeField(blank=True, null=True)
+    
     class Meta:
         db_table = 'skills'
         ordering = ['category', 'skill_name']
+        indexes = [
+            models.Index(fields=['-total_hours'], name='skills_total_hours_idx'),
+        ]
     
     def __str__(self):
         return f"{self.skill_name} ({self.category})"
@@ -1,3 +1,69 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from progress.models import WeeklyProgress
+from users.models import User
+from .models import Skill
+
+
+class SkillCounterTests(TestCase):
+    """total_hours, practice_count and latest_proficiency follow every progress write"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        cls.python = Skill.objects.create(skill_name='Python', category='Programming')
+        cls.git = Skill.objects.create(skill_name='Git', category='Tools')
+
+    def log(self, skill, week_number, hours, level='beginner'):
+        return WeeklyProgress.objects.create(
+            student=self.student, skill=skill, week_number=week_number, year=2026,
+            hours_spent=hours, proficiency_level=level
+        )
+
+    def counters(self, skill):
+        skill.refresh_from_db()
+        return skill.total_hours, skill.practice_count, skill.latest_proficiency
+
+    def test_create_and_update_move_counters_by_delta(self):
+        entry = self.log(self.python, 1, 3)
+        self.log(self.python, 2, 2, 'intermediate')
+        self.assertEqual(self.counters(self.python), (5, 2, 'intermediate'))
+
+        entry.hours_spent = 7
+        entry.save()
+
+        self.assertEqual(self.counters(self.python), (9, 2, 'intermediate'))
+
+    def test_delete_removes_the_entry(self):
+        self.log(self.python, 1, 3)
+        latest = self.log(self.python, 2, 2, 'advanced')
+
+        latest.delete()
+
+        self.assertEqual(self.counters(self.python), (3, 1, 'beginner'))
+
+    def test_moving_an_entry_between_skills(self):
+        self.log(self.python, 1, 3)
+        moved = self.log(self.python, 2, 4, 'intermediate')
+
+        moved.skill = self.git
+        moved.hours_spent = 5
+        moved.save()
+
+        self.assertEqual(self.counters(self.python), (3, 1, 'beginner'))
+        self.assertEqual(self.counters(self.git), (5, 1, 'intermediate'))
+
+    def test_reconcile_check_reports_without_repairing(self):
+        self.log(self.python, 1, 3)
+        Skill.objects.filter(pk=self.python.pk).update(total_hours=99, practice_count=7)
+
+        output = StringIO()
+        call_command('reconcile_skill_counters', '--check', stdout=output)
+        self.assertIn('1 skills have drifted counters', output.getvalue())
+        self.assertIn('Python: 3.0 h, 1 entries', output.getvalue())
+        self.assertEqual(self.counters(self.python)[:2], (99, 7))
 
-# Create your tests here.
+        call_command('reconcile_skill_counters', stdout=StringIO())
+        self.assertEqual(self.counters(self.python), (3, 1, 'beginner'))
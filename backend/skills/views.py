@@ -2,8 +2,17 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.core.exceptions import ImproperlyConfigured
+from django.shortcuts import get_object_or_404
 from .models import Skill
 from .serializers import SkillSerializer
+from progress.bulk_delete import bulk_delete_skill, start_deletion_job
+from progress.progression import DEFAULT_STALL_WEEKS, skill_progression, stalled_learners
+from progress.recommendations import DEFAULT_RECOMMENDATIONS, MAX_RECOMMENDATIONS, recommend_skills
+from progress.serializers import BulkDeletionJobSerializer
+from users.cohorts import scope_to_cohort
+from users.models import User
+from weekly_tracker.db_router import pin_to_primary, replica_reads
 
 class SkillViewSet(viewsets.ModelViewSet):
     queryset = Skill.objects.all()
@@ -34,9 +43,72 @@ class SkillViewSet(viewsets.ModelViewSet):
             return Response({
                 'error': 'Only admins can delete skills'
             }, status=status.HTTP_403_FORBIDDEN)
-        return super().destroy(request, *args, **kwargs)
+        
+        skill = self.get_object()
+        # Dependents are removed with batched set-based deletes, not the ORM collector
+        if request.query_params.get('background') in ('1', 'true'):
+            job = start_deletion_job(skill, requested_by=request.user)
+            pin_to_primary(request.user)
+            return Response(BulkDeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+        
+        bulk_delete_skill(skill)
+        pin_to_primary(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
     
     @action(detail=False, methods=['get'])
     def categories(self, request):
         categories = Skill.objects.values_list('category', flat=True).distinct()
         return Response({'categories': list(categories)})
+    
+    @action(detail=False, methods=['get'])
+    def recommendations(self, request):
+        """Skills to learn next, from what students with similar history practiced"""
+        student = request.user
+        student_id = request.query_params.get('student_id')
+        if student_id:
+            if request.user.role != 'admin':
+                return Response({
+                    'error': 'Only admins can view other students\' recommendations'
+                }, status=status.HTTP_403_FORBIDDEN)
+            student = get_object_or_404(scope_to_cohort(User.objects.all(), request.user), pk=student_id)
+        
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_RECOMMENDATIONS)), MAX_RECOMMENDATIONS)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            return Response(recommend_skills(student, limit=max(limit, 1)))
+        except ImproperlyConfigured as e:
+            return Response({'error': str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    
+    @action(detail=True, methods=['get'])
+    @replica_reads
+    def progression(self, request, pk=None):
+        """How students move through proficiency levels in this skill (Admin only)"""
+        if request.user.role != 'admin':
+            return Response({
+                'error': 'Only admins can view progression analytics'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        skill = self.get_object()
+        try:
+            stall_weeks = int(request.query_params.get('stall_weeks', DEFAULT_STALL_WEEKS))
+        except ValueError:
+            return Response({'error': 'stall_weeks must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            progression = skill_progression(skill.id, request.user)
+        except ImproperlyConfigured as e:
+            return Response({'error': str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        
+        return Response({
+            'skill_id': skill.id,
+            'skill_name': skill.skill_name,
+            'levels': progression['levels'],
+            'students': progression['students'],
+            'entries': progression['entries'],
+            'transitions': progression['transitions'],
+            'time_to_level': progression['time_to_level'],
+            'stalled_learners': stalled_learners(progression, stall_weeks, request.user),
+        })
@@ -1,17 +1,27 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from weekly_tracker.paginators import ScalableAdminMixin
+from progress.admin import BulkDeleteAdminMixin
+from .models import Cohort, User
+
+@admin.register(Cohort)
+class CohortAdmin(admin.ModelAdmin):
+    list_display = ['name', 'created_at']
+    search_fields = ['^name']
+    readonly_fields = ['created_at']
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
-    list_display = ['email', 'name', 'role', 'is_active', 'created_at']
-    list_filter = ['role', 'is_active', 'created_at']
-    search_fields = ['email', 'name']
+class UserAdmin(BulkDeleteAdminMixin, ScalableAdminMixin, BaseUserAdmin):
+    bulk_delete_field = 'student_id'
+    list_display = ['email', 'name', 'role', 'cohort', 'is_active', 'created_at']
+    list_filter = ['role', 'cohort', 'is_active', 'created_at']
+    list_select_related = ['cohort']
+    search_fields = ['^email', '^name']
     ordering = ['-created_at']
     
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
-        ('Personal Info', {'fields': ('name', 'role')}),
+        ('Personal Info', {'fields': ('name', 'role', 'cohort')}),
         ('Permissions', {'fields': ('is_active', 'is_staff', 'is_superuser')}),
         ('Important dates', {'fields': ('created_at', 'updated_at')}),
     )
@@ -21,6 +31,6 @@ class UserAdmin(BaseUserAdmin):
     add_fieldsets = (
         (None, {
             'classes': ('wide',),
-            'fields': ('email', 'name', 'role', 'password1', 'password2'),
+            'fields': ('email', 'name', 'role', 'cohort', 'password1', 'password2'),
         }),
     )
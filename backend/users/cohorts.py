@@ -0,0 +1,10 @@
+def scope_to_cohort(queryset, user, field='cohort'):
+    """
+    Limit an admin's queryset to their cohort.
+
+    Admins without a cohort (and ``user=None``, used by trusted callers)
+    keep the unrestricted scope.
+    """
+    if user is None or user.cohort_id is None:
+        return queryset
+    return queryset.filter(**{field: user.cohort_id})
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:41
+
+from django.db import migrations, models
+
+
+# The admin's ^prefix search compiles to UPPER(col::text) LIKE UPPER('x%') on
+# Postgres, which only an expression index with text_pattern_ops can serve.
+def create_prefix_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS users_email_upper_prefix "
+        "ON users (UPPER(email::text) text_pattern_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS users_name_upper_prefix "
+        "ON users (UPPER(name::text) text_pattern_ops)"
+    )
+
+
+def drop_prefix_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS users_email_upper_prefix")
+    schema_editor.execute("DROP INDEX IF EXISTS users_name_upper_prefix")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_user_options_user_email_verification_sent_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="name",
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.RunPython(create_prefix_search_indexes, drop_prefix_search_indexes),
+    ]
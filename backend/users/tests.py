@@ -1,3 +1,62 @@
-from django.test import TestCase
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from weekly_tracker import throttling
+from .models import User
 
-# Create your tests here.
+# Hourly rates, so buckets don't refill between the requests of a test
+SLOW_RATES = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'auth_ip': '6/hour', 'auth_email': '3/hour'}}
+
+
+@override_settings(REST_FRAMEWORK=SLOW_RATES)
+class AuthThrottleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student@example.com', 'Student', 'pw')
+
+    def setUp(self):
+        throttling._local_store._buckets.clear()
+        self.client = APIClient()
+
+    def login(self, email='student@example.com', ip='10.0.0.1'):
+        return self.client.post('/api/auth/login/', {'email': email, 'password': 'wrong'}, REMOTE_ADDR=ip)
+
+    def test_repeated_guesses_for_one_account_get_429(self):
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, 401)
+
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_guesses_spread_across_ips_share_the_account_bucket(self):
+        for number in range(3):
+            self.assertEqual(self.login(ip=f'10.0.1.{number}').status_code, 401)
+
+        self.assertEqual(self.login(ip='10.0.2.1').status_code, 429)
+        self.assertEqual(self.login(email='other@example.com', ip='10.0.2.1').status_code, 401)
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'auth_ip': '100/min', 'auth_email': '10/min'}
+    })
+    def test_exhausted_account_is_slowed_down_not_locked_out(self):
+        for number in range(10):
+            self.login(ip=f'10.0.1.{number}')
+
+        response = self.login(ip='10.0.2.1')
+        self.assertEqual(response.status_code, 429)
+        # The next token is at most one refill interval (6 s) away
+        self.assertLessEqual(int(response['Retry-After']), 6)
+
+    def test_one_ip_spraying_accounts_gets_429(self):
+        for number in range(6):
+            self.assertEqual(self.login(email=f'user{number}@example.com').status_code, 401)
+
+        self.assertEqual(self.login(email='another@example.com').status_code, 429)
+
+    @override_settings(THROTTLE_BUCKET_BACKEND='cache')
+    def test_cache_buckets_need_a_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.login()
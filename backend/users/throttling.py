@@ -0,0 +1,29 @@
+from weekly_tracker.throttling import TokenBucketThrottle
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """Password-hashing endpoints, per client IP"""
+    scope = 'auth_ip'
+
+    def get_bucket_key(self, request, view):
+        return self.get_ident(request)
+
+
+class AuthEmailThrottle(TokenBucketThrottle):
+    """
+    Password-hashing endpoints, per target account from any number of IPs.
+
+    Its rate is looser than the IP bucket's and refills continuously, so
+    someone hammering a victim's email slows their logins down to the
+    refill rate (Retry-After of a few seconds) rather than locking them out.
+    """
+    scope = 'auth_email'
+
+    def get_bucket_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.email.lower()
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+AUTH_THROTTLES = [AuthIPThrottle, AuthEmailThrottle]
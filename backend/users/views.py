@@ -5,6 +5,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from .models import User
 from .serializers import UserSerializer, UserRegistrationSerializer, ChangePasswordSerializer
+from .throttling import AUTH_THROTTLES
 
 
 class RegisterView(generics.CreateAPIView):
@@ -12,6 +13,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = AUTH_THROTTLES
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -34,6 +36,7 @@ class RegisterView(generics.CreateAPIView):
 class LoginView(APIView):
     """User login endpoint"""
     permission_classes = [permissions.AllowAny]
+    throttle_classes = AUTH_THROTTLES
 
     def post(self, request):
         email = request.data.get('email')
@@ -89,6 +92,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 class ChangePasswordView(APIView):
     """Change user password"""
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = AUTH_THROTTLES
 
     def post(self, request):
         serializer = ChangePasswordSerializer(data=request.data, context={'request': request})
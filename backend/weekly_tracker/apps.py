@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class WeeklyTrackerConfig(AppConfig):
+    name = 'weekly_tracker'
+
+    def ready(self):
+        # Per-engine connection tuning (SQLite pragmas)
+        from . import db_tuning  # noqa: F401
@@ -0,0 +1,19 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends whose entries no other worker process can see
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(alias='default'):
+    return not isinstance(caches[alias], PROCESS_LOCAL_CACHES)
+
+
+def require_shared_cache(feature, alias='default'):
+    """Refuse to run `feature` on a cache each gunicorn worker holds on its own"""
+    if not is_shared_cache(alias):
+        raise ImproperlyConfigured(
+            f'{feature} needs a cache shared by every worker; set CACHE_URL (see .env.example)'
+        )
@@ -0,0 +1,101 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from .caches import require_shared_cache
+
+# The replica alias chosen for the current block, or None for the primary
+_replica_alias = ContextVar('replica_alias', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica_')]
+
+
+def _sticky_key(user):
+    return f'replica-sticky:{user.pk}'
+
+
+def pin_to_primary(user):
+    """
+    Keep the user's reads on the primary until replicas catch up with their write.
+
+    The pin lives in the cache, so whichever worker serves the user's next
+    read must see it: replicas need a shared cache (CACHE_URL).
+    """
+    if replica_aliases() and user.is_authenticated:
+        require_shared_cache('Read replica stickiness')
+        cache.set(_sticky_key(user), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    if not replica_aliases() or not user.is_authenticated:
+        return False
+    require_shared_cache('Read replica stickiness')
+    return cache.get(_sticky_key(user)) is not None
+
+
+def choose_replica(user=None):
+    """
+    The replica alias for a block of reads, or None to stay on the primary.
+
+    Checks the user's pin in the cache, so async code calls it through
+    sync_to_async and passes the result to `use_replica`.
+    """
+    aliases = replica_aliases()
+    if not aliases or (user is not None and is_pinned_to_primary(user)):
+        return None
+    return random.choice(aliases)
+
+
+@contextmanager
+def use_replica(alias):
+    """Route every read inside the block to `alias` (None keeps them on the primary)"""
+    token = _replica_alias.set(alias)
+    try:
+        yield
+    finally:
+        _replica_alias.reset(token)
+
+
+@contextmanager
+def read_from_replica(user=None):
+    """
+    Route reads inside the block to one replica, unless the user just wrote.
+
+    The replica is picked once, so the queries behind one response all see
+    the same point of replication lag.
+    """
+    with use_replica(choose_replica(user)):
+        yield
+
+
+def replica_reads(view_method):
+    """Decorator for read-only analytics view methods"""
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        with read_from_replica(request.user):
+            return view_method(self, request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Send reads to a replica only inside `read_from_replica` blocks.
+
+    Everything else, including all writes, stays on `default` so ordinary
+    CRUD keeps read-after-write consistency.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data, so objects may relate across aliases
+        return True
@@ -0,0 +1,23 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    """Apply the SQLITE_PRAGMAS profile to each new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+
+    from django.conf import settings
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    # In-memory test databases cannot use WAL
+    if connection.is_in_memory_db():
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, pragmas)
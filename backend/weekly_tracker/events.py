@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Events a slow subscriber may fall behind by before it is told to resync
+MAX_PENDING_EVENTS = 100
+
+
+class Subscription:
+    """One listener's queue, bound to the event loop it was created on"""
+
+    def __init__(self, accepts, max_pending=MAX_PENDING_EVENTS):
+        self.accepts = accepts
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_pending)
+        self.overflowed = False
+
+    def offer(self, event):
+        # Runs on the subscription's loop
+        if self.queue.full():
+            self.overflowed = True
+        else:
+            self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Next event, or None after `timeout` seconds without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalEventBus:
+    """
+    In-process pub/sub: events published in this process reach its subscribers.
+
+    `publish` may be called from any thread (request threads, sync_to_async
+    workers); each event is handed to a subscriber's own event loop.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, accepts=lambda event: True):
+        subscription = Subscription(accepts)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        self.deliver(event)
+
+    def deliver(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.accepts(event):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.offer, event)
+                except RuntimeError:
+                    # Its loop has shut down
+                    self.unsubscribe(subscription)
+
+
+class PostgresEventBus(LocalEventBus):
+    """
+    Cross-worker pub/sub over PostgreSQL LISTEN/NOTIFY on the default database.
+
+    Publishing sends a NOTIFY; every process with subscribers runs one
+    listener thread that feeds notifications (its own included) to them.
+    """
+    channel = 'dashboard_events'
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+        if connections['default'].vendor != 'postgresql':
+            raise ImproperlyConfigured("DASHBOARD_EVENTS_BACKEND='postgres' needs a PostgreSQL default database")
+
+    def publish(self, event):
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, json.dumps(event)])
+
+    def subscribe(self, accepts=lambda event: True):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='dashboard-events', daemon=True)
+                self._listener.start()
+        return super().subscribe(accepts)
+
+    def _listen(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        params = connections['default'].get_connection_params()
+        while True:
+            listener = None
+            try:
+                listener = psycopg2.connect(**params)
+                listener.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with listener.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+                while True:
+                    if select.select([listener], [], [], 60) == ([], [], []):
+                        continue
+                    listener.poll()
+                    while listener.notifies:
+                        self.deliver(json.loads(listener.notifies.pop(0).payload))
+            except psycopg2.Error:
+                logger.exception('Dashboard event listener lost its connection; reconnecting')
+                time.sleep(1)
+            finally:
+                if listener is not None:
+                    listener.close()
+
+
+EVENT_BUSES = {
+    'local': LocalEventBus,
+    'postgres': PostgresEventBus,
+}
+
+_event_bus = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    """The process-wide bus for DASHBOARD_EVENTS_BACKEND"""
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is None:
+            if settings.DASHBOARD_EVENTS_BACKEND not in EVENT_BUSES:
+                raise ImproperlyConfigured(
+                    f"DASHBOARD_EVENTS_BACKEND must be one of {', '.join(EVENT_BUSES)}"
+                )
+            _event_bus = EVENT_BUSES[settings.DASHBOARD_EVENTS_BACKEND]()
+    return _event_bus
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+
+@never_cache
+@require_GET
+def liveness(request):
+    """The process is up and serving; deliberately touches nothing else"""
+    return JsonResponse({'status': 'ok'})
+
+
+def _check_database(alias):
+    started = time.perf_counter()
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+    latency_ms = (time.perf_counter() - started) * 1000
+    return {
+        'ok': latency_ms <= settings.READINESS_MAX_DB_LATENCY_MS,
+        'latency_ms': round(latency_ms, 2),
+    }
+
+
+@never_cache
+@require_GET
+def readiness(request):
+    """Ready for traffic when every database answers within READINESS_MAX_DB_LATENCY_MS"""
+    databases = {alias: _check_database(alias) for alias in settings.DATABASES}
+    ready = all(result['ok'] for result in databases.values())
+    return JsonResponse(
+        {'status': 'ok' if ready else 'unavailable', 'databases': databases},
+        status=200 if ready else 503
+    )
@@ -0,0 +1,145 @@
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - MessagePack is only negotiated when installed
+    msgpack = None
+
+_drf_encoder = JSONEncoder()
+
+
+def _encode_default(obj):
+    """Types orjson/msgpack don't handle natively get DRF's own encoding (dates, Decimal, lazy text...)"""
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson when it is installed.
+
+    Output matches the stock renderer: datetimes, Decimals and lazy strings
+    are passed back to DRF's encoder so their formatting doesn't change.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            option |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=_encode_default, option=option)
+        # Same strict-javascript-subset escaping as the stdlib renderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson when it is installed"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Binary MessagePack responses for clients sending `Accept: application/msgpack`"""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Accept MessagePack request bodies (`Content-Type: application/msgpack`)"""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
+
+# Nested objects pulled out of each row into a deduplicated lookup table
+COLUMNAR_LOOKUPS = {
+    'skill_details': 'skills',
+    'student_details': 'students',
+}
+
+
+def _is_rows(value):
+    return isinstance(value, list) and bool(value) and all(isinstance(row, dict) for row in value)
+
+
+def rows_to_columns(rows):
+    """
+    Turn a list of dicts into one array per field.
+
+    Nested skill/student objects are replaced by lookup tables keyed by id;
+    rows keep referencing them through their `skill`/`student` columns.
+    """
+    fields = []
+    for row in rows:
+        for field in row:
+            if field not in fields:
+                fields.append(field)
+
+    columns = {}
+    lookups = {}
+    for field in fields:
+        lookup_name = COLUMNAR_LOOKUPS.get(field)
+        if lookup_name is None:
+            columns[field] = [row.get(field) for row in rows]
+            continue
+
+        table = lookups.setdefault(lookup_name, {})
+        for row in rows:
+            nested = row.get(field)
+            if nested and nested.get('id') is not None:
+                table.setdefault(str(nested['id']), nested)
+
+    return {'length': len(rows), 'columns': columns, **lookups}
+
+
+def columnarize(data):
+    """Apply rows_to_columns to a list payload, a paginated page or list-valued keys"""
+    if _is_rows(data):
+        return rows_to_columns(data)
+    if isinstance(data, dict):
+        return {key: rows_to_columns(value) if _is_rows(value) else value for key, value in data.items()}
+    return data
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """
+    Opt-in compact JSON (``?format=columnar``) for large list responses.
+
+    Keys are sent once per field instead of once per row, and repeated
+    nested skills/students are sent once.
+    """
+    media_type = 'application/vnd.weekly-tracker.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(columnarize(data), accepted_media_type, renderer_context)
@@ -1,6 +1,7 @@
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
+from importlib.util import find_spec
 
 
 # Build paths inside the project
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist',
     
     # Local apps
+    'weekly_tracker',
     'users',
     'skills',
     'progress',
@@ -71,10 +73,18 @@ TEMPLATES = [
 WSGI_APPLICATION = 'weekly_tracker.wsgi.application'
 
 
+# 'wsgi' or 'asgi', as served by gunicorn.conf.py
+SERVER_INTERFACE = config('SERVER_INTERFACE', default='wsgi')
+
 # Database Configuration
 # Default to SQLite for hassle-free local development.
 DB_ENGINE = config('DB_ENGINE', default='sqlite').lower()
 
+# Persistent connections suit long-lived WSGI threads. Under ASGI each async
+# request and each executor thread gets its own connection that nothing
+# recycles, so Django advises closing them per request there.
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=0 if SERVER_INTERFACE == 'asgi' else 60, cast=int)
+
 if DB_ENGINE == 'postgres':
     DATABASES = {
         'default': {
@@ -84,6 +94,11 @@ if DB_ENGINE == 'postgres':
             'PASSWORD': config('DB_PASSWORD', default='tracker_password123'),
             'HOST': config('DB_HOST', default='localhost'),
             'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_MAX_AGE > 0,
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
         }
     }
 elif DB_ENGINE == 'mysql':
@@ -95,9 +110,12 @@ elif DB_ENGINE == 'mysql':
             'PASSWORD': config('DB_PASSWORD', default='tracker_password123'),
             'HOST': config('DB_HOST', default='localhost'),
             'PORT': config('DB_PORT', default='3306'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_MAX_AGE > 0,
             'OPTIONS': {
                 'charset': 'utf8mb4',
                 'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
             },
         }
     }
@@ -109,6 +127,76 @@ else:
         }
     }
 
+# Applied to every new SQLite connection (see weekly_tracker/db_tuning.py).
+# WAL lets readers proceed while a writer commits; NORMAL sync is durable
+# across app crashes in WAL mode and avoids an fsync per transaction.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int),
+}
+
+# Cache shared by every worker: redis://host:6379/0, memcached host:port, or
+# 'database' for a table made by `createcachetable`. Unset, each process keeps
+# its own in-memory cache, which replica stickiness and shared throttle
+# buckets refuse to run on.
+CACHE_URL = config('CACHE_URL', default='')
+
+if not CACHE_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+elif CACHE_URL == 'database':
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'}}
+elif CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache', 'LOCATION': CACHE_URL}}
+
+# Optional read replicas for analytics endpoints: comma-separated replica
+# hosts (or SQLite file paths). Each becomes a `replica_<n>` alias sharing the
+# primary's credentials; writes always go to `default`.
+DB_REPLICAS = [replica.strip() for replica in config('DB_REPLICAS', default='').split(',') if replica.strip()]
+
+for index, replica in enumerate(DB_REPLICAS, 1):
+    replica_database = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if DB_ENGINE == 'sqlite':
+        replica_database['NAME'] = BASE_DIR / replica
+    else:
+        replica_database['HOST'] = replica
+    DATABASES[f'replica_{index}'] = replica_database
+
+if DB_REPLICAS:
+    DATABASE_ROUTERS = ['weekly_tracker.db_router.ReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write progress
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+
+# Progress from the last N academic years stays in `weekly_progress`;
+# older rows are moved to `weekly_progress_archive` by `archive_progress`.
+PROGRESS_HOT_YEARS = config('PROGRESS_HOT_YEARS', default=2, cast=int)
+
+# Sync cursors older than this are rejected and tombstones past it are pruned
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=90, cast=int)
+
+# Background skill/user deletions: 'thread' runs them in the requesting web
+# worker; 'command' leaves them to `manage.py run_deletion_jobs` (cron or a worker)
+DELETION_JOB_RUNNER = config('DELETION_JOB_RUNNER', default='thread')
+# A running deletion job without progress for this long is marked failed
+DELETION_JOB_STALE_SECONDS = config('DELETION_JOB_STALE_SECONDS', default=600, cast=int)
+
+# Responses stored for Idempotency-Key retries of progress writes are kept this long
+IDEMPOTENCY_KEY_TTL_HOURS = config('IDEMPOTENCY_KEY_TTL_HOURS', default=24, cast=int)
+
+# After progress changes, the cached skill similarity matrix is rebuilt at most this often
+RECOMMENDATION_REFRESH_SECONDS = config('RECOMMENDATION_REFRESH_SECONDS', default=300, cast=int)
+
+# A week's merged percentile sketch is cached this long (writes also invalidate it)
+SKETCH_CACHE_SECONDS = config('SKETCH_CACHE_SECONDS', default=300, cast=int)
+
+# Per-skill proficiency progression analytics are cached this long (writes also invalidate them)
+PROGRESSION_CACHE_SECONDS = config('PROGRESSION_CACHE_SECONDS', default=3600, cast=int)
+
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -158,12 +246,51 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'weekly_tracker.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'weekly_tracker.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'DATE_FORMAT': '%Y-%m-%d',
+    # Token-bucket throttles on the password-hashing auth endpoints (users/throttling.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': config('AUTH_THROTTLE_IP_RATE', default='20/min'),
+        'auth_email': config('AUTH_THROTTLE_EMAIL_RATE', default='10/min'),
+    },
 }
 
+# MessagePack is only negotiated when the optional msgpack package is installed
+if find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('weekly_tracker.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('weekly_tracker.renderers.MessagePackParser')
+
+
+
+
+# /health/ready/ reports 503 when a database round trip takes longer than this
+READINESS_MAX_DB_LATENCY_MS = config('READINESS_MAX_DB_LATENCY_MS', default=250, cast=int)
+
+
+# Where throttle token buckets live: 'local' (per process) or 'cache' (shared via CACHES)
+THROTTLE_BUCKET_BACKEND = config('THROTTLE_BUCKET_BACKEND', default='local')
+
+
+# Live dashboard events: 'local' (per process) or 'postgres' (LISTEN/NOTIFY across workers)
+DASHBOARD_EVENTS_BACKEND = config('DASHBOARD_EVENTS_BACKEND', default='local')
+# A comment is sent on idle streams this often so proxies keep them open
+SSE_KEEPALIVE_SECONDS = config('SSE_KEEPALIVE_SECONDS', default=15, cast=int)
+# Streams are closed after this long; browsers reconnect on their own
+SSE_STREAM_MAX_SECONDS = config('SSE_STREAM_MAX_SECONDS', default=300, cast=int)
+# Seconds a single-use stream ticket from /api/dashboard/events/ticket/ stays valid
+SSE_TICKET_SECONDS = config('SSE_TICKET_SECONDS', default=30, cast=int)
+
 
 # JWT Settings
 SIMPLE_JWT = {
@@ -203,4 +330,21 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
+]
+# Lets browser clients tell a replayed Idempotency-Key response from a fresh write
+CORS_EXPOSE_HEADERS = [
+    'idempotent-replayed',
 ]
+
+
+# Email (verification links and weekly digests); see .env.example
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+# Seconds before a stalled SMTP session fails the batch instead of hanging the digest run
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
@@ -0,0 +1,267 @@
+import json
+import tempfile
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError, connections
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from progress.models import WeeklyProgress
+from skills.models import Skill
+from users.models import User
+from . import renderers
+from .db_router import ReplicaRouter, is_pinned_to_primary, pin_to_primary, read_from_replica
+
+SHARED_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_cache'}}
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(DATABASE_ROUTERS=['weekly_tracker.db_router.ReplicaRouter'], CACHES=SHARED_CACHE)
+class ReplicaRouterTests(TestCase):
+    """
+    The test database is the primary; a second SQLite file plays a replica
+    that hasn't caught up, so every read shows which database served it.
+    """
+    # replica_1 only exists once setUpClass has registered it
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        connections.settings['replica_1'] = connections.configure_settings({
+            'default': connections.settings['default'],
+            'replica_1': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': Path(cls.directory.name) / 'replica.sqlite3'},
+        })['replica_1']
+        with connections['replica_1'].schema_editor() as editor:
+            for model in apps.get_models():
+                if model._meta.managed and not model._meta.proxy:
+                    editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica_1'].close()
+        del connections['replica_1']
+        del connections.settings['replica_1']
+        cls.directory.cleanup()
+
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+        self.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        Skill.objects.create(skill_name='Written to the primary', category='Testing')
+
+    def replica_has_write(self):
+        with read_from_replica(self.student):
+            return Skill.objects.filter(skill_name='Written to the primary').exists()
+
+    def test_reads_go_to_replica(self):
+        self.assertFalse(self.replica_has_write())
+        self.assertTrue(Skill.objects.filter(skill_name='Written to the primary').exists())
+
+    def test_pinned_user_reads_from_primary(self):
+        pin_to_primary(self.student)
+
+        self.assertTrue(is_pinned_to_primary(self.student))
+        self.assertTrue(self.replica_has_write())
+
+    def test_pin_is_visible_to_other_workers(self):
+        pin_to_primary(self.student)
+        # Another worker has an empty in-process state and only the shared cache in common
+        with override_settings(CACHES=SHARED_CACHE):
+            self.assertTrue(is_pinned_to_primary(User.objects.get(pk=self.student.pk)))
+
+    def test_process_local_cache_is_refused(self):
+        with override_settings(CACHES=LOCAL_CACHE):
+            with self.assertRaises(ImproperlyConfigured):
+                pin_to_primary(self.student)
+
+    def test_one_replica_serves_the_whole_block(self):
+        router = ReplicaRouter()
+        with mock.patch('weekly_tracker.db_router.replica_aliases', return_value=['replica_1', 'replica_2']):
+            for _ in range(10):
+                with read_from_replica(self.student):
+                    self.assertEqual(len({router.db_for_read(Skill) for _ in range(20)}), 1)
+
+    def test_import_and_skill_delete_pin_the_admin(self):
+        admin = User.objects.create_user('admin@example.com', 'Admin', 'pw', role='admin')
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        upload = SimpleUploadedFile('progress.csv', b'student_email,skill_name,year,week_number,proficiency_level\n')
+        self.assertEqual(client.post('/api/progress/import/', {'file': upload}, format='multipart').status_code, 200)
+        self.assertTrue(is_pinned_to_primary(admin))
+
+        cache.clear()
+        skill = Skill.objects.get(skill_name='Written to the primary')
+        self.assertEqual(client.delete(f'/api/skills/{skill.pk}/').status_code, 204)
+        self.assertTrue(is_pinned_to_primary(admin))
+
+    async def test_async_summary_reads_from_replica(self):
+        # The pin lookup hits the database cache, which must not run on the event loop
+        token = await sync_to_async(AccessToken.for_user)(self.student)
+        response = await AsyncClient().get('/api/dashboard/summary/', headers={'Authorization': f'Bearer {token}'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_skills'], 0)
+
+
+class SQLiteTuningTests(TestCase):
+    def test_new_connections_get_the_pragma_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = connections.configure_settings({
+                'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': Path(directory) / 'tuned.sqlite3'},
+            })['default']
+            connection = connections['default'].__class__(settings_dict, alias='tuned')
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+                    cursor.execute('PRAGMA busy_timeout')
+                    self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS['busy_timeout'])
+            finally:
+                connection.close()
+
+
+class ColumnarRendererTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        cls.python = Skill.objects.create(skill_name='Python', category='Programming')
+        cls.git = Skill.objects.create(skill_name='Git', category='Tools')
+        for week_number, skill in ((1, cls.python), (2, cls.python), (3, cls.git)):
+            WeeklyProgress.objects.create(
+                student=cls.student, skill=skill, week_number=week_number, year=2026,
+                hours_spent=week_number, proficiency_level='beginner'
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def assert_columnar(self, payload):
+        self.assertEqual(set(payload), {'length', 'columns', 'skills', 'students'})
+        self.assertEqual(payload['length'], 3)
+        self.assertEqual(sorted(payload['columns']['week_number']), [1, 2, 3])
+        self.assertNotIn('skill_details', payload['columns'])
+        # Python appears in two rows but is sent once
+        self.assertEqual(sorted(payload['skills']), sorted([str(self.python.id), str(self.git.id)]))
+        self.assertEqual(payload['skills'][str(self.python.id)]['skill_name'], 'Python')
+        self.assertEqual(list(payload['students']), [str(self.student.id)])
+
+    def test_paginated_list_with_format_param(self):
+        response = self.client.get('/api/progress/', {'format': 'columnar'})
+
+        self.assertEqual(response['Content-Type'], 'application/vnd.weekly-tracker.columnar+json')
+        payload = json.loads(response.content)
+        self.assertEqual(payload['count'], 3)
+        self.assert_columnar(payload['results'])
+
+    def test_plain_list_with_accept_header(self):
+        response = self.client.get(
+            '/api/progress/my_progress/', HTTP_ACCEPT='application/vnd.weekly-tracker.columnar+json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assert_columnar(json.loads(response.content))
+
+    def test_default_response_keeps_rows(self):
+        response = self.client.get('/api/progress/my_progress/')
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(response.json()), 3)
+        self.assertIn('skill_details', response.json()[0])
+
+
+class FastJSONRendererTests(TestCase):
+    def test_decimal_and_datetime_match_the_stock_renderer(self):
+        data = {
+            'hours': Decimal('2.50'),
+            'at': datetime(2026, 3, 2, 9, 30, 15, 123456, tzinfo=timezone.utc),
+            'day': date(2026, 3, 2),
+            'ids': {1: 'one'},
+        }
+
+        self.assertEqual(renderers.FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parser_reports_bad_json(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('student@example.com', 'Student', 'pw'))
+        response = client.post('/api/progress/', b'{"year": ', content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON parse error', response.json()['detail'])
+
+
+@skipUnless(renderers.msgpack, 'msgpack is not installed')
+class MessagePackTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student@example.com', 'Student', 'pw')
+        cls.skill = Skill.objects.create(skill_name='Python', category='Programming')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_msgpack_request_body_and_response(self):
+        body = renderers.msgpack.packb({
+            'skill': self.skill.id, 'week_number': 12, 'year': 2026,
+            'hours_spent': 3.5, 'proficiency_level': 'beginner',
+        })
+        response = self.client.post(
+            '/api/progress/', body, content_type='application/msgpack', HTTP_ACCEPT='application/msgpack'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        entry = renderers.msgpack.unpackb(response.content)
+        self.assertEqual((entry['week_number'], entry['hours_spent']), (12, 3.5))
+        self.assertEqual(entry['week_start'], '2026-03-16')
+        self.assertTrue(WeeklyProgress.objects.filter(pk=entry['id'], student=self.student).exists())
+
+    def test_malformed_msgpack_body_is_a_400(self):
+        response = self.client.post('/api/progress/', b'\xc1', content_type='application/msgpack')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('MessagePack parse error', response.json()['detail'])
+
+
+class HealthTests(TestCase):
+    def test_liveness_touches_nothing(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/live/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_ready_when_the_database_answers(self):
+        response = self.client.get('/health/ready/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['databases']['default']['ok'])
+
+    def test_failing_database_is_not_ready(self):
+        with mock.patch.object(connections['default'], 'cursor', side_effect=OperationalError('gone away')):
+            response = self.client.get('/health/ready/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['databases']['default'], {'ok': False, 'error': 'gone away'})
+
+    @override_settings(READINESS_MAX_DB_LATENCY_MS=-1)
+    def test_slow_database_is_not_ready(self):
+        response = self.client.get('/health/ready/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'unavailable')
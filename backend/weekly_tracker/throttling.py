@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from .caches import require_shared_cache
+
+PERIOD_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class LocalBucketStore:
+    """Token buckets in this process's memory, evicting the least recently used"""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_per_second):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+
+class CacheBucketStore:
+    """
+    Token buckets in the Django cache, shared by every worker using it.
+
+    Updates are read-modify-write, so concurrent requests for one key can
+    occasionally both spend the same token; fine for abuse protection.
+    """
+
+    def consume(self, key, capacity, refill_per_second):
+        # Wall clock, since the timestamps are compared across processes
+        now = time.time()
+        cache_key = f'throttle-bucket:{key}'
+        tokens, updated = cache.get(cache_key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Expire once the bucket would be full again anyway
+        cache.set(cache_key, (tokens, now), int((capacity - tokens) / refill_per_second) + 1)
+        return allowed, tokens
+
+
+_local_store = LocalBucketStore()
+
+
+def get_bucket_store():
+    if settings.THROTTLE_BUCKET_BACKEND == 'cache':
+        require_shared_cache('THROTTLE_BUCKET_BACKEND=cache')
+        return CacheBucketStore()
+    return _local_store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle backed by a token bucket per key.
+
+    `rate` comes from DEFAULT_THROTTLE_RATES[scope] ("10/min" is a burst of
+    10 refilled evenly over a minute). Subclasses return the bucket key from
+    `get_bucket_key`, or None to skip throttling the request.
+    """
+    scope = None
+
+    def __init__(self):
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is not None:
+            count, period = self.rate.split('/')
+            self.capacity = int(count)
+            self.refill_per_second = self.capacity / PERIOD_SECONDS[period[0]]
+        self._wait = None
+
+    def get_bucket_key(self, request, view):
+        raise NotImplementedError('.get_bucket_key() must be overridden')
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_bucket_key(request, view)
+        if key is None:
+            return True
+
+        allowed, tokens = get_bucket_store().consume(
+            f'{self.scope}:{key}', self.capacity, self.refill_per_second
+        )
+        if not allowed:
+            self._wait = (1 - tokens) / self.refill_per_second
+        return allowed
+
+    def wait(self):
+        return self._wait
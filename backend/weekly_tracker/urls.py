@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
+from .health import liveness, readiness
 
 def api_root(request):
     return JsonResponse({
@@ -17,6 +18,8 @@ def api_root(request):
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('health/live/', liveness, name='health-live'),
+    path('health/ready/', readiness, name='health-ready'),
     path('api/auth/', include('users.urls')),
     path('api/skills/', include('skills.urls')),
     path('api/progress/', include('progress.urls')),